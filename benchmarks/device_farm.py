@@ -0,0 +1,594 @@
+# benchmarks/device_farm.py
+"""
+Farma udawanych urządzeń Cisco IOS (SSH / Telnet) na localhost — do testów
+obciążeniowych ConnectionManagera bez prawdziwego sprzętu.
+
+Każde urządzenie ma własny adres z pętli zwrotnej (127.100.x.y) i własny port,
+więc sesje, blokady i profile w ConnectionManagerze są rozdzielone jak dla
+prawdziwej floty. Linux obsługuje całe 127.0.0.0/8 od ręki; na macOS trzeba
+dodać aliasy (ifconfig lo0 alias ...).
+
+Obsługiwane: logowanie (Username/Password w Telnet, hasło w SSH), enable,
+terminal length/width, show running-config (| include), show startup-config,
+show version, configure terminal + dowolne linie (send_config_set), end/exit,
+write memory / copy run start. Bez stronicowania (--More--).
+Przez SSH także pobieranie plików SCP ("scp -f system:running-config",
+"nvram:startup-config") na osobnym kanale, jak "ip scp server enable".
+
+Uruchomienie samodzielne (do testów ręcznych):
+    python -m benchmarks.device_farm --count 200 --protocol telnet --latency 0.02
+
+SSH wymaga paramiko (zależność Netmiko).
+"""
+
+import argparse
+import ipaddress
+import logging
+import re
+import selectors
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+
+from benchmarks.parser_bench import PRESETS, generate_config
+
+FIRST_ADDRESS = ipaddress.ip_address("127.100.0.1")
+
+_SUBMODES = {
+    "interface": "config-if",
+    "vlan": "config-vlan",
+    "router": "config-router",
+    "line": "config-line",
+    "ip access-list": "config-ext-nacl",
+}
+
+
+@dataclass
+class FakeDeviceSpec:
+    hostname: str
+    running_config: str
+    username: str = "admin"
+    password: str = "admin"
+    secret: str = "admin"  # hasło enable
+    enable_required: bool = False  # True → logowanie kończy się promptem ">"
+    latency: float = 0.0  # opóźnienie każdej odpowiedzi [s]
+    bandwidth: int = 0  # przepustowość dużych wyników [B/s], 0 → bez limitu
+    scp: bool = True  # serwer SCP (tylko SSH)
+    # --- stan zmieniany przez sesje ---
+    changes: list[str] = field(default_factory=list)  # linie z configure terminal
+    startup_config: str | None = None
+    commands: int = 0  # licznik poleceń (do statystyk)
+    changed_at: float = field(default_factory=time.time)  # ostatnia zmiana configu
+
+    def render_running(self) -> str:
+        """running-config z dopisanymi zmianami z trybu konfiguracji."""
+        text = self.running_config
+        if self.changes:
+            head, sep, tail = text.rpartition("\nend")
+            if not sep:
+                text = text + "\n" + "\n".join(self.changes)
+            else:
+                text = head + "\n" + "\n".join(self.changes) + "\n!" + sep + tail
+        # znacznik jak w IOS (sonda synchronizacji warunkowej) za pierwszym "!"
+        stamp = time.strftime("%H:%M:%S UTC %a %b %d %Y", time.gmtime(self.changed_at))
+        head, sep, tail = text.partition("\n!\n")
+        if not sep:
+            return text
+        return (
+            f"{head}\n!\n! Last configuration change at {stamp} "
+            f"by {self.username}\n!\n{tail}"
+        )
+
+
+class FakeIOS:
+    """
+    Interpreter CLI jednej sesji, niezależny od transportu:
+    feed(bajty) → odpowiedzi przez send(bajty); False → zamknij sesję.
+    """
+
+    CHUNK = 4096
+
+    def __init__(self, spec: FakeDeviceSpec, send, lock: threading.Lock):
+        self.spec = spec
+        self.send = send
+        self.lock = lock  # stan spec współdzielony przez równoległe sesje
+        self.mode = "user" if spec.enable_required else "exec"
+        self.submode = ""
+        self.echo = True
+        self._buf = ""
+        self._skip_lf = False
+
+    # --- wejście ---
+
+    def feed(self, data: bytes) -> bool:
+        text = _strip_telnet(data).decode("utf-8", errors="replace")
+        for ch in text:
+            if ch == "\n" and self._skip_lf:
+                self._skip_lf = False
+                continue
+            self._skip_lf = ch == "\r"
+            if ch in "\r\n":
+                line, self._buf = self._buf, ""
+                if not self.line(line):
+                    return False
+            else:
+                self._buf += ch
+        return True
+
+    def start(self):
+        self.write("\r\n" + self.prompt())
+
+    # --- interpretacja ---
+
+    def line(self, line: str) -> bool:
+        if self.echo:
+            self.write(line + "\r\n")
+        self.echo = True
+        if self.spec.latency:
+            time.sleep(self.spec.latency)
+        with self.lock:
+            self.spec.commands += 1
+
+        cmd = line.strip()
+        if self.mode == "enable_pw":
+            if cmd == self.spec.secret:
+                self.mode = "exec"
+            else:
+                self.write("% Access denied\r\n")
+                self.mode = "user"
+        elif self.mode == "config":
+            self.config_line(cmd)
+        elif cmd:
+            out = self.exec_line(cmd)
+            if out is None:
+                return False
+            self.write(out)
+        self.write(self.prompt())
+        return True
+
+    def exec_line(self, cmd: str) -> str | None:
+        """Polecenie w trybie exec; None → koniec sesji."""
+        words = cmd.split()
+        first = words[0].lower()
+        if first in ("exit", "logout", "quit"):
+            return None
+        if first in ("terminal", "term"):
+            return ""
+        if first in ("enable", "en"):
+            if self.mode == "user":
+                self.mode = "enable_pw"  # prompt() → "Password: "
+                self.echo = False
+            return ""
+        if first == "disable":
+            self.mode = "user"
+            return ""
+        if self.mode == "user" and first in ("configure", "conf", "write", "wr"):
+            return "% Invalid input detected at '^' marker.\r\n\r\n"
+        if first in ("configure", "conf"):
+            self.mode, self.submode = "config", ""
+            return "Enter configuration commands, one per line.  End with CNTL/Z.\r\n"
+        if first in ("write", "wr") or cmd.startswith("copy running-config startup"):
+            with self.lock:
+                self.spec.startup_config = self.spec.render_running()
+            return "Building configuration...\r\n[OK]\r\n"
+        if first in ("show", "sh") and len(words) > 1:
+            return self.show(cmd, words[1].lower())
+        return "% Invalid input detected at '^' marker.\r\n\r\n"
+
+    def show(self, cmd: str, what: str) -> str:
+        cmd, _, pipe = cmd.partition("|")
+        if what.startswith("run"):
+            with self.lock:
+                text = self.spec.render_running()
+        elif what.startswith("start"):
+            text = self.spec.startup_config or "startup-config is not present"
+        elif what.startswith("ver"):
+            text = (
+                "Cisco IOS Software, Fake Software (FAKE-ADVENTERPRISEK9-M), "
+                "Version 15.2(4)M7\n"
+                f"{self.spec.hostname} uptime is 1 week, 2 days, 3 hours, 4 minutes"
+            )
+        else:
+            return "% Invalid input detected at '^' marker.\r\n\r\n"
+
+        parts = pipe.split(maxsplit=1)
+        if len(parts) == 2 and parts[0].lower() in ("include", "inc", "i"):
+            rx = re.compile(parts[1])
+            text = "\n".join(x for x in text.splitlines() if rx.search(x))
+        text = text.replace("\n", "\r\n") + "\r\n"
+        self.write_slow(text)
+        return ""
+
+    def config_line(self, cmd: str):
+        if not cmd or cmd.startswith("!"):
+            return
+        low = cmd.lower()
+        if low == "end":
+            self.mode, self.submode = "exec", ""
+            return
+        if low == "exit":
+            if self.submode:
+                self.submode = ""
+            else:
+                self.mode = "exec"
+            return
+        if low.startswith("do "):
+            self.write(self.exec_line(cmd[3:]) or "")
+            return
+        for keyword, submode in _SUBMODES.items():
+            if low.startswith(keyword + " "):
+                self.submode = submode
+                break
+        if low.startswith("hostname "):
+            with self.lock:
+                self.spec.hostname = cmd.split(maxsplit=1)[1]
+        with self.lock:
+            indent = (
+                " " if self.submode and not low.startswith(tuple(_SUBMODES)) else ""
+            )
+            self.spec.changes.append(indent + cmd)
+            self.spec.changed_at = time.time()
+
+    def prompt(self) -> str:
+        name = self.spec.hostname
+        if self.mode in ("user", "enable_pw"):
+            return "Password: " if self.mode == "enable_pw" else f"{name}>"
+        if self.mode == "config":
+            return f"{name}({self.submode or 'config'})#"
+        return f"{name}#"
+
+    # --- wyjście ---
+
+    def write(self, text: str):
+        if text:
+            self.send(text.encode("utf-8"))
+
+    def write_slow(self, text: str):
+        """Duży wynik kawałkami, z ograniczeniem przepustowości (jeśli ustawione)."""
+        data = text.encode("utf-8")
+        for i in range(0, len(data), self.CHUNK):
+            chunk = data[i : i + self.CHUNK]
+            self.send(chunk)
+            if self.spec.bandwidth:
+                time.sleep(len(chunk) / self.spec.bandwidth)
+
+
+def _strip_telnet(data: bytes) -> bytes:
+    """Usuwa negocjację opcji Telnet (IAC ...) — farma niczego nie negocjuje."""
+    if b"\xff" not in data:
+        return data
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        if data[i] == 0xFF and i + 1 < len(data):
+            i += 3 if data[i + 1] in (251, 252, 253, 254) else 2
+            continue
+        out.append(data[i])
+        i += 1
+    return bytes(out)
+
+
+# ==============================================================
+#                        TRANSPORTY
+# ==============================================================
+
+
+def _serve_telnet(sock: socket.socket, spec: FakeDeviceSpec, lock: threading.Lock):
+    def send(data: bytes):
+        sock.sendall(data)
+
+    def read_line(echo: bool) -> str | None:
+        buf = b""
+        while True:
+            data = sock.recv(1024)
+            if not data:
+                return None
+            data = _strip_telnet(data)
+            for b in data:
+                if b in (10, 13):
+                    if buf:
+                        if echo:
+                            send(buf + b"\r\n")
+                        return buf.decode(errors="replace")
+                    continue
+                buf += bytes([b])
+
+    try:
+        send(b"\r\n\r\nUser Access Verification\r\n\r\n")
+        while True:
+            send(b"Username: ")
+            user = read_line(echo=True)
+            send(b"Password: ")
+            pwd = read_line(echo=False)
+            if user is None or pwd is None:
+                return
+            if user.strip() == spec.username and pwd.strip() == spec.password:
+                break
+            send(b"\r\n% Authentication failed\r\n\r\n")
+        cli = FakeIOS(spec, send, lock)
+        cli.start()
+        while True:
+            data = sock.recv(4096)
+            if not data or not cli.feed(data):
+                return
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+def _serve_ssh(
+    sock: socket.socket, spec: FakeDeviceSpec, lock: threading.Lock, host_key
+):
+    import paramiko
+
+    class Server(paramiko.ServerInterface):
+        def __init__(self):
+            self.requests: dict[int, tuple[str, str]] = {}  # kanał → (typ, exec)
+            self.requested = threading.Condition()
+
+        def get_allowed_auths(self, username):
+            return "password"
+
+        def check_auth_password(self, username, password):
+            if username == spec.username and password == spec.password:
+                return paramiko.AUTH_SUCCESSFUL
+            return paramiko.AUTH_FAILED
+
+        def check_channel_request(self, kind, chanid):
+            if kind == "session":
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+        def check_channel_pty_request(self, *args):
+            return True
+
+        def check_channel_shell_request(self, channel):
+            return self._request(channel, "shell", "")
+
+        def check_channel_exec_request(self, channel, command):
+            if not spec.scp:
+                return False
+            return self._request(channel, "exec", command.decode(errors="replace"))
+
+        def _request(self, channel, kind: str, command: str) -> bool:
+            with self.requested:
+                self.requests[channel.get_id()] = (kind, command)
+                self.requested.notify_all()
+            return True
+
+        def wait(self, chan, timeout: float) -> tuple[str, str] | None:
+            with self.requested:
+                self.requested.wait_for(lambda: chan.get_id() in self.requests, timeout)
+                return self.requests.get(chan.get_id())
+
+    def serve_channel(chan):
+        try:
+            kind, command = server.wait(chan, 30) or ("", "")
+            if kind == "shell":
+                cli = FakeIOS(spec, chan.sendall, lock)
+                cli.start()
+                while True:
+                    data = chan.recv(4096)
+                    if not data or not cli.feed(data):
+                        return
+            elif kind == "exec":
+                chan.send_exit_status(_serve_scp(chan, spec, lock, command))
+        except (OSError, EOFError, paramiko.SSHException):
+            pass
+        finally:
+            chan.close()
+
+    transport = paramiko.Transport(sock)
+    transport.add_server_key(host_key)
+    server = Server()
+    try:
+        transport.start_server(server=server)
+        # kanał CLI i ewentualne kanały SCP na tym samym połączeniu
+        while transport.is_active():
+            chan = transport.accept(1)
+            if chan is not None:
+                threading.Thread(
+                    target=serve_channel, args=(chan,), daemon=True
+                ).start()
+    except (OSError, EOFError, paramiko.SSHException):
+        pass
+    finally:
+        transport.close()
+
+
+def _serve_scp(chan, spec: FakeDeviceSpec, lock: threading.Lock, command: str) -> int:
+    """Strona źródłowa SCP ("scp -f PLIK"); zwraca kod wyjścia."""
+    words = command.split()
+    if len(words) < 3 or words[0] != "scp" or "-f" not in words:
+        chan.sendall(b"\x01scp: unsupported command\n")
+        return 1
+    path = words[-1].lower()
+    with lock:
+        if path in ("system:running-config", "running-config"):
+            text = spec.render_running()
+        elif path in ("nvram:startup-config", "startup-config"):
+            text = spec.startup_config
+        else:
+            text = None
+    if text is None:
+        chan.sendall(f"\x01scp: {words[-1]}: No such file\n".encode())
+        return 1
+    # plik na urządzeniu nie ma nagłówka "Building configuration..." z CLI
+    if text.startswith("Building configuration"):
+        text = text.partition("\n")[2].lstrip("\n")
+    data = (text.rstrip("\n") + "\n").encode("utf-8")
+    if chan.recv(1) != b"\0":
+        return 1
+    name = path.rpartition(":")[2]
+    chan.sendall(f"C0644 {len(data)} {name}\n".encode())
+    if chan.recv(1) != b"\0":
+        return 1
+    for i in range(0, len(data), FakeIOS.CHUNK):
+        chunk = data[i : i + FakeIOS.CHUNK]
+        chan.sendall(chunk)
+        if spec.bandwidth:
+            time.sleep(len(chunk) / spec.bandwidth)
+    chan.sendall(b"\0")
+    chan.recv(1)
+    return 0
+
+
+# ==============================================================
+#                        FARMA
+# ==============================================================
+
+
+class DeviceFarm:
+    """
+    count udawanych urządzeń; start() zwraca listę (adres, port).
+    Jeden wątek przyjmuje połączenia na wszystkich gniazdach (selectors),
+    każda sesja dostaje własny wątek.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        protocol: str = "ssh",
+        latency: float = 0.0,
+        bandwidth: int = 0,
+        preset: str = "small",
+        enable_required: bool = False,
+        scp: bool = True,
+        username: str = "admin",
+        password: str = "admin",
+        base_port: int = 0,
+        offset: int = 0,
+    ):
+        if protocol not in ("ssh", "telnet"):
+            raise ValueError(f"Nieznany protokół: {protocol}")
+        self.protocol = protocol
+        self.base_port = base_port
+        self.offset = offset  # numer pierwszego urządzenia (kilka farm naraz)
+        template = generate_config(**PRESETS[preset], hostname="FARM")
+        self.specs = [
+            FakeDeviceSpec(
+                hostname=f"FARM-{i + 1:05d}",
+                running_config=template.replace(
+                    "hostname FARM", f"hostname FARM-{i + 1:05d}", 1
+                ),
+                username=username,
+                password=password,
+                secret=password,
+                enable_required=enable_required,
+                latency=latency,
+                bandwidth=bandwidth,
+                scp=scp,
+            )
+            for i in range(offset, offset + count)
+        ]
+        self.endpoints: list[tuple[str, int]] = []
+        self._locks = [threading.Lock() for _ in self.specs]
+        self._selector = selectors.DefaultSelector()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._host_key = None
+
+    def start(self) -> list[tuple[str, int]]:
+        if self.protocol == "ssh":
+            import paramiko
+
+            self._host_key = paramiko.RSAKey.generate(2048)
+        for i in range(len(self.specs)):
+            n = self.offset + i
+            addr = str(FIRST_ADDRESS + n)
+            srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            srv.bind((addr, self.base_port + n if self.base_port else 0))
+            srv.listen(64)
+            srv.setblocking(False)
+            self._selector.register(srv, selectors.EVENT_READ, i)
+            self.endpoints.append((addr, srv.getsockname()[1]))
+        self._thread = threading.Thread(
+            target=self._accept_loop, name="device-farm", daemon=True
+        )
+        self._thread.start()
+        logging.info(f"[FARM] {len(self.specs)} x {self.protocol} started")
+        return self.endpoints
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2)
+        for key in list(self._selector.get_map().values()):
+            self._selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self._selector.close()
+
+    def stats(self) -> dict:
+        return {
+            "devices": len(self.specs),
+            "commands": sum(s.commands for s in self.specs),
+            "changed": sum(1 for s in self.specs if s.changes),
+            "saved": sum(1 for s in self.specs if s.startup_config),
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            for key, _ in self._selector.select(timeout=0.2):
+                try:
+                    conn, _ = key.fileobj.accept()
+                except BlockingIOError:
+                    continue
+                conn.setblocking(True)
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                i = key.data
+                if self.protocol == "ssh":
+                    args = (conn, self.specs[i], self._locks[i], self._host_key)
+                    target = _serve_ssh
+                else:
+                    args = (conn, self.specs[i], self._locks[i])
+                    target = _serve_telnet
+                threading.Thread(target=target, args=args, daemon=True).start()
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Farma udawanych urządzeń Cisco IOS")
+    ap.add_argument("--count", type=int, default=10)
+    ap.add_argument("--protocol", choices=["ssh", "telnet"], default="ssh")
+    ap.add_argument("--latency", type=float, default=0.0, help="opóźnienie [s]")
+    ap.add_argument("--bandwidth", type=int, default=0, help="B/s, 0 → bez limitu")
+    ap.add_argument("--preset", choices=list(PRESETS), default="small")
+    ap.add_argument("--enable", action="store_true", help="logowanie do trybu >")
+    ap.add_argument("--base-port", type=int, default=0)
+    ap.add_argument("--no-scp", action="store_true", help="bez serwera SCP")
+    args = ap.parse_args(argv)
+
+    farm = DeviceFarm(
+        args.count,
+        protocol=args.protocol,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        preset=args.preset,
+        enable_required=args.enable,
+        scp=not args.no_scp,
+        base_port=args.base_port,
+    )
+    for addr, port in farm.start()[:5]:
+        print(f"[FARM] {addr}:{port}")
+    print(f"[FARM] ... {args.count} urządzeń, login admin/admin — Ctrl+C kończy")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        farm.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
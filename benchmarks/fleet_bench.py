@@ -0,0 +1,270 @@
+# benchmarks/fleet_bench.py
+"""
+Benchmark ConnectionManagera i ConfigSyncService na farmie udawanych urządzeń
+(benchmarks/device_farm.py) — logowania/s, polecenia/s, synchronizacje/s
+i pamięć przy dużej współbieżności.
+
+Uruchomienie (z katalogu głównego repo):
+    python -m benchmarks.fleet_bench --count 500 --protocol ssh --workers 128
+    python -m benchmarks.fleet_bench --count 200 --latency 0.05 --push -o fleet.json
+    python -m benchmarks.fleet_bench --count 100 --preset core --backup [--no-scp]
+    python -m benchmarks.fleet_bench --count 200 --preset core --resync --conditional
+
+Farma działa w osobnych procesach (--farm-procs), żeby jej GIL i kryptografia
+SSH nie zaniżały wyników klienta. Wynik: JSON w stylu parser_bench.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.device_farm import DeviceFarm
+from benchmarks.parser_bench import PRESETS
+
+
+def _farm_process(conn, count: int, offset: int, kwargs: dict):
+    farm = DeviceFarm(count, offset=offset, **kwargs)
+    conn.send(farm.start())
+    conn.recv()  # czeka na sygnał końca
+    conn.send(farm.stats())
+    farm.stop()
+
+
+def start_farms(count: int, procs: int, **kwargs):
+    """Uruchamia farmę w procs procesach; zwraca (endpointy, uchwyty)."""
+    procs = max(1, min(procs, count))
+    handles, endpoints = [], []
+    per, extra = divmod(count, procs)
+    offset = 0
+    for p in range(procs):
+        n = per + (1 if p < extra else 0)
+        parent, child = multiprocessing.Pipe()
+        proc = multiprocessing.Process(
+            target=_farm_process, args=(child, n, offset, kwargs), daemon=True
+        )
+        proc.start()
+        handles.append((proc, parent))
+        offset += n
+    for _, parent in handles:
+        endpoints += parent.recv()
+    return endpoints, handles
+
+
+def stop_farms(handles) -> dict:
+    total: dict = {}
+    for proc, parent in handles:
+        parent.send("stop")
+        for k, v in parent.recv().items():
+            total[k] = total.get(k, 0) + v
+        proc.join(5)
+    return total
+
+
+def rss_bytes() -> dict:
+    """Bieżące i szczytowe RSS procesu klienta (Linux / Unix)."""
+    out = {}
+    try:
+        import resource
+
+        # ru_maxrss: KiB na Linuksie, bajty na macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        out["peak_rss_bytes"] = (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        )
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            out["rss_bytes"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    return out
+
+
+def phase(name: str, cm, devices, job, workers: int, units: int = 1) -> dict:
+    """job(device) na całej flocie; units — ile operacji liczy jedno wywołanie."""
+    t0 = time.perf_counter()
+    results = list(cm.run_many(devices, job, max_workers=workers))
+    elapsed = time.perf_counter() - t0
+    ok = [r for r in results if r.ok]
+    errors = [r.error for r in results if not r.ok]
+    res = {
+        "ok": len(ok),
+        "failed": len(errors),
+        "seconds": elapsed,
+        "per_s": len(ok) * units / elapsed if elapsed else None,
+        "mean_device_s": sum(r.seconds for r in ok) / len(ok) if ok else None,
+        "errors": sorted(set(errors))[:5],
+        **rss_bytes(),
+    }
+    print(
+        f"[BENCH] {name}: {res['ok']}/{len(results)} ok, {elapsed:.2f} s, "
+        f"{res['per_s'] or 0:.1f}/s",
+        file=sys.stderr,
+    )
+    return res
+
+
+def run(args) -> dict:
+    # importy dopiero tutaj — farma w procesach potomnych ich nie potrzebuje
+    from devices.ConnectionManager import ConnectionManager
+    from devices.Device import Device
+    from devices.Vendor import Vendor
+    from services.config_backup import ConfigBackup
+    from services.config_sync import ConfigSyncService
+    from services.connection_scheduler import ConnectionScheduler
+
+    endpoints, handles = start_farms(
+        args.count,
+        args.farm_procs,
+        protocol=args.protocol,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        preset=args.preset,
+        enable_required=args.enable,
+        scp=not args.no_scp,
+    )
+    devices = [
+        Device(addr, "admin", "admin", Vendor.CISCO, port=port)
+        for addr, port in endpoints
+    ]
+    cm = ConnectionManager(
+        connection_type=args.protocol,
+        timeout=30,
+        log_path=args.log_path or tempfile.mkdtemp(prefix="fleet_bench_"),
+        max_workers=args.workers,
+        scheduler=ConnectionScheduler(
+            rate=args.login_rate,
+            burst=max(1, int(args.login_rate)),
+            per_site=args.per_site,
+        ),
+    )
+    sync = ConfigSyncService(cm, conditional=args.conditional)
+    phases = {}
+    snapshots = {}
+
+    def fetch(dev):
+        previous = snapshots.get(dev.host)
+        snapshots[dev.host], _ = sync.fetch_incremental(dev, previous)
+        return snapshots[dev.host].hostname
+
+    def login(dev):
+        if not cm.connect(dev):
+            raise ConnectionError("login failed")
+        return ""
+
+    try:
+        phases["login"] = phase("login", cm, devices, login, args.workers)
+        phases["commands"] = phase(
+            "commands",
+            cm,
+            devices,
+            lambda d: "".join(
+                cm.send_command(d, "show version") for _ in range(args.repeat)
+            ),
+            args.workers,
+            units=args.repeat,
+        )
+        phases["sync"] = phase("sync", cm, devices, fetch, args.workers)
+        if args.resync:
+            # drugi sync bez zmian na urządzeniach (z --conditional: tylko sonda)
+            phases["resync"] = phase("resync", cm, devices, fetch, args.workers)
+        if args.push:
+            phases["push"] = phase(
+                "push",
+                cm,
+                devices,
+                lambda d: cm.send_config(
+                    d, ["interface GigabitEthernet1/0/1", " description bench"]
+                ),
+                args.workers,
+            )
+        if args.backup:
+            backup = ConfigBackup(cm)
+            folder = tempfile.mkdtemp(prefix="fleet_backup_")
+            phases["backup"] = phase(
+                "backup",
+                cm,
+                devices,
+                lambda d: backup.backup(
+                    d, "running", os.path.join(folder, f"{d.host}_{d.port}.txt")
+                ).method,
+                args.workers,
+            )
+        login_stats = cm.scheduler.stats()
+    finally:
+        for dev in devices:
+            cm.close_session(dev.host)
+        cm.session_logs.close()
+        farm = stop_farms(handles)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {
+            k: getattr(args, k)
+            for k in (
+                "count",
+                "protocol",
+                "workers",
+                "latency",
+                "bandwidth",
+                "preset",
+                "repeat",
+                "login_rate",
+                "per_site",
+                "conditional",
+            )
+        },
+        "phases": phases,
+        "scheduler": {
+            "retries": login_stats.retries,
+            "wait_avg_s": login_stats.wait_avg,
+            "wait_max_s": login_stats.wait_max,
+        },
+        "probes": sync.probe_stats(),
+        "farm": farm,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark ConnectionManager na farmie")
+    ap.add_argument("--count", type=int, default=50, help="liczba urządzeń")
+    ap.add_argument("--protocol", choices=["ssh", "telnet"], default="ssh")
+    ap.add_argument("--workers", type=int, default=32, help="max_workers run_many")
+    ap.add_argument("--farm-procs", type=int, default=4)
+    ap.add_argument("--latency", type=float, default=0.0, help="opóźnienie farmy [s]")
+    ap.add_argument("--bandwidth", type=int, default=0, help="B/s, 0 → bez limitu")
+    ap.add_argument("--preset", choices=list(PRESETS), default="small")
+    ap.add_argument("--enable", action="store_true", help="logowanie do trybu >")
+    ap.add_argument("--repeat", type=int, default=3, help="show version na urządzenie")
+    ap.add_argument("--login-rate", type=float, default=0, help="0 → bez limitu")
+    ap.add_argument("--per-site", type=int, default=256)
+    ap.add_argument("--push", action="store_true", help="także send_config")
+    ap.add_argument("--resync", action="store_true", help="drugi sync (bez zmian)")
+    ap.add_argument("--conditional", action="store_true", help="sync z sondą zmian")
+    ap.add_argument("--backup", action="store_true", help="także kopia przez SCP")
+    ap.add_argument("--no-scp", action="store_true", help="farma bez serwera SCP")
+    ap.add_argument("--log-path", help="folder logów (domyślnie tymczasowy)")
+    ap.add_argument("-o", "--output", help="plik JSON (domyślnie stdout)")
+    args = ap.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0 if all(p["failed"] == 0 for p in report["phases"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
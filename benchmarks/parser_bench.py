@@ -0,0 +1,215 @@
+# benchmarks/parser_bench.py
+"""
+Benchmark parsera Cisco IOS na syntetycznych running-configach.
+
+Uruchomienie (z katalogu głównego repo):
+    python -m benchmarks.parser_bench --interfaces 48 --vlans 400 -o bench.json
+    python -m benchmarks.parser_bench --preset all
+
+Wynik: JSON z czasem parsowania (min/median/max) i szczytem pamięci (tracemalloc).
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from services.parsers import cisco_ios
+
+# typowe rozmiary: mały router, stack 48-portowy, duży core
+PRESETS = {
+    "small": dict(interfaces=8, vlans=10, routes=10, acl_lines=20, ospf=1, rip=True),
+    "stack48": dict(
+        interfaces=48 * 4, vlans=400, routes=50, acl_lines=200, ospf=1, rip=True
+    ),
+    "core": dict(
+        interfaces=1000, vlans=2000, routes=2000, acl_lines=5000, ospf=4, rip=True
+    ),
+}
+
+
+def generate_config(
+    interfaces: int = 48,
+    vlans: int = 50,
+    routes: int = 20,
+    acl_lines: int = 50,
+    ospf: int = 1,
+    rip: bool = True,
+    hostname: str = "BENCH-SW1",
+) -> str:
+    """Generuje running-config IOS o zadanym rozmiarze (deterministycznie)."""
+    out = [
+        "Building configuration...",
+        "",
+        "!",
+        "version 15.2",
+        f"hostname {hostname}",
+        "!",
+    ]
+    for v in range(1, vlans + 1):
+        out += [f"vlan {v}", f" name VLAN_{v:04d}", "!"]
+
+    for i in range(interfaces):
+        name = f"GigabitEthernet{i // 48 + 1}/0/{i % 48 + 1}"
+        out += [f"interface {name}", f" description port {i} to rack {i % 17}"]
+        if i % 10 == 0:
+            out += [
+                " no switchport",
+                f" ip address 10.{i // 250}.{i % 250}.1 255.255.255.0",
+            ]
+        elif i % 7 == 0:
+            out += [" switchport mode trunk"]
+        else:
+            vid = (i % vlans) + 1 if vlans else 1
+            out += [" switchport mode access", f" switchport access vlan {vid}"]
+        if i % 13 == 0:
+            out += [" shutdown"]
+        out += ["!"]
+
+    for r in range(routes):
+        dest = f"172.{16 + r // 65536 % 16}.{r // 256 % 256}.{r % 256}"
+        out.append(f"ip route {dest} 255.255.255.255 10.0.0.{r % 254 + 1}")
+    out.append("!")
+
+    if rip:
+        out += ["router rip", " version 2"]
+        out += [f" network 10.{n}.0.0" for n in range(min(interfaces // 10 + 1, 256))]
+        out.append("!")
+
+    for p in range(1, ospf + 1):
+        out.append(f"router ospf {p}")
+        for n in range(min(interfaces // 10 + 1, 256)):
+            out.append(f" network 10.{n}.0.0 0.0.255.255 area {n % 4}")
+        out.append("!")
+
+    for a in range(acl_lines):
+        acl = 100 + a // 500
+        action = "deny" if a % 5 == 0 else "permit"
+        out.append(f"access-list {acl} {action} tcp 192.168.{a % 256}.0 0.0.0.255 any")
+    out += ["!", "end", ""]
+    return "\n".join(out)
+
+
+def bench(raw: str, repeat: int = 5) -> dict:
+    """Mierzy czas parse() (repeat razy) i szczyt pamięci jednego przebiegu."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        cisco_ios.parse(raw)
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    conf = cisco_ios.parse(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "bytes": len(raw),
+        "lines": raw.count("\n"),
+        "repeat": repeat,
+        "min_s": min(times),
+        "median_s": median,
+        "max_s": max(times),
+        "mb_per_s": (len(raw) / 1e6) / median if median else None,
+        "peak_mem_bytes": peak,
+        "parsed": {
+            "interfaces": len(conf.interfaces.items),
+            "vlans": len(conf.vlans.items),
+            "static": len(conf.routing.static),
+            "ospf": len(conf.routing.ospf),
+            "acl_rules": len(conf.acls.rules),
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark cisco_ios.parse")
+    ap.add_argument("--preset", choices=[*PRESETS, "all"], help="gotowy rozmiar")
+    ap.add_argument("--interfaces", type=int, default=48)
+    ap.add_argument("--vlans", type=int, default=50)
+    ap.add_argument("--routes", type=int, default=20)
+    ap.add_argument("--acl-lines", type=int, default=50)
+    ap.add_argument("--ospf", type=int, default=1, help="liczba procesów OSPF")
+    ap.add_argument("--no-rip", action="store_true")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("-o", "--output", help="plik JSON (domyślnie stdout)")
+    ap.add_argument("--baseline", help="poprzedni raport JSON do porównania")
+    ap.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=1.25,
+        help="próg regresji względem baseline (mediana), domyślnie 1.25",
+    )
+    args = ap.parse_args(argv)
+
+    if args.preset == "all":
+        cases = dict(PRESETS)
+    elif args.preset:
+        cases = {args.preset: PRESETS[args.preset]}
+    else:
+        cases = {
+            "custom": dict(
+                interfaces=args.interfaces,
+                vlans=args.vlans,
+                routes=args.routes,
+                acl_lines=args.acl_lines,
+                ospf=args.ospf,
+                rip=not args.no_rip,
+            )
+        }
+
+    results = []
+    for name, params in cases.items():
+        res = bench(generate_config(**params), repeat=args.repeat)
+        results.append({"case": name, "params": params, **res})
+        print(
+            f"[BENCH] {name}: {res['median_s'] * 1000:.1f} ms, "
+            f"peak {res['peak_mem_bytes'] / 1024:.0f} KiB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        return _compare(results, args.baseline, args.max_slowdown)
+    return 0
+
+
+def _compare(results: list[dict], baseline_file: str, max_slowdown: float) -> int:
+    """Porównuje mediany z baseline; kod wyjścia 1 przy regresji."""
+    with open(baseline_file) as f:
+        base = {r["case"]: r for r in json.load(f).get("results", [])}
+    status = 0
+    for r in results:
+        old = base.get(r["case"])
+        if not old or old.get("params") != r["params"] or not old["median_s"]:
+            continue
+        ratio = r["median_s"] / old["median_s"]
+        mark = "OK"
+        if ratio > max_slowdown:
+            mark = "REGRESSION"
+            status = 1
+        print(
+            f"[BENCH] {r['case']}: x{ratio:.2f} vs baseline — {mark}", file=sys.stderr
+        )
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# benchmarks/replay_bench.py
+"""
+Powtarzalny pomiar cyklu sync → parse → zakładki na nagranych sesjach
+(services/replay.py) — bez sieci i sprzętu.
+
+Uruchomienie (z katalogu głównego repo):
+    python -m benchmarks.replay_bench ./logs --timing fast --cycles 5
+    python -m benchmarks.replay_bench ./logs --render --profile sync.prof
+
+--timing fast      sam koszt CPU (zero oczekiwania na "urządzenie"),
+--timing recorded  czasy z profili połączeń nagranych urządzeń,
+--render           także rozesłanie configu do zakładek (Qt offscreen),
+--profile PLIK     zrzut cProfile całego przebiegu (np. dla snakeviz).
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark synca na nagranych sesjach")
+    ap.add_argument("folder", help="folder logów z {host}_session.txt")
+    ap.add_argument("--timing", choices=["fast", "recorded"], default="fast")
+    ap.add_argument("--speed", type=float, default=1.0, help="mnożnik tempa")
+    ap.add_argument("--cycles", type=int, default=3, help="synchronizacji na host")
+    ap.add_argument("--hosts", nargs="*", help="tylko wybrane urządzenia")
+    ap.add_argument("--vendor", choices=["CISCO", "JUNIPER"], default="CISCO")
+    ap.add_argument("--render", action="store_true", help="rozsyłanie do zakładek")
+    ap.add_argument("--profile", help="plik wyjściowy cProfile")
+    ap.add_argument("-o", "--output", help="plik JSON (domyślnie stdout)")
+    args = ap.parse_args(argv)
+
+    from devices.ConnectionManager import ConnectionManager
+    from devices.Device import Device
+    from devices.DeviceType import DeviceType
+    from devices.Vendor import Vendor
+    from services.config_sync import ConfigSyncService
+    from services.replay import ReplayLibrary
+
+    library = ReplayLibrary(args.folder, timing=args.timing, speed=args.speed)
+    hosts = args.hosts or library.hosts()
+    cm = ConnectionManager(log_path=tempfile.mkdtemp(prefix="replay_"), replay=library)
+    sync = ConfigSyncService(cm)
+
+    detail = None
+    if args.render:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        from gui.DeviceDetailWidget import DeviceDetailWidget
+
+        app = QApplication.instance() or QApplication([])  # noqa: F841
+        detail = DeviceDetailWidget()
+
+    profiler = cProfile.Profile() if args.profile else None
+    results = []
+    if profiler:
+        profiler.enable()
+    for host in hosts:
+        device = Device(host, "", "", Vendor[args.vendor], DeviceType.ROUTER)
+        if detail is not None:
+            detail.show_for_device(device)
+        times, previous = [], None
+        for _ in range(args.cycles):
+            t0 = time.perf_counter()
+            conf, delta = sync.fetch_incremental(device, previous)
+            if detail is not None:
+                detail.sync_tabs_from_config(conf, delta)
+            times.append(time.perf_counter() - t0)
+            previous = conf
+        cm.close_session(host)
+        results.append(
+            {
+                "host": host,
+                "bytes": len(previous.raw_running or ""),
+                "first_s": times[0],
+                "next_median_s": (
+                    statistics.median(times[1:]) if len(times) > 1 else None
+                ),
+            }
+        )
+        print(f"[BENCH] {host}: first {times[0] * 1000:.1f} ms", file=sys.stderr)
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+    cm.session_logs.close()
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {
+            "timing": args.timing,
+            "speed": args.speed,
+            "cycles": args.cycles,
+            "render": args.render,
+        },
+        "results": results,
+        "cache": sync.cache.stats(),
+    }
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
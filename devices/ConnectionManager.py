@@ -1,13 +1,45 @@
+import netmiko
 from netmiko import (
     ConnectHandler,
     NetmikoTimeoutException,
     NetmikoAuthenticationException,
+    ReadTimeout,
 )
+from netmiko.ssh_dispatcher import CLASS_MAPPER
+from paramiko.ssh_exception import SSHException
 from devices.Device import Device
 from devices.Vendor import Vendor
+from services.connection_profiles import ConnectionProfile, ProfileStore
+from services.timing_tuner import TimingTuner
+from services.connection_scheduler import ConnectionScheduler
+from services.session_logs import SessionLogWriter
+from services.pending_saves import PendingSaves
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable, Iterator
+import functools
 import logging
 import os
+import queue
+import re
 import tempfile
+import threading
+import time
+
+
+@dataclass
+class DeviceResult:
+    """Wynik operacji na jednym urządzeniu z run_many()."""
+
+    device: Device
+    output: str = ""
+    error: str | None = None  # None → sukces
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class ConnectionManager:
@@ -17,13 +49,31 @@ class ConnectionManager:
     uruchomieniu jako root).
     """
 
+    STREAM_QUEUE = 64  # bloków stream_command w drodze do odbiorcy (backpressure)
+
     def __init__(
-        self, connection_type="ssh", timeout=10, log_path="./logs", verbose=False
+        self,
+        connection_type="ssh",
+        timeout=10,
+        log_path="./logs",
+        verbose=False,
+        max_workers=16,
+        auto_tune=True,
+        scheduler: ConnectionScheduler | None = None,
+        session_log_max_mb: int = 5,
+        replay=None,
+        defer_save: bool = False,
+        save_idle: float = 60.0,
     ):
         self.sessions: dict[str, ConnectHandler] = {}
         self.connection_type = connection_type
         self.timeout = int(timeout)
         self.verbose = verbose
+        self.max_workers = max(1, int(max_workers))
+
+        # sesja Netmiko nie jest wątkobezpieczna → jedna blokada na host
+        self._lock = threading.Lock()
+        self._host_locks: dict[str, threading.RLock] = {}
 
         # --- Tworzenie katalogu logów ---
         os.makedirs(log_path, exist_ok=True)
@@ -63,22 +113,51 @@ class ConnectionManager:
         )
         logging.info("=== PyNetWizard session started ===")
 
+        # --- Profile połączeń (prompt / enable / opóźnienie per urządzenie) ---
+        self.profiles = ProfileStore(os.path.join(log_path, "connection_profiles.json"))
+        # strojenie czasów Netmiko na podstawie pomiarów (w granicach bezpieczeństwa)
+        self.tuner = TimingTuner(self.profiles, enabled=auto_tune)
+        # limity logowań (AAA / linie VTY) — wspólne dla wszystkich wątków
+        self.scheduler = scheduler or ConnectionScheduler()
+        # logi sesji Netmiko: zapis w tle, rotacja i kompresja
+        self.session_logs = SessionLogWriter(
+            log_path, max_bytes=int(session_log_max_mb) * 1024 * 1024
+        )
+        # ReplayLibrary (services/replay.py) → sesje z nagrań zamiast sieci
+        self.replay = replay
+        # tryb odroczony: send_config bez write memory, jeden zapis na serię zmian
+        self.defer_save = defer_save
+        self.pending_saves = PendingSaves(self.commit_host, idle=save_idle)
+        # licznik send_config na host — ConfigSyncService traktuje zmianę
+        # licznika jak zmianę configu (znacznik czasu IOS ma rozdzielczość 1 s)
+        self.config_writes: dict[str, int] = {}
+
     # ==============================================================
     #                        GŁÓWNE API
     # ==============================================================
 
     def connect(self, device: Device) -> bool:
-        """Nawiązuje połączenie i zapisuje sesję."""
+        """
+        Nawiązuje połączenie i zapisuje sesję. Każda próba logowania biegnie
+        pod blokadą hosta, ale odczekiwanie między próbami (backoff
+        schedulera) już bez niej — polecenia i sondy innych wątków dla tego
+        hosta nie czekają na cały backoff. Nie wołać pod blokadą hosta
+        (patrz _session).
+        """
         if device.host in self.sessions:
             return True  # już połączony
 
+        def attempt():
+            with self._host_lock(device.host):
+                conn = self.sessions.get(device.host)
+                if conn is None:  # inny wątek mógł połączyć w międzyczasie
+                    conn = self._open_session(device)
+                    self.sessions[device.host] = conn
+                    logging.info(f"[CONNECTED] {device.host}")
+                return conn
+
         try:
-            params = self._device_to_netmiko(device)
-            conn = ConnectHandler(**params)
-            if not conn.check_enable_mode():
-                conn.enable()
-            self.sessions[device.host] = conn
-            logging.info(f"[CONNECTED] {device.host}")
+            self.scheduler.call(device.host, attempt, retryable=self._transient)
             return True
         except (NetmikoTimeoutException, NetmikoAuthenticationException) as e:
             logging.error(f"[CONNECTION ERROR] {device.host}: {e}")
@@ -87,51 +166,533 @@ class ConnectionManager:
             logging.exception(f"[UNEXPECTED ERROR] {device.host}: {e}")
             return False
 
-    def disconnect(self, device: Device):
-        """Zamyka połączenie."""
-        if device.host in self.sessions:
+    @staticmethod
+    def _transient(e: Exception) -> bool:
+        """
+        Czy błąd logowania warto ponowić (odmowa VTY, przeciążony AAA, zerwane
+        SSH). Złe hasło — nie: ponawiane w kółko blokuje konto w AAA.
+        """
+        if isinstance(e, NetmikoAuthenticationException):
+            return False
+        return isinstance(e, (NetmikoTimeoutException, SSHException, OSError, EOFError))
+
+    def _open_session(self, device: Device) -> ConnectHandler:
+        """Jedna próba logowania (z profilu albo pełna); błąd → wyjątek."""
+        if self.replay is not None:
+            return self.replay.connect(device.host)
+        params = self._device_to_netmiko(device)
+        key = self._key(device)
+        profile = self.profiles.get(key)
+        if profile is not None and profile.device_type == params["device_type"]:
+            try:
+                return self._connect_with_profile(params, profile, key)
+            except (NetmikoAuthenticationException, NetmikoTimeoutException):
+                raise  # urządzenie nieosiągalne — profil nic tu nie zmieni
+            except Exception as e:
+                # pełne wykrywanie nadpisze prompt/enable, pomiary czasów zostają
+                logging.warning(
+                    f"[PROFILE] {device.host}: profil nieaktualny ({e}), "
+                    "pełne wykrywanie"
+                )
+        return self._connect_full(params, key)
+
+    def _connect_full(self, params: dict, key: str) -> ConnectHandler:
+        """Pełne połączenie (wykrycie promptu, check_enable_mode) + zapis profilu."""
+        conn = ConnectHandler(**params)
+        t0 = time.perf_counter()
+        needs_enable = not conn.check_enable_mode()
+        latency = (time.perf_counter() - t0) * 1000
+        if needs_enable:
+            conn.enable()
+        old = self.profiles.get(key)
+        if old is not None:
+            profile = replace(
+                old,
+                device_type=params["device_type"],
+                base_prompt=conn.base_prompt,
+                needs_enable=needs_enable,
+            )
+        else:
+            profile = ConnectionProfile(
+                device_type=params["device_type"],
+                base_prompt=conn.base_prompt,
+                needs_enable=needs_enable,
+                latency_ms=latency,
+            )
+        # zapis pliku zbiorczo (flush po run_many / przy zamknięciu), nie
+        # przy każdym połączeniu — inaczej łączenie floty to O(n²) zapisów JSON
+        self.profiles.put(key, profile, persist=False)
+        return conn
+
+    def _connect_with_profile(
+        self, params: dict, profile: ConnectionProfile, key: str
+    ) -> ConnectHandler:
+        """
+        Szybkie połączenie z profilu: prompt z pamięci zamiast find_prompt(),
+        enable bez check_enable_mode(). Dla platform innych niż Cisco IOS
+        (albo netmiko spoza 4.x) przygotowanie sesji zostaje netmiko
+        (np. tryb CLI Junos), więc tam pomijane jest tylko sprawdzanie enable.
+        Błędny profil kończy się wyjątkiem → pełne wykrywanie w _open_session().
+        """
+        needs_enable = profile.needs_enable
+        if not _fast_profile_supported(params["device_type"]):
+            conn = ConnectHandler(**params)
+            if conn.base_prompt != profile.base_prompt:
+                conn.disconnect()
+                raise ValueError(f"prompt {conn.base_prompt!r}")
+            if needs_enable:
+                conn.enable()
+        else:
+            # publiczna ścieżka netmiko (konstruktor sterownika → _open →
+            # session_preparation), tylko przygotowanie sesji z promptem z profilu
+            conn = _profiled_driver(params["device_type"], profile.base_prompt)(
+                **params
+            )
+            # krótki wynik → próbka opóźnienia dla strojenia czasów
+            tail, seconds = conn.profile_prompt
+            self.tuner.observe(key, seconds, len(tail))
             try:
-                self.sessions[device.host].disconnect()
+                if needs_enable or tail.rstrip().endswith(">"):
+                    conn.enable()
+                    needs_enable = True
             except Exception:
-                pass
-            del self.sessions[device.host]
-            logging.info(f"[DISCONNECTED] {device.host}")
+                conn.disconnect()
+                raise
+        # zmiany profilu tylko przez ProfileStore (pod jego blokadą)
+        self.profiles.update(
+            key, persist=False, hits=profile.hits + 1, needs_enable=needs_enable
+        )
+        return conn
+
+    def disconnect(self, device: Device):
+        """Zamyka połączenie."""
+        self.close_session(device.host)
+
+    def close_session(self, host: str):
+        """Zamyka sesję po adresie (np. z monitora sesji, bez obiektu Device)."""
+        with self._host_lock(host):
+            conn = self.sessions.pop(host, None)
+            if conn is not None:
+                try:
+                    conn.disconnect()
+                except Exception:
+                    pass
+                logging.info(f"[DISCONNECTED] {host}")
+
+    def ssh_transport(self, device: Device):
+        """
+        Transport paramiko sesji SSH urządzenia (do dodatkowych kanałów,
+        np. SCP/SFTP bez ponownego logowania); None dla Telnetu i odtwarzania.
+        """
+        if not self.connect(device):
+            raise ConnectionError(f"Nie udało się połączyć z {device.host}")
+        client = getattr(self.sessions.get(device.host), "remote_conn_pre", None)
+        get_transport = getattr(client, "get_transport", None)
+        return get_transport() if get_transport else None
 
     def is_connected(self, device: Device) -> bool:
         """Sprawdza, czy połączenie istnieje i działa."""
-        conn = self.sessions.get(device.host)
-        if not conn:
+        if device.host not in self.sessions:
             return False
-        try:
-            conn.write_channel("\n")
+        if self.probe(device.host):
+            return True
+        self.disconnect(device)
+        return False
+
+    def probe(self, host: str) -> bool:
+        """
+        Sprawdza sesję bez pisania w kanał (nie brudzi wyniku poleceń):
+        SSH — stan transportu paramiko, Telnet — IAC NOP z netmiko.is_alive().
+        Zajęta sesja (polecenie w innym wątku) jest uznawana za żywą.
+        """
+        conn = self.sessions.get(host)
+        if conn is None:
+            return False
+        lock = self._host_lock(host)
+        if not lock.acquire(blocking=False):
             return True
+        try:
+            chan = getattr(conn, "remote_conn", None)
+            transport = getattr(chan, "transport", None)
+            if transport is not None:
+                return transport.is_active() and not chan.closed
+            return conn.is_alive()
         except Exception:
-            self.disconnect(device)
             return False
+        finally:
+            lock.release()
 
     def send_command(self, device: Device, command: str) -> str:
         """Wysyła pojedyncze polecenie i zwraca wynik."""
-        if not self.connect(device):
-            raise ConnectionError(f"Nie udało się połączyć z {device.host}")
-        conn = self.sessions[device.host]
-        logging.info(f"[COMMAND] {device.host}: {command}")
-        output = conn.send_command(command, strip_prompt=False, read_timeout=20)
-        return output.strip()
+        with self._session(device) as conn:
+            logging.info(f"[COMMAND] {device.host}: {command}")
+            key = self._key(device)
+            t0 = time.perf_counter()
+            try:
+                output = conn.send_command(
+                    command,
+                    strip_prompt=False,
+                    read_timeout=self.tuner.read_timeout(key),
+                )
+            except ReadTimeout:
+                self.tuner.timed_out(key)
+                raise
+            self.tuner.observe(key, time.perf_counter() - t0, len(output))
+            return output.strip()
 
-    def send_config(self, device: Device, commands: list[str]) -> str:
-        """Wysyła listę komend konfiguracyjnych."""
-        if not self.connect(device):
-            raise ConnectionError(f"Nie udało się połączyć z {device.host}")
-        conn = self.sessions[device.host]
-        logging.info(f"[CONFIG] {device.host}: {commands}")
-        output = conn.send_config_set(commands)
-        conn.save_config()
-        return output.strip()
+    def stream_command(
+        self, device: Device, command: str, read_timeout: float | None = None
+    ) -> Iterator[str]:
+        """
+        Wysyła polecenie i zwraca wynik kawałkami, w miarę jak przychodzą z kanału
+        (bez echa polecenia i końcowego promptu). read_timeout (domyślnie
+        wyuczony dla urządzenia) liczy się od ostatnio odebranych danych,
+        więc długi transfer nie jest przerywany.
+
+        Kanał czyta osobny wątek (pod blokadą hosta, zdejmowaną w tym samym
+        wątku) do ograniczonej kolejki — blokada nie jest trzymana między
+        kolejnymi yield. Porzucony generator tylko sygnalizuje wątkowi, żeby
+        doczytał wynik do promptu (kanał gotowy na następne polecenie).
+        Nie wołać z wątku trzymającego blokadę hosta (wątek czytający by na
+        nią czekał).
+        """
+        blocks: queue.Queue = queue.Queue(maxsize=self.STREAM_QUEUE)
+        abandoned = threading.Event()
+
+        def put(item):
+            while not abandoned.is_set():
+                try:
+                    blocks.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def read():
+            try:
+                with self._session(device) as conn:
+                    for block in self._stream_command(
+                        device, conn, command, read_timeout
+                    ):
+                        put(("data", block))
+                put(("end", None))
+            except Exception as e:
+                put(("error", e))
+
+        threading.Thread(target=read, name=f"stream-{device.host}", daemon=True).start()
+        try:
+            while True:
+                kind, value = blocks.get()
+                if kind == "end":
+                    return
+                if kind == "error":
+                    raise value
+                yield value
+        finally:
+            abandoned.set()
+
+    def _stream_command(
+        self, device: Device, conn, command: str, read_timeout: float | None
+    ) -> Iterator[str]:
+        logging.info(f"[COMMAND] {device.host}: {command} (stream)")
+        key = self._key(device)
+        read_timeout = read_timeout or self.tuner.read_timeout(key)
+        prompt = re.compile(re.escape(conn.base_prompt) + r"[^\n]*[#>$]\s*$")
+
+        conn.clear_buffer()
+        conn.write_channel(conn.normalize_cmd(command))
+
+        echo = True
+        nbytes = 0
+        t0 = time.perf_counter()
+        blocks = self._read_blocks(
+            conn,
+            f"{device.host}: '{command}'",
+            read_timeout,
+            lambda tail: not echo and prompt.match(tail),
+        )
+        try:
+            for ready in blocks:
+                nbytes += len(ready)
+                if echo:
+                    # pierwsza pełna linia to echo polecenia
+                    first, _, ready = ready.partition("\n")
+                    if command.strip() not in first:
+                        ready = first + "\n" + ready
+                    echo = False
+                if ready:
+                    yield ready
+        except ReadTimeout:
+            self.tuner.timed_out(key)
+            raise
+        # czas zawiera też parsowanie po stronie odbiorcy — zawyża, nie zaniża
+        self.tuner.observe(key, time.perf_counter() - t0, nbytes)
+
+    def send_commands(
+        self, device: Device, commands: list[str], read_timeout: float | None = None
+    ) -> list[str]:
+        """
+        Wysyła kilka poleceń show jednym zapisem do kanału (bez czekania na prompt
+        po każdym) i dzieli wynik po liniach promptu z echem kolejnych poleceń.
+        Liczą się tylko linie "prompt + echo polecenia k", więc linie wyglądające
+        jak prompt w treści wyniku (np. logi, banner) nie kończą odczytu.
+        Zwraca wyniki w kolejności poleceń. Gdy podział się nie zgadza —
+        wykonuje polecenia pojedynczo.
+        """
+        if not commands:
+            return []
+        with self._session(device) as conn:
+            logging.info(f"[COMMANDS] {device.host}: {commands}")
+            prompt = re.compile(re.escape(conn.base_prompt) + r"(?:\([^)\n]*\))?[#>$]")
+
+            def echoes(line: str, k: int) -> bool:
+                """Linia promptu z echem polecenia k (początek jego wyniku)."""
+                m = prompt.match(line)
+                return bool(m) and line[m.end() :].strip() == commands[k].strip()
+
+            key = self._key(device)
+            read_timeout = read_timeout or self.tuner.read_timeout(key)
+            t0 = time.perf_counter()
+
+            conn.clear_buffer()
+            conn.write_channel("".join(conn.normalize_cmd(c) for c in commands))
+
+            # echa poleceń 2..N zaczynają się od promptu; koniec = goły prompt
+            # po N-1 takich liniach (każda z echem kolejnego polecenia)
+            lines: list[str] = []
+            marks = 0
+            try:
+                for block in self._read_blocks(
+                    conn,
+                    f"{device.host}: {len(commands)} poleceń",
+                    read_timeout,
+                    lambda tail: marks >= len(commands) - 1
+                    and prompt.fullmatch(tail.strip()),
+                ):
+                    for line in block.splitlines():
+                        if marks < len(commands) - 1 and echoes(line, marks + 1):
+                            marks += 1
+                        lines.append(line)
+            except ReadTimeout:
+                self.tuner.timed_out(key)
+                raise
+            self.tuner.observe(
+                key, time.perf_counter() - t0, sum(len(x) + 1 for x in lines)
+            )
+
+            if lines and commands[0].strip() in lines[0]:
+                lines = lines[1:]  # echo pierwszego polecenia
+            outputs: list[str] = []
+            current: list[str] = []
+            for line in lines:
+                if len(outputs) < len(commands) - 1 and echoes(line, len(outputs) + 1):
+                    outputs.append("\n".join(current).strip())
+                    current = []
+                else:
+                    current.append(line)
+            outputs.append("\n".join(current).strip())
+
+            if len(outputs) != len(commands):
+                logging.warning(
+                    f"[COMMANDS] {device.host}: niejednoznaczny podział wyniku, "
+                    "wykonuję polecenia pojedynczo"
+                )
+                return [self.send_command(device, c) for c in commands]
+            return outputs
+
+    def send_config(
+        self, device: Device, commands: list[str], save: bool | None = None
+    ) -> str:
+        """
+        Wysyła listę komend konfiguracyjnych. save=None → według defer_save:
+        zapis od razu albo urządzenie trafia do pending_saves (commit później).
+        """
+        if save is None:
+            save = not self.defer_save
+        with self._session(device) as conn:
+            logging.info(f"[CONFIG] {device.host}: {commands}")
+            # przed wysłaniem: przerwany send_config_set też mógł coś zmienić
+            self.config_writes[device.host] = self.config_writes.get(device.host, 0) + 1
+            output = conn.send_config_set(commands)
+            if save:
+                conn.save_config()
+                # zapisane razem z wcześniej odroczonymi zmianami
+                self.pending_saves.take(device.host)
+            else:
+                self.pending_saves.mark(device, len(commands))
+            return output.strip()
+
+    def commit(self, device: Device, force: bool = False) -> str:
+        """
+        Zapisuje odroczone zmiany urządzenia (write memory). Bez oczekujących
+        zmian nic nie robi, chyba że force=True (jawny zapis z GUI).
+        """
+        if force and not self.pending_saves.is_pending(device.host):
+            self.pending_saves.mark(device)
+        return self.commit_host(device.host)
+
+    def commit_host(self, host: str) -> str:
+        """commit() po adresie — wołane też przez pending_saves po okresie idle."""
+        waiting = self.pending_saves.pending().get(host)
+        if waiting is None:
+            return ""
+        # logowanie przed blokadą; wpis zdejmowany dopiero pod nią
+        with self._session(waiting.device) as conn:
+            entry = self.pending_saves.take(host)
+            if entry is None:
+                return ""  # zapisane w międzyczasie przez inny wątek
+            try:
+                output = conn.save_config()
+            except Exception:
+                self.pending_saves.restore(entry)
+                raise
+            logging.info(
+                f"[SAVE] {host}: {entry.sets} zestawów, {entry.commands} komend "
+                f"— jeden zapis"
+            )
+            return (output or "").strip()
+
+    def commit_all(self, **kwargs) -> Iterator[DeviceResult]:
+        """commit na wszystkich urządzeniach z odroczonymi zmianami (jak run_many)."""
+        devices = [e.device for e in self.pending_saves.pending().values()]
+        return self.run_many(devices, self.commit, **kwargs)
+
+    # ==============================================================
+    #                   OPERACJE NA WIELU URZĄDZENIACH
+    # ==============================================================
+
+    def run_many(
+        self,
+        devices: Iterable[Device],
+        job: Callable[[Device], str],
+        max_workers: int | None = None,
+        stop: threading.Event | None = None,
+        disconnect_after: bool = False,
+    ) -> Iterator[DeviceResult]:
+        """
+        Uruchamia job(device) równolegle na wielu urządzeniach (najwyżej
+        max_workers naraz) i zwraca wyniki w kolejności ukończenia.
+        Błąd jednego urządzenia trafia do jego DeviceResult.error i nie przerywa
+        pozostałych. Ustawienie stop (albo porzucenie iteratora) anuluje
+        zadania, które jeszcze nie wystartowały.
+        """
+        devices = list(devices)
+        if not devices:
+            return
+        workers = min(max_workers or self.max_workers, len(devices))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fleet")
+        try:
+            futures = [
+                pool.submit(self._run_one, dev, job, stop, disconnect_after)
+                for dev in devices
+            ]
+            for fut in as_completed(futures):
+                if fut.cancelled():
+                    continue
+                yield fut.result()
+                if stop is not None and stop.is_set():
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            # profile z połączeń całej partii zapisywane jednym zapisem
+            self.profiles.flush()
+
+    def send_command_many(
+        self, devices: Iterable[Device], command: str, **kwargs
+    ) -> Iterator[DeviceResult]:
+        """send_command na wielu urządzeniach (argumenty jak w run_many)."""
+        return self.run_many(devices, lambda d: self.send_command(d, command), **kwargs)
+
+    def send_config_many(
+        self, devices: Iterable[Device], commands: list[str], **kwargs
+    ) -> Iterator[DeviceResult]:
+        """send_config na wielu urządzeniach (argumenty jak w run_many)."""
+        return self.run_many(devices, lambda d: self.send_config(d, commands), **kwargs)
 
     # ==============================================================
     #                        POMOCNICZE
     # ==============================================================
 
+    def _read_blocks(
+        self,
+        conn,
+        what: str,
+        read_timeout: float,
+        at_end: Callable[[str], bool],
+    ) -> Iterator[str]:
+        """
+        Czyta kanał i zwraca kolejne bloki pełnych linii (LF). Ostatnia, niepełna
+        linia jest wstrzymywana; gdy at_end(ta linia) → koniec (to zwykle prompt).
+        read_timeout liczy się od ostatnio odebranych danych.
+        """
+        tail = ""
+        deadline = time.monotonic() + read_timeout
+        while True:
+            chunk = conn.read_channel()
+            if not chunk:
+                if time.monotonic() > deadline:
+                    raise ReadTimeout(f"{what}: brak końca wyniku po {read_timeout} s")
+                time.sleep(0.02)
+                continue
+            deadline = time.monotonic() + read_timeout
+            data = (tail + chunk).replace("\r\n", "\n")
+            cut = data.rfind("\n") + 1
+            ready, tail = data[:cut], data[cut:]
+            if ready:
+                yield ready
+            if at_end(tail):
+                return
+
+    def _key(self, device: Device) -> str:
+        """Klucz profilu połączenia (host + typ połączenia)."""
+        return self.profiles.key(device.host, self.connection_type)
+
+    @contextmanager
+    def _session(self, device: Device):
+        """
+        Sesja urządzenia pod blokadą hosta na czas jej użycia. Logowanie
+        (z ponowieniami) odbywa się przed wzięciem blokady; sesja zamknięta
+        przez inny wątek zanim blokada została wzięta → jeszcze jedna próba.
+        """
+        for _ in range(2):
+            if not self.connect(device):
+                break
+            with self._host_lock(device.host):
+                conn = self.sessions.get(device.host)
+                if conn is not None:
+                    yield conn
+                    return
+        raise ConnectionError(f"Nie udało się połączyć z {device.host}")
+
+    def _host_lock(self, host: str) -> threading.RLock:
+        with self._lock:
+            lock = self._host_locks.get(host)
+            if lock is None:
+                lock = self._host_locks[host] = threading.RLock()
+            return lock
+
+    def _run_one(
+        self,
+        device: Device,
+        job: Callable[[Device], str],
+        stop: threading.Event | None,
+        disconnect_after: bool,
+    ) -> DeviceResult:
+        result = DeviceResult(device)
+        if stop is not None and stop.is_set():
+            result.error = "Anulowano"
+            return result
+        t0 = time.perf_counter()
+        try:
+            result.output = job(device) or ""
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            logging.error(f"[FLEET ERROR] {device.host}: {result.error}")
+        finally:
+            if disconnect_after:
+                self.disconnect(device)
+            result.seconds = time.perf_counter() - t0
+        return result
+
     def _device_to_netmiko(self, device: Device) -> dict:
         """Mapuje obiekt Device na parametry Netmiko ConnectHandler."""
         if device.vendor == Vendor.CISCO:
@@ -142,25 +703,72 @@ class ConnectionManager:
             platform = "generic_termserver"
 
         params = {
-            "device_type": f"{platform}_{self.connection_type}"
-            if self.connection_type == "telnet"
-            else platform,
+            "device_type": (
+                f"{platform}_{self.connection_type}"
+                if self.connection_type == "telnet"
+                else platform
+            ),
             "host": device.host,
             "username": device.username,
             "password": device.password,
             "timeout": self.timeout,
             "secret": device.password,  # enable
+            # keepalive SSH: martwy peer szybciej zamyka transport (patrz probe())
+            "keepalive": 30,
         }
+        if device.port:
+            params["port"] = device.port
 
-        # --- Bezpieczne tworzenie logu sesji (może być w /tmp jeśli katalog logów niedostępny)
-        session_log = os.path.join(self.log_path, f"{device.host}_session.txt")
-        try:
-            open(session_log, "a").close()
-        except Exception:
-            tmp_log = os.path.join(tempfile.gettempdir(), f"{device.host}_session.txt")
-            print(f"[WARN] Nie można pisać do {session_log}, używam {tmp_log}")
-            session_log = tmp_log
+        # log sesji: {host}_session.txt, zapis przez SessionLogWriter (fallback /tmp)
+        params["session_log"] = self.session_logs.stream(device.host)
 
-        params["session_log"] = session_log
+        # wyuczone czasy (global_delay_factor, timeout) — gdy są pomiary
+        params.update(self.tuner.netmiko_params(self._key(device), self.timeout))
 
         return params
+
+
+# ==============================================================
+#            SZYBKIE PRZYGOTOWANIE SESJI Z PROFILU (IOS)
+# ==============================================================
+
+_NETMIKO_MAJOR = int(netmiko.__version__.split(".")[0])
+
+
+def _fast_profile_supported(device_type: str) -> bool:
+    """
+    Szybka ścieżka nadpisuje session_preparation sterownika IOS — testowana
+    z netmiko 4.x (pyproject: <5); inne wersje/platformy → ConnectHandler.
+    """
+    return (
+        _NETMIKO_MAJOR == 4
+        and device_type.startswith("cisco_ios")
+        and device_type in CLASS_MAPPER
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _profiled_driver(device_type: str, base_prompt: str) -> type:
+    """
+    Sterownik netmiko, którego session_preparation robi to samo co IOS
+    (terminal width, terminal length 0), ale bez find_prompt: prompt z profilu.
+    Odczyt do promptu po "terminal length 0" synchronizuje kanał; zły prompt →
+    ReadTimeout, netmiko zamyka sesję, a wołający przechodzi na pełne wykrywanie.
+    """
+    base = CLASS_MAPPER[device_type]
+
+    class ProfiledDriver(base):
+        def session_preparation(self):
+            cmd = "terminal width 511"
+            self.set_terminal_width(command=cmd, pattern=cmd)
+            self.base_prompt = base_prompt
+            t0 = time.perf_counter()
+            self.disable_paging()
+            # końcówka z promptem: "R1#" / "R1>" (potrzebny enable) + czas
+            tail = self.read_until_pattern(
+                pattern=re.escape(base_prompt) + r"[>#]", read_timeout=10
+            )
+            self.profile_prompt = (tail, time.perf_counter() - t0)
+
+    ProfiledDriver.__name__ = f"Profiled{base.__name__}"
+    return ProfiledDriver
@@ -10,12 +10,14 @@ class Device:
         password: str,
         vendor: Vendor,
         device_type: DeviceType = None,
+        port: int | None = None,
     ):
         self.host = host
         self.username = username
         self.password = password
         self.vendor = vendor
         self.device_type = device_type
+        self.port = port  # None → domyślny port protokołu (22 / 23)
 
     def __repr__(self):
         return f"Device({self.host}, {self.username}, {self.password}, {self.vendor}), device_type={self.device_type}"
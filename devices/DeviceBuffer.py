@@ -18,6 +18,10 @@ class DeviceBuffer:
         self.config: ParsedConfig | None = (
             None  # 🆕 ostatnio pobrany i sparsowany config
         )
+        # stan tabów tuż po ostatnim syncu i snapshot, z którego pochodzi —
+        # delta może trafić tylko do tabów bez ręcznych zmian od tamtej chwili
+        self.synced_tabs: dict = {}
+        self.synced_config: ParsedConfig | None = None
 
     def export_all(self) -> dict:
         """Zwraca stan całego bufora jako dict (do ewentualnego zapisu JSON)."""
@@ -60,6 +60,7 @@ class DeviceList:
                     device_type=DeviceType[d["device_type"]]
                     if d["device_type"]
                     else None,
+                    port=d.get("port"),
                 )
                 for d in data
             ]
@@ -72,6 +73,7 @@ def _device_to_dict(dev: Device) -> dict:
         "password": dev.password,
         "vendor": dev.vendor.name,
         "device_type": dev.device_type.name if dev.device_type else None,
+        "port": dev.port,
     }
 
 
@@ -18,6 +18,7 @@ from gui.tabs.RoutingTab import RoutingTab
 from gui.tabs.InterfacesTab import InterfacesTab
 from gui.tabs.VLANsTab import VLANsTab
 from gui.tabs.ACLTab import ACLTab
+from services.config_delta import ConfigDelta
 from services.parsed_config import ParsedConfig
 
 
@@ -122,17 +123,7 @@ class DeviceDetailWidget(QWidget):
             self.stack.addWidget(placeholder)
             return
 
-        # Ustal, które zakładki mają się pojawić
-        if device.device_type == DeviceType.ROUTER:
-            tabs = ["GLOBAL", "ROUTING", "INTERFACES"]
-        elif device.device_type == DeviceType.SWITCH:
-            tabs = ["GLOBAL", "VLANs", "INTERFACES"]
-        elif device.device_type == DeviceType.FIREWALL:
-            tabs = ["GLOBAL", "INTERFACES", "ACL"]
-        else:
-            tabs = ["GLOBAL"]
-
-        for name in tabs:
+        for name in self.tab_names(device):
             self.category_list.addItem(name)
             self.stack.addWidget(self.pages[name])
 
@@ -141,6 +132,17 @@ class DeviceDetailWidget(QWidget):
         # 🆕 wczytaj stan z bufora
         self.load_tab_state(device)
 
+    @staticmethod
+    def tab_names(device) -> list[str]:
+        """Zakładki pokazywane dla typu urządzenia (pozostałe go nie dotyczą)."""
+        if device.device_type == DeviceType.ROUTER:
+            return ["GLOBAL", "ROUTING", "INTERFACES"]
+        elif device.device_type == DeviceType.SWITCH:
+            return ["GLOBAL", "VLANs", "INTERFACES"]
+        elif device.device_type == DeviceType.FIREWALL:
+            return ["GLOBAL", "INTERFACES", "ACL"]
+        return ["GLOBAL"]
+
     def append_console(self, text: str):
         """Dodaje linię do globalnej konsoli."""
         self.console.appendPlainText(text.strip())
@@ -185,22 +187,73 @@ class DeviceDetailWidget(QWidget):
                 except Exception as e:
                     print(f"[WARN] Nie wczytano stanu {name}: {e}")
 
-    def sync_tabs_from_config(self, conf: ParsedConfig):
+    def sync_tabs_from_config(
+        self, conf: ParsedConfig, delta: ConfigDelta | None = None
+    ):
+        """
+        Rozsyła config do tabów. Z deltą (parsowanie przyrostowe) taby bez zmian
+        są pomijane, a taby z apply_delta() aktualizują tylko zmienione wiersze —
+        ale tylko te, których stan jest nadal taki jak po poprzednim syncu.
+        Tab edytowany ręcznie (albo pokazujący inny snapshot) dostaje pełny
+        sync_from_config, żeby Sync nie zostawiał w nim nieaktualnych edycji.
+        """
         # Zapisz w buforze urządzenia
         buf = self.buffers.setdefault(self.current_device.host, DeviceBuffer())
         buf.hostname = conf.hostname or buf.hostname
         buf.logs = (buf.logs or "") + "\n[SYNC] Config applied to tabs."
         buf.tabs.setdefault("GLOBAL", {})
+        # delta liczona względem buf.config — taby muszą pokazywać właśnie jego
+        if buf.synced_config is not buf.config:
+            delta = None
         buf.config = conf  # zawsze aktualny snapshot
 
         # Rozsyłanie do aktywnych tabów, tylko tych które istnieją teraz w stacku
+        names = {id(tab): name for name, tab in self.pages.items()}
+        synced = {}
         for idx in range(self.stack.count()):
             widget = self.stack.widget(idx)
-            if hasattr(widget, "sync_from_config"):
-                try:
+            if not hasattr(widget, "sync_from_config"):
+                continue
+            name = names.get(id(widget))
+            try:
+                if delta is None or not self._tab_clean(widget, name, buf):
                     widget.sync_from_config(conf)
-                except Exception as e:
-                    self.append_console(f"[WARN] Tab sync failed: {e}")
+                elif not _tab_touched(name, delta):
+                    pass
+                elif hasattr(widget, "apply_delta"):
+                    widget.apply_delta(delta)
+                else:
+                    widget.sync_from_config(conf)
+                if hasattr(widget, "export_state"):
+                    synced[name] = widget.export_state()
+            except Exception as e:
+                self.append_console(f"[WARN] Tab sync failed: {e}")
+        buf.synced_tabs = synced
+        buf.synced_config = conf
+
+    @staticmethod
+    def _tab_clean(widget, name: str | None, buf: DeviceBuffer) -> bool:
+        """Czy tab nie był edytowany od ostatniego synca (stan jak wtedy)."""
+        if not hasattr(widget, "export_state") or name not in buf.synced_tabs:
+            return False
+        try:
+            return widget.export_state() == buf.synced_tabs[name]
+        except Exception:
+            return False
+
+    def preview_block(self, keyword: str, partial: ParsedConfig):
+        """
+        Podgląd w trakcie strumieniowego pobierania: odświeża tylko tab,
+        którego dotyczy właśnie sparsowany blok sekcji (bez zapisu do bufora).
+        """
+        name = _BLOCK_TABS.get(keyword)
+        tab = self.pages.get(name)
+        if tab is None or self.stack.indexOf(tab) < 0:
+            return
+        try:
+            tab.sync_from_config(partial)
+        except Exception as e:
+            self.append_console(f"[WARN] Tab preview failed: {e}")
 
     def restore_from_snapshot(self):
         """Przywraca stan tabów z ostatniego pobranego configu (buf.config)."""
@@ -212,3 +265,29 @@ class DeviceDetailWidget(QWidget):
             return
         self.append_console("[RESET] Przywracanie konfiguracji z ostatniego synca...")
         self.sync_tabs_from_config(buf.config)
+
+
+# słowo kluczowe bloku sekcji → zakładka, która go pokazuje
+_BLOCK_TABS = {
+    "hostname": "GLOBAL",
+    "interface": "INTERFACES",
+    "vlan": "VLANs",
+    "ip": "ROUTING",
+    "router": "ROUTING",
+    "access-list": "ACL",
+}
+
+
+def _tab_touched(name: str | None, delta: ConfigDelta) -> bool:
+    """Czy delta dotyczy danych pokazywanych w zakładce o tej nazwie."""
+    if name == "GLOBAL":
+        return delta.hostname is not None
+    if name == "ROUTING":
+        return delta.routing
+    if name == "INTERFACES":
+        return bool(delta.interfaces)
+    if name == "VLANs":
+        return bool(delta.vlans)
+    if name == "ACL":
+        return bool(delta.acls)
+    return True
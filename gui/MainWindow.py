@@ -1,4 +1,8 @@
-from PySide6.QtCore import Qt, QSettings, QTimer, QTime
+import os
+from dataclasses import replace
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QObject, QSettings, QTimer, QTime, Signal
 from PySide6.QtWidgets import (
     QMainWindow,
     QHBoxLayout,
@@ -14,12 +18,35 @@ from PySide6.QtWidgets import (
 )
 
 from devices.ConnectionManager import ConnectionManager
+from devices.DeviceBuffer import DeviceBuffer
 from gui.AddDeviceDialog import AddDeviceDialog
 from devices.DeviceList import DeviceList
 from devices.Device import Device
+from gui.RolloutDialog import RolloutDialog
 from gui.SettingsDialog import SettingsDialog
 from gui.DeviceDetailWidget import DeviceDetailWidget
+from gui.jobs import JobQueue
+from services.bulk_ingest import ConfigIndex, ingest, match_devices
+from services.config_backup import ConfigBackup
+from services.config_push import plan_from_tabs, supported
 from services.config_sync import ConfigSyncService
+from services.rollout import RolloutTarget
+from services.parse_cache import ParseCache
+from services.parsed_config import (
+    ParsedACLs,
+    ParsedConfig,
+    ParsedInterfaces,
+    ParsedRouting,
+    ParsedVLANs,
+)
+from services.session_monitor import SessionMonitor, SessionState
+from services.connection_scheduler import ConnectionScheduler
+
+
+class _MonitorBridge(QObject):
+    """Przenosi zdarzenia SessionMonitor (wątek monitora) do wątku GUI."""
+
+    changed = Signal(object)
 
 
 # --- MOCK ConnectionManager ---
@@ -93,6 +120,9 @@ class MainWindow(QMainWindow):
         action_load = file_menu.addAction("Wczytaj inventory")
         action_load.triggered.connect(self.load_inventory)
 
+        action_archive = file_menu.addAction("Importuj archiwum configów")
+        action_archive.triggered.connect(self.import_archive)
+
         device_menu = menubar.addMenu("Urządzenie")
 
         action_apply_current = device_menu.addAction(
@@ -107,6 +137,14 @@ class MainWindow(QMainWindow):
 
         device_menu.addSeparator()
 
+        action_commit = device_menu.addAction("Zapisz zmiany w NVRAM (write memory)")
+        action_commit.triggered.connect(self.commit_pending)
+
+        action_backup = device_menu.addAction("Kopia zapasowa konfiguracji (wszystkie)")
+        action_backup.triggered.connect(self.backup_all_devices)
+
+        device_menu.addSeparator()
+
         action_sync = device_menu.addAction("Odśwież konfigurację (Sync)")
         action_sync.triggered.connect(self.sync_current_device)
 
@@ -118,6 +156,11 @@ class MainWindow(QMainWindow):
         )
         action_reset_all.triggered.connect(self.reset_all_devices)
 
+        device_menu.addSeparator()
+
+        action_cancel_jobs = device_menu.addAction("Anuluj operacje w tle")
+        action_cancel_jobs.triggered.connect(self.cancel_jobs)
+
         settings_action = menubar.addAction("Ustawienia")
         settings_action.triggered.connect(self.open_settings_dialog)
 
@@ -127,8 +170,11 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("Ready.")
         self.status_label.setStyleSheet("font-family: monospace;")
         self.status_bar.addPermanentWidget(self.status_label)
+        self.jobs_label = QLabel("")
+        self.jobs_label.setStyleSheet("font-family: monospace;")
+        self.status_bar.addPermanentWidget(self.jobs_label)
 
-        # --- NOWE: zegar i timer odświeżania ---
+        # --- NOWE: zegar i timer odświeżania (tylko odczyt stanu z monitora) ---
         self.last_check_time = QTime.currentTime()
         self.status_timer = QTimer(self)
         self.status_timer.timeout.connect(self.update_status_bar)
@@ -143,9 +189,43 @@ class MainWindow(QMainWindow):
             timeout=int(self.settings.value("timeout", 10)),
             verbose=(self.settings.value("verbose", "false") == "true"),
             log_path=self.settings.value("log_path", "./logs"),
+            max_workers=int(self.settings.value("max_workers", 16)),
+            auto_tune=(self.settings.value("auto_tune", "true") == "true"),
+            scheduler=ConnectionScheduler(
+                rate=float(self.settings.value("login_rate", 5)),
+                burst=int(self.settings.value("login_rate", 5)),
+                per_site=int(self.settings.value("logins_per_site", 8)),
+            ),
+            session_log_max_mb=int(self.settings.value("session_log_max_mb", 5)),
+            defer_save=(self.settings.value("defer_save", "false") == "true"),
+            save_idle=float(self.settings.value("save_idle", 60)),
         )
 
-        self.config_sync = ConfigSyncService(self.connection_manager)
+        # żywotność sesji sprawdzana w tle; GUI czyta tylko zapamiętany stan
+        self.session_monitor = SessionMonitor(
+            self.connection_manager,
+            interval=float(self.settings.value("monitor_interval", 5)),
+        )
+        self._monitor_bridge = _MonitorBridge(self)
+        self._monitor_bridge.changed.connect(self.on_session_changed)
+        self.session_monitor.subscribe(self._monitor_bridge.changed.emit)
+        self.session_monitor.start()
+
+        # operacje na urządzeniach idą w tle (GUI nie zamarza)
+        self.jobs = JobQueue(int(self.settings.value("max_workers", 16)), self)
+        self.jobs.active_changed.connect(self._update_jobs_label)
+
+        # cache parsowania — opcjonalnie także na dysku, obok logów
+        parse_cache_dir = None
+        if self.settings.value("parse_cache_disk", "false") == "true":
+            parse_cache_dir = os.path.join(
+                self.connection_manager.log_path, "parse_cache"
+            )
+        self.config_sync = ConfigSyncService(
+            self.connection_manager,
+            ParseCache(disk_dir=parse_cache_dir),
+            conditional=(self.settings.value("conditional_sync", "true") == "true"),
+        )
 
         # --- inicjalne urządzenia ---
         self.refresh_device_buttons()
@@ -159,8 +239,10 @@ class MainWindow(QMainWindow):
             if widget is not None:
                 widget.deleteLater()
 
+        self.device_buttons = {}
         for dev in self.device_list.devices:
             btn = QPushButton(dev.host)
+            self.device_buttons[dev.host] = btn
             btn.setStyleSheet("padding: 8px; font-size: 13px; text-align: left;")
             btn.setContextMenuPolicy(Qt.CustomContextMenu)
             btn.clicked.connect(lambda _, d=dev: self.show_device_details(d))
@@ -183,6 +265,26 @@ class MainWindow(QMainWindow):
             self.devices_layout.addWidget(btn)
 
         self.devices_layout.setAlignment(Qt.AlignTop)
+        self._update_pending_marks()
+
+    def _update_pending_marks(self):
+        """Gwiazdka przy urządzeniach ze zmianami czekającymi na write memory."""
+        pending = self.connection_manager.pending_saves.pending()
+        for host, btn in self.device_buttons.items():
+            entry = pending.get(host)
+            mark = " !" if entry and entry.stalled else " *" if entry else ""
+            btn.setText(host + mark)
+            tip = ""
+            if entry:
+                tip = (
+                    f"Niezapisane zmiany: {entry.sets} zestawów od "
+                    f"{datetime.fromtimestamp(entry.since):%H:%M:%S}"
+                )
+                if entry.stalled:
+                    tip += f"\nAutozapis wstrzymany po {entry.failures} błędach — zapisz ręcznie"
+                elif entry.failures:
+                    tip += f"\nNieudane próby autozapisu: {entry.failures}"
+            btn.setToolTip(tip)
 
     def add_device_dialog(self):
         dialog = AddDeviceDialog(self)
@@ -231,7 +333,7 @@ class MainWindow(QMainWindow):
             try:
                 global_tab = self.detail_box.pages["GLOBAL"]
                 if hasattr(global_tab, "bind_device"):
-                    global_tab.bind_device(device, self.connection_manager)
+                    global_tab.bind_device(device, self.connection_manager, self.jobs)
             except Exception as e:
                 print(f"[WARN] Nie udało się podpiąć GlobalTab: {e}")
 
@@ -278,69 +380,410 @@ class MainWindow(QMainWindow):
         if self.device_list.devices:
             first_device = self.device_list.devices[0]
             self.detail_box.pages["GLOBAL"].bind_device(
-                first_device, self.connection_manager
+                first_device, self.connection_manager, self.jobs
+            )
+
+    def import_archive(self):
+        """
+        Wczytuje zapisane running-configi (np. nocne zrzuty) do buforów urządzeń
+        bez łączenia się z nimi: import do indeksu logs/configs.db (bulk_ingest),
+        potem snapshot z ConfigIndex.get() dla każdego dopasowanego urządzenia.
+        """
+        folder = QFileDialog.getExistingDirectory(self, "Importuj archiwum configów")
+        if not folder:
+            return
+        index_path = os.path.join(self.connection_manager.log_path, "configs.db")
+        known = {
+            d.host: getattr(self.detail_box.buffers.get(d.host), "hostname", "")
+            for d in self.device_list.devices
+        }
+
+        def work(job):
+            def progress(done, total):
+                job.check()
+                if done == total or done % 100 == 0:
+                    job.report(f"[INGEST] {done}/{total} plików")
+
+            stats = ingest(folder, index_path, progress=progress)
+            with ConfigIndex(index_path) as index:
+                matched = match_devices(index, known)
+                configs = {host: index.get(name) for host, name in matched.items()}
+                return stats, configs, len(index)
+
+        self.jobs.submit(
+            "Import archiwum",
+            work,
+            on_result=lambda res: self._archive_done(*res),
+            on_error=lambda err: QMessageBox.critical(self, "Błąd", err),
+            on_progress=self.detail_box.append_console,
+        )
+
+    def _archive_done(self, stats: dict, configs: dict, indexed: int):
+        """Snapshoty z archiwum do buforów (wątek GUI); bieżące urządzenie → taby."""
+        for host, conf in configs.items():
+            current = self.current_device
+            if current is not None and current.host == host:
+                self.detail_box.sync_tabs_from_config(conf)
+            else:
+                buf = self.detail_box.buffers.setdefault(host, DeviceBuffer())
+                buf.hostname = conf.hostname or buf.hostname
+                buf.config = conf
+            self.detail_box.append_console(
+                f"[INGEST] {host}: wczytano snapshot z archiwum ({conf.hostname})"
             )
 
+        self.detail_box.append_console(
+            f"[INGEST] plików: {stats['files']}, sparsowano: {stats['parsed']}, "
+            f"pominięto: {stats['skipped']}, błędy: {stats['errors']}, "
+            f"czas: {stats['seconds']:.1f} s"
+        )
+        QMessageBox.information(
+            self,
+            "Zaimportowano",
+            f"Archiwum: {indexed} configów w indeksie, dopasowano "
+            f"{len(configs)} z {len(self.device_list.devices)} urządzeń.",
+        )
+
     def open_settings_dialog(self):
-        dialog = SettingsDialog(self, self.connection_type)
+        dialog = SettingsDialog(
+            self, self.connection_type, profiles=self.connection_manager.profiles
+        )
         if dialog.exec() == QDialog.Accepted:
             self.connection_type = dialog.get_connection_type()
+            self.connection_manager.tuner.enabled = dialog.chk_auto_tune.isChecked()
+            self.connection_manager.defer_save = dialog.chk_defer_save.isChecked()
+            self.connection_manager.pending_saves.set_idle(
+                dialog.spin_save_idle.value()
+            )
+            self.config_sync.conditional = dialog.chk_conditional_sync.isChecked()
 
     # --- NOWE: aktualizacja statusu ---
     def update_status_bar(self):
-        """Odświeża pasek statusu (co 4 sekundy)."""
+        """Odświeża pasek statusu ze stanu SessionMonitor (bez dotykania kanału)."""
+        self._update_pending_marks()
         if not self.current_device:
             self.status_label.setText("Brak aktywnego urządzenia.")
             return
 
         dev = self.current_device
-        alive = self.connection_manager.is_connected(dev)
+        st = self.session_monitor.status(dev.host)
+        alive = (
+            st is not None and st.alive and dev.host in self.connection_manager.sessions
+        )
         color = "#0f0" if alive else "#f00"
         state = "CONNECTED" if alive else "DISCONNECTED"
-        time_str = QTime.currentTime().toString("HH:mm:ss")
+        if st is not None and st.checked_at:
+            time_str = datetime.fromtimestamp(st.checked_at).strftime("%H:%M:%S")
+        else:
+            time_str = "-"
+
+        logins = self.connection_manager.scheduler.stats()
+        queue = (
+            f" | Logowania w kolejce: {logins.waiting} (śr. {logins.wait_avg:.1f} s)"
+            if logins.waiting
+            else ""
+        )
+
+        pending = self.connection_manager.pending_saves.pending()
+        if pending:
+            queue += f" | Niezapisane: {len(pending)} urz."
+            stalled = sum(e.stalled for e in pending.values())
+            if stalled:
+                queue += f" <span style='color:#f00'>(bez autozapisu: {stalled})</span>"
 
         self.status_label.setText(
-            f"<b>{dev.host}</b> — <span style='color:{color}'>{state}</span> | Last check: {time_str}"
+            f"<b>{dev.host}</b> — <span style='color:{color}'>{state}</span> | Last check: {time_str}{queue}"
+        )
+
+    def on_session_changed(self, state: SessionState):
+        """Zmiana stanu sesji z monitora (już w wątku GUI)."""
+        if not state.alive:
+            self.detail_box.append_console(f"[MONITOR] {state.host}: sesja zamknięta")
+        if self.current_device and self.current_device.host == state.host:
+            self.update_status_bar()
+
+    def _update_jobs_label(self, active: int):
+        self.jobs_label.setText(f"| Zadania w tle: {active}" if active else "")
+
+    def cancel_jobs(self):
+        """Anuluje wszystkie operacje w tle (oczekujące od razu, trwające po kroku)."""
+        n = self.jobs.active()
+        self.jobs.cancel_all()
+        self.detail_box.append_console(f"[JOBS] Anulowano {n} zadań.")
+
+    def commit_pending(self):
+        """Jeden write memory na każdym urządzeniu z odroczonymi zmianami."""
+        cm = self.connection_manager
+        pending = cm.pending_saves.pending()
+        if not pending:
+            QMessageBox.information(
+                self, "Brak zmian", "Żadne urządzenie nie ma niezapisanych zmian."
+            )
+            return
+
+        def work(job):
+            failed = []
+            for res in cm.commit_all(stop=job.cancel_event):
+                job.report(
+                    f"[SAVE] {res.device.host}: "
+                    + ("zapisano" if res.ok else f"błąd: {res.error}")
+                )
+                if not res.ok:
+                    failed.append(res.device.host)
+            return failed
+
+        def done(failed):
+            self._update_pending_marks()
+            if failed:
+                QMessageBox.warning(
+                    self, "Błąd zapisu", "Nie zapisano: " + ", ".join(failed)
+                )
+
+        self.jobs.submit(
+            f"Write memory ({len(pending)})",
+            work,
+            on_result=done,
+            on_error=lambda err: QMessageBox.critical(self, "Błąd", err),
+            on_progress=self.detail_box.append_console,
+        )
+
+    def backup_all_devices(self):
+        """running-config wszystkich urządzeń do folderu (SCP/SFTP, awaryjnie CLI)."""
+        devices = list(self.device_list.devices)
+        if not devices:
+            QMessageBox.information(self, "Brak urządzeń", "Lista urządzeń jest pusta.")
+            return
+        folder = QFileDialog.getExistingDirectory(
+            self, "Folder kopii zapasowych", self.settings.value("backup_dir", "")
+        )
+        if not folder:
+            return
+        self.settings.setValue("backup_dir", folder)
+        backup = ConfigBackup(self.connection_manager)
+
+        def work(job):
+            failed = []
+            for res in backup.backup_many(
+                devices, "running", folder, stop=job.cancel_event
+            ):
+                job.report(
+                    f"[BACKUP] {res.device.host}: "
+                    + (res.output if res.ok else f"błąd: {res.error}")
+                )
+                if not res.ok:
+                    failed.append(res.device.host)
+            return failed
+
+        def done(failed):
+            if failed:
+                QMessageBox.warning(
+                    self, "Kopia zapasowa", "Nie skopiowano: " + ", ".join(failed)
+                )
+            else:
+                self.detail_box.append_console(
+                    f"[BACKUP] {len(devices)} urządzeń → {folder}"
+                )
+
+        self.jobs.submit(
+            f"Backup ({len(devices)})",
+            work,
+            on_result=done,
+            on_error=lambda err: QMessageBox.critical(self, "Błąd", err),
+            on_progress=self.detail_box.append_console,
         )
 
     def closeEvent(self, event):
+        pending = self.connection_manager.pending_saves.pending()
+        if pending:
+            reply = QMessageBox.question(
+                self,
+                "Niezapisane zmiany",
+                f"{len(pending)} urządzeń ma zmiany niezapisane w NVRAM "
+                f"({', '.join(sorted(pending))}). Zapisać przed wyjściem?",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+                QMessageBox.Yes,
+            )
+            if reply == QMessageBox.Cancel:
+                event.ignore()
+                return
+            if reply == QMessageBox.Yes:
+                for res in self.connection_manager.commit_all():
+                    if not res.ok:
+                        print(f"[WARN] Nie zapisano {res.device.host}: {res.error}")
+        self.connection_manager.pending_saves.close()
+        self.session_monitor.stop()
+        self.jobs.cancel_all()
+        self.jobs.wait(5000)
         for dev in list(self.connection_manager.sessions.keys()):
             d = next((x for x in self.device_list.devices if x.host == dev), None)
             if d:
                 self.connection_manager.disconnect(d)
+        # pomiary czasów zapisywane są z opóźnieniem — dopisz zaległe
+        self.connection_manager.profiles.flush()
+        self.connection_manager.session_logs.close()
         self.settings.setValue("connection_type", self.connection_type)
         super().closeEvent(event)
 
     # --- MOCKOWE FUNKCJE KONFIGURACYJNE ---
 
     def apply_current_device(self):
+        """Wypycha na urządzenie tylko różnice między zakładkami a snapshotem."""
         if not self.current_device:
             QMessageBox.warning(self, "Brak urządzenia", "Nie wybrano urządzenia.")
             return
 
         dev = self.current_device
-        try:
-            if not self.connection_manager.connect(dev):
+        cm = self.connection_manager
+        self.detail_box.save_tab_state(dev)
+        buf = self.detail_box.buffers.get(dev.host)
+        if not buf or not buf.config:
+            QMessageBox.warning(
+                self,
+                "Brak snapshotu",
+                "Najpierw pobierz konfigurację urządzenia (Sync) — bez niej "
+                "nie wiadomo, co się zmieniło.",
+            )
+            return
+        if not supported(buf.config):
+            QMessageBox.critical(
+                self,
+                "Nieobsługiwany vendor",
+                f"Wypychanie zmian z zakładek działa tylko dla Cisco IOS "
+                f"({dev.host}: {buf.config.vendor}).",
+            )
+            return
+
+        plan = plan_from_tabs(buf.config, buf.tabs, self.detail_box.tab_names(dev))
+        for warning in plan.warnings:
+            self.detail_box.append_console(f"[WARN] {warning}")
+        if plan.empty:
+            QMessageBox.information(
+                self, "Bez zmian", f"Zakładki {dev.host} zgadzają się z urządzeniem."
+            )
+            return
+
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Question)
+        box.setWindowTitle("Zatwierdź konfigurację")
+        box.setText(f"Wysłać {len(plan.commands)} komend na {dev.host}?")
+        box.setDetailedText(plan.preview())
+        box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        if box.exec() != QMessageBox.Yes:
+            return
+
+        previous = buf.config
+
+        def work(job):
+            if not cm.connect(dev):
                 raise ConnectionError("Nie udało się nawiązać połączenia.")
-            output = self.connection_manager.send_config(dev, ["end", "write memory"])
+            job.check()
+            output = cm.send_config(dev, plan.commands)
+            # nowy snapshot — następna delta liczy się już od stanu po zmianach
+            job.report(f"[SYNC] Odświeżanie konfiguracji {dev.host}...")
+            return output, *self.config_sync.fetch_incremental(dev, previous)
+
+        def done(result):
+            output, conf, delta = result
             self.detail_box.append_console(output)
+            self._sync_done(dev, conf, delta, notify=False)
             QMessageBox.information(
-                self, "Zatwierdzono", f"Konfiguracja zapisana na {dev.host}."
+                self,
+                "Zatwierdzono",
+                f"Wysłano {len(plan.commands)} komend na {dev.host}.",
             )
-        except Exception as e:
-            QMessageBox.critical(self, "Błąd", str(e))
+
+        self.jobs.submit(
+            f"Apply {dev.host}",
+            work,
+            on_result=done,
+            on_error=lambda err: QMessageBox.critical(self, "Błąd", err),
+            on_progress=self.detail_box.append_console,
+        )
 
     def apply_all_devices(self):
-        """Zatwierdza konfigurację dla wszystkich urządzeń (mock)."""
+        """Wdraża zmiany z zakładek na wiele urządzeń falami (RolloutDialog)."""
         if not self.device_list.devices:
             QMessageBox.information(self, "Brak urządzeń", "Lista urządzeń jest pusta.")
             return
-        hosts = [d.host for d in self.device_list.devices]
-        QMessageBox.information(
-            self, "Zatwierdzono", "Zatwierdzono konfigurację dla wszystkich urządzeń."
+        if self.current_device:
+            self.detail_box.save_tab_state(self.current_device)
+
+        targets, no_snapshot, unsupported = [], [], []
+        for dev in self.device_list.devices:
+            buf = self.detail_box.buffers.get(dev.host)
+            if not buf or not buf.config:
+                no_snapshot.append(dev.host)
+                continue
+            if not supported(buf.config):
+                unsupported.append(f"{dev.host} ({buf.config.vendor})")
+                continue
+            plan = plan_from_tabs(buf.config, buf.tabs, self.detail_box.tab_names(dev))
+            for warning in plan.warnings:
+                self.detail_box.append_console(f"[WARN] {dev.host}: {warning}")
+            if not plan.empty:
+                targets.append(RolloutTarget(dev, plan.commands))
+        if no_snapshot:
+            self.detail_box.append_console(
+                f"[ROLLOUT] Pominięto bez snapshotu (brak synca): {', '.join(no_snapshot)}"
+            )
+        if unsupported:
+            self.detail_box.append_console(
+                f"[ROLLOUT] Pominięto (wypychanie tylko dla Cisco IOS): "
+                f"{', '.join(unsupported)}"
+            )
+            QMessageBox.critical(
+                self,
+                "Nieobsługiwany vendor",
+                "Wypychanie zmian z zakładek działa tylko dla Cisco IOS. "
+                f"Pominięto: {', '.join(unsupported)}",
+            )
+        if not targets:
+            QMessageBox.information(
+                self, "Bez zmian", "Żadne urządzenie nie ma zmian do wdrożenia."
+            )
+            return
+
+        dialog = RolloutDialog(
+            targets,
+            self.connection_manager,
+            self.jobs,
+            self,
+            on_finished=self._rollout_done,
+        )
+        dialog.exec()
+
+    def _rollout_done(self, report):
+        """Po wdrożeniu: nowe snapshoty urządzeń, na które poszły zmiany."""
+        self.detail_box.append_console(
+            f"[ROLLOUT] OK {report.count('ok')}, błędy {report.count('failed')}, "
+            f"pominięte {report.count('skipped')}"
+            + (f" — zatrzymano: {report.halted}" if report.halted else "")
+        )
+        done = [r.device for r in report.results if r.status != "skipped"]
+        if not done:
+            return
+        cm, sync = self.connection_manager, self.config_sync
+        previous = {
+            d.host: getattr(self.detail_box.buffers.get(d.host), "config", None)
+            for d in done
+        }
+
+        def work(job):
+            def refresh(dev):
+                conf, delta = sync.fetch_incremental(dev, previous[dev.host])
+                job.emit_partial((dev, conf, delta))
+                return ""
+
+            for res in cm.run_many(done, refresh, stop=job.cancel_event):
+                if not res.ok:
+                    job.report(f"[SYNC] {res.device.host}: {res.error}")
+
+        self.jobs.submit(
+            f"Sync po wdrożeniu ({len(done)})",
+            work,
+            on_progress=self.detail_box.append_console,
+            on_partial=lambda value: self._sync_done(*value, notify=False),
         )
-        for h in hosts:
-            self.detail_box.append_console(f"[MOCK] Applied configuration for {h}")
 
     def sync_current_device(self):
         if not self.current_device:
@@ -348,24 +791,88 @@ class MainWindow(QMainWindow):
             return
 
         dev = self.current_device
-        try:
-            if not self.connection_manager.connect(dev):
+        cm = self.connection_manager
+        # 🆕 pobranie + parsowanie (przyrostowe względem ostatniego snapshotu)
+        buf = self.detail_box.buffers.get(dev.host)
+        previous = buf.config if buf else None
+
+        def work(job):
+            if not cm.connect(dev):
                 raise ConnectionError("Nie udało się połączyć.")
-            # 🆕 pobranie + parsowanie
-            conf = self.config_sync.fetch_and_parse(dev)
+            job.check()
+
+            def on_block(keyword, partial):
+                job.check()  # anulowanie w trakcie transferu
+                # kopia tylko bloku dla taba (builder dalej rozbudowuje kontenery);
+                # deepcopy całego configu przy każdym bloku byłoby O(n²)
+                job.emit_partial((keyword, _preview_copy(keyword, partial)))
+
+            job.report(f"[SYNC] Pobieranie konfiguracji {dev.host}...")
+            return self.config_sync.fetch_incremental(dev, previous, on_block=on_block)
+
+        self.jobs.submit(
+            f"Sync {dev.host}",
+            work,
+            on_result=lambda res: self._sync_done(dev, *res),
+            on_error=lambda err: QMessageBox.critical(self, "Błąd", err),
+            on_progress=self.detail_box.append_console,
+            on_partial=lambda value: self._preview_block(dev, *value),
+        )
 
-            # 🆕 rozesłanie do tabów
-            self.detail_box.sync_tabs_from_config(conf)
+    def _sync_done(self, dev: Device, conf, delta, notify: bool = True):
+        """Wynik synca (wątek GUI): taby albo tylko bufor, jeśli wybrano inne."""
+        if self.current_device is not dev:
+            buf = self.detail_box.buffers.setdefault(dev.host, DeviceBuffer())
+            buf.hostname = conf.hostname or buf.hostname
+            buf.config = conf
+            self.detail_box.append_console(
+                f"[SYNC] {dev.host}: zapisano w buforze (urządzenie nieaktywne)."
+            )
+            return
+
+        # 🆕 rozesłanie do tabów (z deltą — tylko zmienione)
+        self.detail_box.sync_tabs_from_config(conf, delta)
+        if delta is not None and not delta.fetched:
+            # taby edytowane ręcznie i tak dostały pełny sync z previous
+            self.detail_box.append_console(
+                f"[SYNC] {dev.host}: bez zmian na urządzeniu (sonda) — config "
+                "nie był pobierany, taby odświeżone z ostatniego snapshotu."
+            )
+        elif delta is not None:
+            self.detail_box.append_console(
+                f"[SYNC] Ponownie sparsowane sekcje: {delta.sections_reparsed}"
+                + (" (bez zmian)" if delta.empty else "")
+            )
 
-            # 🧾 konsola globalna + status
-            self.detail_box.append_console(f"[SYNC] Hostname: {conf.hostname or '-'}")
+        # 🧾 konsola globalna + status
+        self.detail_box.append_console(f"[SYNC] Hostname: {conf.hostname or '-'}")
+        st = self.config_sync.cache.stats()
+        self.detail_box.append_console(
+            f"[SYNC] Parse cache: {st['hits']} hit / {st['misses']} miss "
+            f"(~{st['saved_seconds'] * 1000:.0f} ms zaoszczędzone)"
+        )
+        probes = self.config_sync.probe_stats()
+        if probes["probes"]:
+            self.detail_box.append_console(
+                f"[SYNC] Sonda zmian: {probes['unchanged']}/{probes['probes']} "
+                "bez pełnego pobrania"
+            )
+        if notify:
             QMessageBox.information(
                 self,
                 "Pobrano",
-                f"Konfiguracja {dev.host} zsynchronizowana z zakładkami.",
+                (
+                    f"Konfiguracja {dev.host} bez zmian od ostatniego pobrania "
+                    "(sonda zmian) — zakładki przywrócone z ostatniego snapshotu."
+                    if delta is not None and not delta.fetched
+                    else f"Konfiguracja {dev.host} zsynchronizowana z zakładkami."
+                ),
             )
-        except Exception as e:
-            QMessageBox.critical(self, "Błąd", str(e))
+
+    def _preview_block(self, dev: Device, keyword: str, partial):
+        """Wypełnia tab częściowym configiem, zanim transfer się skończy."""
+        if self.current_device is dev:
+            self.detail_box.preview_block(keyword, partial)
 
     def reset_current_device(self):
         """Przywraca ostatni snapshot (bez pobierania z urządzenia)."""
@@ -440,3 +947,29 @@ class MainWindow(QMainWindow):
             self.detail_box.buffers.clear()
         else:
             self.detail_box.buffers.pop(host, None)
+
+
+def _preview_copy(keyword: str, partial: ParsedConfig) -> ParsedConfig:
+    """
+    Podgląd bloku sekcji dla wątku GUI: kopia tylko kontenera, który pokazuje
+    tab tego bloku (patrz DeviceDetailWidget.preview_block); reszta pusta.
+    """
+    conf = ParsedConfig(vendor=partial.vendor, hostname=partial.hostname)
+    if keyword == "interface":
+        conf.interfaces = ParsedInterfaces(dict(partial.interfaces.items))
+    elif keyword == "vlan":
+        # porty VLAN-ów dopina dopiero finish() — lista musi być własna
+        conf.vlans = ParsedVLANs(
+            {
+                vid: replace(rec, ports=list(rec.ports))
+                for vid, rec in partial.vlans.items.items()
+            }
+        )
+    elif keyword in ("ip", "router"):
+        r = partial.routing
+        conf.routing = ParsedRouting(
+            list(r.static), list(r.rip_networks), list(r.ospf), list(r.rip_interfaces)
+        )
+    elif keyword == "access-list":
+        conf.acls = ParsedACLs(list(partial.acls.rules))
+    return conf
@@ -0,0 +1,293 @@
+# gui/RolloutDialog.py
+"""
+Okno wdrożenia konfiguracji na wiele urządzeń (services/rollout.py):
+wybór urządzeń i parametrów fal, potem podgląd postępu na żywo.
+"""
+
+import re
+import threading
+
+from PySide6.QtCore import Qt, QSettings
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QFormLayout,
+    QGroupBox,
+    QLabel,
+    QLineEdit,
+    QSpinBox,
+    QDoubleSpinBox,
+    QPushButton,
+    QProgressBar,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QPlainTextEdit,
+    QMessageBox,
+)
+
+from services.rollout import (
+    RolloutEngine,
+    RolloutEvent,
+    RolloutReport,
+    RolloutTarget,
+    plan_waves,
+)
+
+_COLORS = {"ok": "#2e7d32", "failed": "#c62828", "skipped": "#9e9e9e"}
+
+
+class RolloutDialog(QDialog):
+    def __init__(
+        self, targets: list[RolloutTarget], cm, jobs, parent=None, on_finished=None
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Wdrożenie konfiguracji (wszystkie urządzenia)")
+        self.resize(900, 620)
+        self.targets = targets
+        self.cm = cm
+        self.jobs = jobs
+        self.on_finished = on_finished  # on_finished(report) — także po zamknięciu
+        self.report: RolloutReport | None = None
+        self._stop = threading.Event()
+        self._running = False
+        self._rows = {t.device.host: row for row, t in enumerate(targets)}
+        self.settings = QSettings("WEEiA", "PyNetWizard")
+
+        layout = QVBoxLayout(self)
+
+        # --- parametry fal ---
+        box = QGroupBox("Parametry wdrożenia")
+        form = QFormLayout(box)
+        self.spin_canary = QSpinBox()
+        self.spin_canary.setRange(1, 100)
+        self.spin_canary.setValue(int(self.settings.value("rollout_canary", 1)))
+        self.spin_factor = QDoubleSpinBox()
+        self.spin_factor.setRange(1.0, 10.0)
+        self.spin_factor.setSingleStep(0.5)
+        self.spin_factor.setValue(float(self.settings.value("rollout_factor", 2.0)))
+        self.spin_workers = QSpinBox()
+        self.spin_workers.setRange(1, 256)
+        self.spin_workers.setValue(
+            int(self.settings.value("rollout_workers", cm.max_workers))
+        )
+        self.spin_fail = QSpinBox()
+        self.spin_fail.setRange(0, 100)
+        self.spin_fail.setSuffix(" %")
+        self.spin_fail.setValue(int(self.settings.value("rollout_max_fail", 10)))
+        self.edit_check = QLineEdit(
+            self.settings.value("rollout_post_check", "show ip interface brief")
+        )
+        self.edit_expect = QLineEdit(self.settings.value("rollout_expect", ""))
+        self.edit_expect.setPlaceholderText("regex (opcjonalnie), np. up\\s+up")
+        form.addRow("Kanarek (urządzeń):", self.spin_canary)
+        form.addRow("Wzrost fali (×):", self.spin_factor)
+        form.addRow("Równolegle:", self.spin_workers)
+        form.addRow("Stop przy porażkach >", self.spin_fail)
+        form.addRow("Post-check:", self.edit_check)
+        form.addRow("Oczekiwany wynik:", self.edit_expect)
+        layout.addWidget(box)
+        self.lbl_waves = QLabel()
+        layout.addWidget(self.lbl_waves)
+        for spin in (self.spin_canary, self.spin_factor):
+            spin.valueChanged.connect(self._update_waves)
+
+        # --- urządzenia ---
+        self.table = QTableWidget(len(targets), 5)
+        self.table.setHorizontalHeaderLabels(
+            ["Urządzenie", "Komend", "Fala", "Status", "Szczegóły"]
+        )
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        for row, t in enumerate(targets):
+            host = QTableWidgetItem(t.device.host)
+            host.setFlags(host.flags() | Qt.ItemIsUserCheckable)
+            host.setCheckState(Qt.Checked)
+            host.setToolTip("\n".join(t.commands))
+            self.table.setItem(row, 0, host)
+            self.table.setItem(row, 1, QTableWidgetItem(str(len(t.commands))))
+            for col in (2, 3, 4):
+                self.table.setItem(row, col, QTableWidgetItem(""))
+        self.table.itemChanged.connect(lambda _item: self._update_waves())
+        layout.addWidget(self.table, 3)
+
+        # --- postęp ---
+        self.progress = QProgressBar()
+        self.progress.setRange(0, len(targets))
+        layout.addWidget(self.progress)
+        self.lbl_status = QLabel("Gotowe do startu.")
+        layout.addWidget(self.lbl_status)
+        self.log = QPlainTextEdit()
+        self.log.setReadOnly(True)
+        self.log.setMaximumBlockCount(2000)
+        layout.addWidget(self.log, 1)
+
+        btn_row = QHBoxLayout()
+        self.btn_start = QPushButton("Start")
+        self.btn_start.clicked.connect(self.start)
+        self.btn_stop = QPushButton("Stop")
+        self.btn_stop.setEnabled(False)
+        self.btn_stop.clicked.connect(self.stop)
+        self.btn_close = QPushButton("Zamknij")
+        self.btn_close.clicked.connect(self.close)
+        btn_row.addWidget(self.btn_start)
+        btn_row.addWidget(self.btn_stop)
+        btn_row.addStretch()
+        btn_row.addWidget(self.btn_close)
+        layout.addLayout(btn_row)
+
+        self._update_waves()
+
+    # === wybór i start ===
+
+    def selected(self) -> list[RolloutTarget]:
+        return [
+            t
+            for row, t in enumerate(self.targets)
+            if self.table.item(row, 0).checkState() == Qt.Checked
+        ]
+
+    def _update_waves(self):
+        if self._running:
+            return  # zmiany tekstu statusu w trakcie wdrożenia
+        sizes = plan_waves(
+            len(self.selected()), self.spin_canary.value(), self.spin_factor.value()
+        )
+        self.lbl_waves.setText(
+            f"Fale: {' → '.join(map(str, sizes)) or '-'} "
+            f"({len(self.selected())} urządzeń)"
+        )
+
+    def start(self):
+        targets = self.selected()
+        if not targets:
+            QMessageBox.information(self, "Brak urządzeń", "Zaznacz urządzenia.")
+            return
+        reply = QMessageBox.question(
+            self,
+            "Potwierdzenie",
+            f"Wdrożyć konfigurację na {len(targets)} urządzeń?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            return
+        try:
+            engine = RolloutEngine(
+                self.cm,
+                canary=self.spin_canary.value(),
+                factor=self.spin_factor.value(),
+                max_workers=self.spin_workers.value(),
+                post_check=self.edit_check.text(),
+                expect=self.edit_expect.text().strip(),
+                max_failure_rate=self.spin_fail.value() / 100,
+            )
+        except re.error as e:
+            QMessageBox.warning(self, "Błąd", f"Nieprawidłowy wzorzec: {e}")
+            return
+        self._save_settings()
+
+        self._running = True
+        for wave, batch in enumerate(engine.waves(targets), 1):
+            for t in batch:
+                self._set(t.device.host, 2, str(wave))
+                self._set(t.device.host, 3, "oczekuje")
+        self.progress.setRange(0, len(targets))
+        self.progress.setValue(0)
+        self._stop.clear()
+        self.btn_start.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+
+        self.jobs.submit(
+            f"Rollout ({len(targets)})",
+            lambda job: engine.run(targets, on_event=job.emit_partial, stop=self._stop),
+            on_result=self._finished,
+            on_error=self._failed,
+            on_partial=self._on_event,
+        )
+
+    def stop(self):
+        """Nowe urządzenia nie startują; te w toku kończą swoją pracę."""
+        self._stop.set()
+        self.btn_stop.setEnabled(False)
+        self.lbl_status.setText("Zatrzymywanie (urządzenia w toku kończą)...")
+
+    # === postęp (wątek GUI) ===
+
+    def _on_event(self, event: RolloutEvent):
+        if event.kind == "wave":
+            self.lbl_status.setText(event.message)
+            self.log.appendPlainText(f"[ROLLOUT] {event.message}")
+            return
+        if event.kind == "halt":
+            self.log.appendPlainText(f"[ROLLOUT] STOP: {event.message}")
+            self.lbl_status.setText(f"Zatrzymano: {event.message}")
+            return
+
+        r = event.result
+        self._set(r.device.host, 3, r.status, _COLORS.get(r.status))
+        self._set(
+            r.device.host, 4, r.error or (f"{r.seconds:.1f} s" if r.seconds else "")
+        )
+        self.progress.setValue(self.progress.value() + 1)
+        if r.status == "failed":
+            self.log.appendPlainText(f"[FAIL] {r.device.host}: {r.error}")
+
+    def _finished(self, report: RolloutReport):
+        self.report = report
+        self._done()
+        summary = (
+            f"OK: {report.count('ok')}, błędy: {report.count('failed')}, "
+            f"pominięte: {report.count('skipped')}"
+        )
+        self.lbl_status.setText(
+            f"Zakończono — {summary}"
+            + (f" | zatrzymano: {report.halted}" if report.halted else "")
+        )
+        self.log.appendPlainText(f"[ROLLOUT] {summary}")
+        if self.on_finished:
+            self.on_finished(report)
+
+    def _failed(self, err: str):
+        self._done()
+        self.lbl_status.setText(f"Błąd wdrożenia: {err}")
+        QMessageBox.critical(self, "Błąd", err)
+
+    def _done(self):
+        self._running = False
+        self.btn_stop.setEnabled(False)
+        self.btn_close.setEnabled(True)
+
+    def closeEvent(self, event):
+        if self._running:
+            reply = QMessageBox.question(
+                self,
+                "Wdrożenie w toku",
+                "Zatrzymać wdrożenie? Urządzenia w toku dokończą swoją pracę.",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+            self.stop()
+        super().closeEvent(event)
+
+    # === pomocnicze ===
+
+    def _set(self, host: str, col: int, text: str, color: str | None = None):
+        item = self.table.item(self._rows[host], col)
+        item.setText(text)
+        if color:
+            item.setForeground(QColor(color))
+
+    def _save_settings(self):
+        self.settings.setValue("rollout_canary", self.spin_canary.value())
+        self.settings.setValue("rollout_factor", self.spin_factor.value())
+        self.settings.setValue("rollout_workers", self.spin_workers.value())
+        self.settings.setValue("rollout_max_fail", self.spin_fail.value())
+        self.settings.setValue("rollout_post_check", self.edit_check.text())
+        self.settings.setValue("rollout_expect", self.edit_expect.text())
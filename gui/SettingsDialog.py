@@ -9,16 +9,20 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QFileDialog,
     QLineEdit,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
 )
 from PySide6.QtCore import QSettings
 
 
 class SettingsDialog(QDialog):
-    def __init__(self, parent=None, current_type="ssh"):
+    def __init__(self, parent=None, current_type="ssh", profiles=None):
         super().__init__(parent)
         self.setWindowTitle("Ustawienia")
         self.resize(350, 300)
 
+        self.profiles = profiles  # ProfileStore z ConnectionManagera (opcjonalnie)
         self.settings = QSettings("WEEiA", "PyNetWizard")
 
         layout = QVBoxLayout(self)
@@ -37,6 +41,38 @@ class SettingsDialog(QDialog):
         layout.addWidget(QLabel("Timeout (sekundy):"))
         layout.addWidget(self.spin_timeout)
 
+        self.spin_max_workers = QSpinBox()
+        self.spin_max_workers.setRange(1, 256)
+        self.spin_max_workers.setValue(int(self.settings.value("max_workers", 16)))
+        layout.addWidget(
+            QLabel("Równoległe połączenia (operacje na wielu urządzeniach):")
+        )
+        layout.addWidget(self.spin_max_workers)
+
+        self.spin_monitor_interval = QSpinBox()
+        self.spin_monitor_interval.setRange(1, 300)
+        self.spin_monitor_interval.setValue(
+            int(self.settings.value("monitor_interval", 5))
+        )
+        layout.addWidget(QLabel("Sprawdzanie sesji w tle co (sekundy):"))
+        layout.addWidget(self.spin_monitor_interval)
+
+        # limity logowań — chronią serwery AAA i linie VTY przed falą sesji
+        self.spin_login_rate = QSpinBox()
+        self.spin_login_rate.setRange(0, 100)
+        self.spin_login_rate.setSpecialValueText("bez limitu")
+        self.spin_login_rate.setValue(int(self.settings.value("login_rate", 5)))
+        layout.addWidget(QLabel("Nowe logowania na sekundę (wszystkie urządzenia):"))
+        layout.addWidget(self.spin_login_rate)
+
+        self.spin_logins_per_site = QSpinBox()
+        self.spin_logins_per_site.setRange(1, 256)
+        self.spin_logins_per_site.setValue(
+            int(self.settings.value("logins_per_site", 8))
+        )
+        layout.addWidget(QLabel("Równoczesne logowania w jednej podsieci /24:"))
+        layout.addWidget(self.spin_logins_per_site)
+
         self.chk_autosync = QCheckBox(
             "Automatycznie pobieraj konfigurację po dodaniu urządzenia"
         )
@@ -64,6 +100,78 @@ class SettingsDialog(QDialog):
         log_layout.addWidget(btn_browse)
         layout.addLayout(log_layout)
 
+        self.chk_parse_cache_disk = QCheckBox(
+            "Zapisuj cache parsowania na dysku (w folderze logów)"
+        )
+        self.chk_parse_cache_disk.setChecked(
+            self.settings.value("parse_cache_disk", "false") == "true"
+        )
+        layout.addWidget(self.chk_parse_cache_disk)
+
+        self.spin_session_log_mb = QSpinBox()
+        self.spin_session_log_mb.setRange(1, 1024)
+        self.spin_session_log_mb.setValue(
+            int(self.settings.value("session_log_max_mb", 5))
+        )
+        layout.addWidget(QLabel("Rotacja logu sesji po (MB, starsze → .gz):"))
+        layout.addWidget(self.spin_session_log_mb)
+
+        self.chk_auto_tune = QCheckBox(
+            "Dostrajaj czasy Netmiko do urządzeń (timeouty, delay factor)"
+        )
+        self.chk_auto_tune.setChecked(
+            self.settings.value("auto_tune", "true") == "true"
+        )
+        layout.addWidget(self.chk_auto_tune)
+
+        self.chk_defer_save = QCheckBox(
+            "Odraczaj write memory (jeden zapis NVRAM na serię zmian)"
+        )
+        self.chk_defer_save.setChecked(
+            self.settings.value("defer_save", "false") == "true"
+        )
+        layout.addWidget(self.chk_defer_save)
+
+        self.spin_save_idle = QSpinBox()
+        self.spin_save_idle.setRange(0, 3600)
+        self.spin_save_idle.setValue(int(self.settings.value("save_idle", 60)))
+        layout.addWidget(
+            QLabel("Zapis po bezczynności urządzenia (s, 0 → tylko ręcznie):")
+        )
+        layout.addWidget(self.spin_save_idle)
+
+        self.chk_conditional_sync = QCheckBox(
+            "Sync warunkowy (pełne pobranie configu tylko po zmianie na urządzeniu)"
+        )
+        self.chk_conditional_sync.setChecked(
+            self.settings.value("conditional_sync", "true") == "true"
+        )
+        layout.addWidget(self.chk_conditional_sync)
+
+        if self.profiles is not None:
+            self.table_timing = QTableWidget(0, 7)
+            self.table_timing.setHorizontalHeaderLabels(
+                [
+                    "Urządzenie",
+                    "Opóźnienie [ms]",
+                    "KB/s",
+                    "read_timeout",
+                    "delay factor",
+                    "Próbki",
+                    "Timeouty",
+                ]
+            )
+            self.table_timing.horizontalHeader().setSectionResizeMode(
+                QHeaderView.ResizeToContents
+            )
+            self.table_timing.setEditTriggers(QTableWidget.NoEditTriggers)
+            layout.addWidget(QLabel("Wyuczone czasy połączeń:"))
+            layout.addWidget(self.table_timing)
+            btn_reset_timing = QPushButton("Zapomnij wyuczone czasy")
+            btn_reset_timing.clicked.connect(self.reset_timing)
+            layout.addWidget(btn_reset_timing)
+            self.fill_timing_table()
+
         # --- Sekcja: Wygląd ---
         layout.addWidget(QLabel("<b>Wygląd</b>"))
         self.combo_theme = QComboBox()
@@ -87,19 +195,55 @@ class SettingsDialog(QDialog):
         if folder:
             self.edit_log_path.setText(folder)
 
+    def fill_timing_table(self):
+        items = sorted(self.profiles.all().items())
+        self.table_timing.setRowCount(len(items))
+        for row, (key, p) in enumerate(items):
+            values = [
+                key,
+                f"{p.latency_ms:.0f}",
+                f"{p.throughput_bps / 1024:.1f}",
+                f"{p.read_timeout:.0f}",
+                f"{p.delay_factor:.2f}",
+                str(p.samples),
+                str(p.timeouts),
+            ]
+            for col, value in enumerate(values):
+                self.table_timing.setItem(row, col, QTableWidgetItem(value))
+
+    def reset_timing(self):
+        """Usuwa profile połączeń — kolejne połączenia mierzą wszystko od nowa."""
+        for key in list(self.profiles.all()):
+            self.profiles.invalidate(key)
+        self.fill_timing_table()
+
     def reset_defaults(self):
         self.settings.clear()
         self.combo_type.setCurrentText("ssh")
         self.spin_timeout.setValue(10)
+        self.spin_max_workers.setValue(16)
+        self.spin_monitor_interval.setValue(5)
+        self.spin_login_rate.setValue(5)
+        self.spin_logins_per_site.setValue(8)
         self.chk_autosync.setChecked(False)
         self.chk_save_passwords.setChecked(False)
         self.chk_verbose.setChecked(False)
+        self.chk_parse_cache_disk.setChecked(False)
+        self.spin_session_log_mb.setValue(5)
+        self.chk_auto_tune.setChecked(True)
+        self.chk_defer_save.setChecked(False)
+        self.spin_save_idle.setValue(60)
+        self.chk_conditional_sync.setChecked(True)
         self.combo_theme.setCurrentText("Jasny")
 
     def save_and_close(self):
         """Zapisuje ustawienia w QSettings"""
         self.settings.setValue("connection_type", self.combo_type.currentText())
         self.settings.setValue("timeout", self.spin_timeout.value())
+        self.settings.setValue("max_workers", self.spin_max_workers.value())
+        self.settings.setValue("monitor_interval", self.spin_monitor_interval.value())
+        self.settings.setValue("login_rate", self.spin_login_rate.value())
+        self.settings.setValue("logins_per_site", self.spin_logins_per_site.value())
         self.settings.setValue(
             "autosync", "true" if self.chk_autosync.isChecked() else "false"
         )
@@ -109,6 +253,22 @@ class SettingsDialog(QDialog):
         self.settings.setValue(
             "verbose", "true" if self.chk_verbose.isChecked() else "false"
         )
+        self.settings.setValue(
+            "parse_cache_disk",
+            "true" if self.chk_parse_cache_disk.isChecked() else "false",
+        )
+        self.settings.setValue(
+            "auto_tune", "true" if self.chk_auto_tune.isChecked() else "false"
+        )
+        self.settings.setValue("session_log_max_mb", self.spin_session_log_mb.value())
+        self.settings.setValue(
+            "defer_save", "true" if self.chk_defer_save.isChecked() else "false"
+        )
+        self.settings.setValue("save_idle", self.spin_save_idle.value())
+        self.settings.setValue(
+            "conditional_sync",
+            "true" if self.chk_conditional_sync.isChecked() else "false",
+        )
         self.settings.setValue("theme", self.combo_theme.currentText())
         self.settings.setValue("log_path", self.edit_log_path.text())
 
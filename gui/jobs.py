@@ -0,0 +1,149 @@
+"""
+Kolejka zadań w tle dla operacji na urządzeniach (Netmiko blokuje wątek).
+Zadania wykonują się w QThreadPool, a wyniki, postęp i błędy wracają do
+wątku GUI przez sygnały — okno nie zamarza na czas logowania i pobierania.
+
+    job = jobs.submit("Sync 10.0.0.1", lambda job: sync.fetch_and_parse(dev))
+    job.signals.finished.connect(...)
+"""
+
+import itertools
+import threading
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class JobCancelled(Exception):
+    """Rzucany z wnętrza zadania, gdy użytkownik je anulował."""
+
+
+class JobSignals(QObject):
+    started = Signal(int)
+    progress = Signal(int, str)  # id, komunikat
+    partial = Signal(int, object)  # id, wynik częściowy (np. podgląd configu)
+    finished = Signal(int, object)  # id, wynik
+    failed = Signal(int, str)  # id, błąd
+    cancelled = Signal(int)
+    done = Signal(int)  # zawsze na końcu (po finished/failed/cancelled)
+
+
+class Job(QRunnable):
+    """
+    Jedno zadanie: fn(job) wykonywane w wątku puli.
+    fn może raportować postęp (job.report / job.emit_partial) i powinno
+    co jakiś czas wołać job.check(), żeby anulowanie działało w trakcie.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, title: str, fn: Callable[["Job"], Any]):
+        super().__init__()
+        self.setAutoDelete(False)  # obiekt trzyma JobQueue, nie pula
+        self.id = next(self._ids)
+        self.title = title
+        self.fn = fn
+        self.signals = JobSignals()
+        self.cancel_event = threading.Event()
+
+    # --- API dla fn (wątek roboczy) ---
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.title)
+
+    def report(self, message: str):
+        self.signals.progress.emit(self.id, message)
+
+    def emit_partial(self, value):
+        self.signals.partial.emit(self.id, value)
+
+    # --- API dla GUI ---
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            self.check()
+            self.signals.started.emit(self.id)
+            result = self.fn(self)
+            self.check()
+        except JobCancelled:
+            self.signals.cancelled.emit(self.id)
+        except Exception as e:
+            self.signals.failed.emit(self.id, f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(self.id, result)
+        finally:
+            self.signals.done.emit(self.id)
+
+
+class JobQueue(QObject):
+    """
+    Pula wątków + rejestr aktywnych zadań.
+    active_changed(n) pozwala pokazać liczbę zadań w toku (np. w pasku statusu).
+    """
+
+    active_changed = Signal(int)
+
+    def __init__(self, max_workers: int = 16, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, int(max_workers)))
+        self.jobs: dict[int, Job] = {}
+
+    def submit(
+        self,
+        title: str,
+        fn: Callable[[Job], Any],
+        on_result: Callable[[Any], None] | None = None,
+        on_error: Callable[[str], None] | None = None,
+        on_progress: Callable[[str], None] | None = None,
+        on_partial: Callable[[Any], None] | None = None,
+    ) -> Job:
+        """Kolejkuje fn(job); callbacki wołane są w wątku GUI."""
+        job = Job(title, fn)
+        sig = job.signals
+        if on_result:
+            sig.finished.connect(lambda _id, res: on_result(res))
+        if on_error:
+            sig.failed.connect(lambda _id, err: on_error(err))
+        if on_progress:
+            sig.progress.connect(lambda _id, msg: on_progress(msg))
+        if on_partial:
+            sig.partial.connect(lambda _id, value: on_partial(value))
+        sig.done.connect(self._finished)
+
+        self.jobs[job.id] = job
+        self.pool.start(job)
+        self.active_changed.emit(len(self.jobs))
+        return job
+
+    def cancel(self, job_id: int):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.cancel()
+        if self.pool.tryTake(job):
+            # jeszcze nie wystartowało — zdejmij z kolejki od razu
+            job.signals.cancelled.emit(job.id)
+            self._finished(job.id)
+
+    def cancel_all(self):
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    def active(self) -> int:
+        return len(self.jobs)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Czeka na zakończenie zadań (np. przy zamykaniu okna)."""
+        return self.pool.waitForDone(msecs)
+
+    def _finished(self, job_id: int):
+        if self.jobs.pop(job_id, None) is not None:
+            self.active_changed.emit(len(self.jobs))
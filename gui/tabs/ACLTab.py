@@ -14,6 +14,7 @@ from PySide6.QtWidgets import (
     QComboBox,
     QMessageBox,
 )
+from PySide6.QtCore import Qt
 
 from services.parsed_config import ParsedConfig
 
@@ -130,11 +131,7 @@ class ACLTab(QWidget):
 
         row = self.table.rowCount()
         self.table.insertRow(row)
-        self.table.setItem(row, 0, QTableWidgetItem(action))
-        self.table.setItem(row, 1, QTableWidgetItem(proto))
-        self.table.setItem(row, 2, QTableWidgetItem(src))
-        self.table.setItem(row, 3, QTableWidgetItem(wc))
-        self.table.setItem(row, 4, QTableWidgetItem(dest))
+        self._set_row(row, self.current_acl, [action, proto, src, wc, dest])
 
         cmd = (
             f"access-list {self.current_acl} {action} {proto} {src} {wc} {dest}".strip()
@@ -153,13 +150,24 @@ class ACLTab(QWidget):
             return
 
         rule_items = [self.table.item(row, i).text() for i in range(5)]
-        cmd = f"no access-list {self.current_acl} {' '.join(rule_items)}"
+        acl = self._row_acl(row) or self.current_acl
+        cmd = f"no access-list {acl} {' '.join(rule_items)}"
         self.table.removeRow(row)
         self._append_console(cmd)
 
     def _append_console(self, text: str):
         self.console.appendPlainText(text.strip())
 
+    def _set_row(self, row: int, acl: str | None, values: list[str]):
+        for c, val in enumerate(values):
+            self.table.setItem(row, c, QTableWidgetItem(val))
+        # numer listy reguły (tabela pokazuje reguły wszystkich ACL naraz)
+        self.table.item(row, 0).setData(Qt.UserRole, acl)
+
+    def _row_acl(self, row: int) -> str | None:
+        item = self.table.item(row, 0)
+        return item.data(Qt.UserRole) if item else None
+
     def export_state(self):
         rules = []
         for r in range(self.table.rowCount()):
@@ -169,17 +177,19 @@ class ACLTab(QWidget):
         return {
             "acl": self.current_acl,
             "rules": rules,
+            "acls": [self._row_acl(r) for r in range(self.table.rowCount())],
             "console": self.console.toPlainText(),
         }
 
     def import_state(self, data):
         self.current_acl = data.get("acl", None)
         self.table.setRowCount(0)
-        for row in data.get("rules", []):
+        rules = data.get("rules", [])
+        acls = data.get("acls") or [self.current_acl] * len(rules)
+        for acl, row in zip(acls, rules):
             r = self.table.rowCount()
             self.table.insertRow(r)
-            for c, val in enumerate(row):
-                self.table.setItem(r, c, QTableWidgetItem(val))
+            self._set_row(r, acl, row)
         self.console.setPlainText(data.get("console", ""))
 
     def sync_from_config(self, conf: ParsedConfig):
@@ -187,9 +197,15 @@ class ACLTab(QWidget):
         for r in conf.acls.rules:
             row = self.table.rowCount()
             self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(r["action"]))
-            self.table.setItem(row, 1, QTableWidgetItem(r["protocol"]))
-            self.table.setItem(row, 2, QTableWidgetItem(r["src"]))
-            self.table.setItem(row, 3, QTableWidgetItem(r.get("wildcard", "")))
-            self.table.setItem(row, 4, QTableWidgetItem(r.get("dest", "any")))
+            self._set_row(
+                row,
+                r["acl"],
+                [
+                    r["action"],
+                    r["protocol"],
+                    r["src"],
+                    r.get("wildcard", ""),
+                    r.get("dest", "any"),
+                ],
+            )
         self.console.appendPlainText("[SYNC] ACLs updated from running-config.")
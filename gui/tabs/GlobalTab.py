@@ -16,6 +16,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 
 from devices.Device import Device
+from services.config_backup import BackupResult, ConfigBackup
+from services.config_push import merge_commands
 from services.parsed_config import ParsedConfig
 
 
@@ -29,6 +31,7 @@ class GlobalTab(QWidget):
         super().__init__(parent)
         self.device: Device | None = None
         self.conn_mgr = None  # przypisane z MainWindow
+        self.jobs = None  # JobQueue z MainWindow (None → wywołania synchroniczne)
 
         main_layout = QVBoxLayout(self)
         main_layout.setAlignment(Qt.AlignTop)
@@ -106,10 +109,11 @@ class GlobalTab(QWidget):
     #                    PUBLIC API
     # ==============================================================
 
-    def bind_device(self, device: Device, conn_mgr):
-        """Podpina aktualne urządzenie i ConnectionManager."""
+    def bind_device(self, device: Device, conn_mgr, jobs=None):
+        """Podpina aktualne urządzenie, ConnectionManager i kolejkę zadań w tle."""
         self.device = device
         self.conn_mgr = conn_mgr
+        self.jobs = jobs
         self._append_log(f"[INFO] Binded to {device.host}")
 
     # ==============================================================
@@ -120,10 +124,8 @@ class GlobalTab(QWidget):
         """Pobiera konfigurację i aktualizuje hostname."""
         if not self._check_ready():
             return
-        try:
-            output = self.conn_mgr.send_command(
-                self.device, "show running-config | include hostname"
-            )
+
+        def done(output):
             # przykład: "hostname s1"
             for line in output.splitlines():
                 if line.strip().startswith("hostname"):
@@ -134,21 +136,28 @@ class GlobalTab(QWidget):
             QMessageBox.information(
                 self, "Sukces", "Pobrano konfigurację i zaktualizowano hostname."
             )
-        except Exception as e:
-            self._append_log(f"[ERROR] {e}")
-            QMessageBox.critical(self, "Błąd synchronizacji", str(e))
+
+        self._run_command(
+            "show running-config | include hostname", done, "Błąd synchronizacji"
+        )
 
     def _action_save(self):
         """Zapisuje konfigurację w NVRAM (write memory)."""
         if not self._check_ready():
             return
-        try:
-            output = self.conn_mgr.send_command(self.device, "write memory")
+
+        def done(output):
             self._append_log(output)
             QMessageBox.information(self, "Zapisano", "Konfiguracja zapisana w NVRAM.")
-        except Exception as e:
-            self._append_log(f"[ERROR] {e}")
-            QMessageBox.critical(self, "Błąd zapisu", str(e))
+
+        # przez commit — zapis obejmuje też zmiany odroczone (pending_saves)
+        device, cm = self.device, self.conn_mgr
+        self._run(
+            f"write memory @ {device.host}",
+            lambda job: cm.commit(device, force=True),
+            done,
+            "Błąd zapisu",
+        )
 
     def _action_erase(self):
         """Kasuje konfigurację (write erase)."""
@@ -163,71 +172,35 @@ class GlobalTab(QWidget):
         )
         if reply == QMessageBox.No:
             return
-        try:
-            output = self.conn_mgr.send_command(self.device, "write erase")
+
+        def done(output):
             self._append_log(output)
             QMessageBox.information(
                 self,
                 "Wykonano",
                 "Urządzenie zresetowano do domyślnej konfiguracji (po reload).",
             )
-        except Exception as e:
-            self._append_log(f"[ERROR] {e}")
-            QMessageBox.critical(self, "Błąd", str(e))
+
+        self._run_command("write erase", done, "Błąd")
 
     def _action_load_startup(self):
         """Wczytuje startup-config (copy startup-config running-config)."""
         if not self._check_ready():
             return
-        try:
-            output = self.conn_mgr.send_command(
-                self.device, "copy startup-config running-config"
-            )
+
+        def done(output):
             self._append_log(output)
             QMessageBox.information(self, "Wczytano", "Startup-config został wczytany.")
-        except Exception as e:
-            self._append_log(f"[ERROR] {e}")
-            QMessageBox.critical(self, "Błąd", str(e))
+
+        self._run_command("copy startup-config running-config", done, "Błąd")
 
     def _action_export_startup(self):
         """Eksportuje startup-config do pliku."""
-        if not self._check_ready():
-            return
-        try:
-            output = self.conn_mgr.send_command(self.device, "show startup-config")
-            filename, _ = QFileDialog.getSaveFileName(
-                self, "Zapisz startup-config", "startup-config.txt"
-            )
-            if filename:
-                with open(filename, "w") as f:
-                    f.write(output)
-                QMessageBox.information(
-                    self, "Zapisano", f"Startup-config zapisany do {filename}"
-                )
-            self._append_log("[EXPORT] Startup config saved.")
-        except Exception as e:
-            self._append_log(f"[ERROR] {e}")
-            QMessageBox.critical(self, "Błąd eksportu", str(e))
+        self._export("startup")
 
     def _action_export_running(self):
         """Eksportuje running-config do pliku."""
-        if not self._check_ready():
-            return
-        try:
-            output = self.conn_mgr.send_command(self.device, "show running-config")
-            filename, _ = QFileDialog.getSaveFileName(
-                self, "Zapisz running-config", "running-config.txt"
-            )
-            if filename:
-                with open(filename, "w") as f:
-                    f.write(output)
-                QMessageBox.information(
-                    self, "Zapisano", f"Running-config zapisany do {filename}"
-                )
-            self._append_log("[EXPORT] Running config saved.")
-        except Exception as e:
-            self._append_log(f"[ERROR] {e}")
-            QMessageBox.critical(self, "Błąd eksportu", str(e))
+        self._export("running")
 
     def _action_merge_running(self):
         """Łączy lokalny plik konfiguracyjny z running-config."""
@@ -240,15 +213,37 @@ class GlobalTab(QWidget):
             return
         try:
             with open(filename, "r") as f:
-                lines = [line.strip() for line in f.readlines() if line.strip()]
-            output = self.conn_mgr.send_config(self.device, lines)
-            self._append_log(output)
-            QMessageBox.information(
-                self, "Wykonano", f"Plik {filename} został zaaplikowany do urządzenia."
-            )
+                lines = [line.rstrip() for line in f if line.strip() not in ("", "!")]
         except Exception as e:
             self._append_log(f"[ERROR] {e}")
             QMessageBox.critical(self, "Błąd merge", str(e))
+            return
+
+        def work(job):
+            # tylko linie, których na urządzeniu jeszcze nie ma
+            running = cm.send_command(device, "show running-config")
+            commands = merge_commands(running, lines)
+            if not commands:
+                return commands, ""
+            return commands, cm.send_config(device, commands)
+
+        def done(result):
+            commands, output = result
+            if not commands:
+                self._append_log(f"[MERGE] {filename}: brak różnic z running-config.")
+                QMessageBox.information(
+                    self, "Bez zmian", "Urządzenie ma już całą konfigurację z pliku."
+                )
+                return
+            self._append_log(output)
+            QMessageBox.information(
+                self,
+                "Wykonano",
+                f"Z pliku {filename} wysłano {len(commands)} z {len(lines)} linii.",
+            )
+
+        device, cm = self.device, self.conn_mgr
+        self._run(f"Merge {device.host}", work, done, "Błąd merge")
 
     # ==============================================================
     #                    POMOCNICZE
@@ -267,6 +262,66 @@ class GlobalTab(QWidget):
         layout.addStretch()
         return box
 
+    def _run_command(self, command: str, on_done, error_title: str):
+        device, cm = self.device, self.conn_mgr
+        self._run(
+            f"{command} @ {device.host}",
+            lambda job: cm.send_command(device, command),
+            on_done,
+            error_title,
+        )
+
+    def _run(self, title: str, work, on_done, error_title: str):
+        """
+        Wykonuje work(job) w tle (JobQueue), a on_done(wynik) w wątku GUI.
+        Bez kolejki (np. tab użyty poza MainWindow) — synchronicznie.
+        """
+
+        def failed(err: str):
+            self._append_log(f"[ERROR] {err}")
+            QMessageBox.critical(self, error_title, err)
+
+        if self.jobs is None:
+            try:
+                result = work(None)
+            except Exception as e:
+                failed(str(e))
+                return
+            on_done(result)
+            return
+
+        self._append_log(f"[JOB] {title}...")
+        self.jobs.submit(title, work, on_result=on_done, on_error=failed)
+
+    def _export(self, which: str):
+        """
+        Kopia {which}-config do pliku przez SCP/SFTP (CLI tylko awaryjnie) —
+        plik zapisywany na bieżąco, bez trzymania całego configu w pamięci.
+        """
+        if not self._check_ready():
+            return
+        name = f"{which}-config"
+        filename, _ = QFileDialog.getSaveFileName(
+            self, f"Zapisz {name}", f"{self.device.host}_{name}.txt"
+        )
+        if not filename:
+            return
+
+        def done(result: BackupResult):
+            self._append_log(
+                f"[EXPORT] {name}: {result.bytes} B przez {result.method} "
+                f"({result.seconds:.1f} s)."
+            )
+            QMessageBox.information(self, "Zapisano", f"{name} zapisany do {filename}")
+
+        device, backup = self.device, ConfigBackup(self.conn_mgr)
+        self._run(
+            f"Export {name} @ {device.host}",
+            lambda job: backup.backup(device, which, filename),
+            done,
+            "Błąd eksportu",
+        )
+
     def _check_ready(self) -> bool:
         if not self.device or not self.conn_mgr:
             QMessageBox.warning(
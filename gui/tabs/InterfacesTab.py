@@ -14,6 +14,7 @@ from PySide6.QtWidgets import (
     QMessageBox,
 )
 
+from services.config_delta import ConfigDelta
 from services.parsed_config import ParsedConfig
 
 
@@ -198,10 +199,30 @@ class InterfacesTab(QWidget):
         for name, data in conf.interfaces.items.items():
             r = self.table.rowCount()
             self.table.insertRow(r)
-            self.table.setItem(r, 0, QTableWidgetItem(name))
-            self.table.setItem(r, 1, QTableWidgetItem(data.get("description", "")))
-            self.table.setItem(r, 2, QTableWidgetItem(data.get("ip", "")))
-            self.table.setItem(r, 3, QTableWidgetItem(data.get("mask", "")))
-            self.table.setItem(r, 4, QTableWidgetItem(data.get("mode", "")))
-            self.table.setItem(r, 5, QTableWidgetItem(data.get("status", "up")))
+            self._set_row(r, name, data)
         self.console.appendPlainText("[SYNC] Interfaces updated from running-config.")
+
+    def apply_delta(self, delta: ConfigDelta):
+        """Aktualizuje tylko wiersze zmienionych interfejsów."""
+        ch = delta.interfaces
+        for name in ch.removed:
+            row = self._find_interface_row(name)
+            if row is not None:
+                self.table.removeRow(row)
+        for name, data in {**ch.changed, **ch.added}.items():
+            row = self._find_interface_row(name)
+            if row is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+            self._set_row(row, name, data)
+        self.console.appendPlainText(
+            f"[SYNC] Interfaces: +{len(ch.added)} ~{len(ch.changed)} -{len(ch.removed)}."
+        )
+
+    def _set_row(self, r: int, name: str, data: dict):
+        self.table.setItem(r, 0, QTableWidgetItem(name))
+        self.table.setItem(r, 1, QTableWidgetItem(data.get("description", "")))
+        self.table.setItem(r, 2, QTableWidgetItem(data.get("ip", "")))
+        self.table.setItem(r, 3, QTableWidgetItem(data.get("mask", "")))
+        self.table.setItem(r, 4, QTableWidgetItem(data.get("mode", "")))
+        self.table.setItem(r, 5, QTableWidgetItem(data.get("status", "up")))
@@ -32,6 +32,11 @@ class RoutingTab(QWidget):
         # === Nagłówek ===
         main_layout.addWidget(QLabel("<h2>Routing Configuration</h2>"))
 
+        # stan RIP/OSPF do wypchnięcia (config_push porównuje go ze snapshotem)
+        self.rip_networks: list[str] = []
+        self.rip_off = False
+        self.ospf_networks: list[list[str]] = []  # [proces, sieć, wildcard, area]
+
         # === TabWidget z podsekcjami ===
         self.subtabs = QTabWidget()
         self.subtabs.setTabPosition(QTabWidget.North)
@@ -94,12 +99,8 @@ class RoutingTab(QWidget):
         layout.addWidget(QLabel("<b>RIPv2 Configuration</b>"))
         self.btn_rip_enable = QPushButton("Enable RIP")
         self.btn_rip_disable = QPushButton("Disable RIP")
-        self.btn_rip_enable.clicked.connect(
-            lambda: self._append_console("> router rip\n version 2\n")
-        )
-        self.btn_rip_disable.clicked.connect(
-            lambda: self._append_console("> no router rip\n")
-        )
+        self.btn_rip_enable.clicked.connect(self._rip_enable)
+        self.btn_rip_disable.clicked.connect(self._rip_disable)
         layout.addWidget(self.btn_rip_enable)
         layout.addWidget(self.btn_rip_disable)
 
@@ -164,10 +165,22 @@ class RoutingTab(QWidget):
         self.static_mask.clear()
         self.static_next_hop.clear()
 
+    def _rip_enable(self):
+        self.rip_off = False
+        self._append_console("> router rip\n version 2\n")
+
+    def _rip_disable(self):
+        self.rip_off = True
+        self.rip_networks = []
+        self._append_console("> no router rip\n")
+
     def _dummy_add_rip(self):
         net = self.rip_network.text().strip()
         if not net:
             return
+        self.rip_off = False
+        if net not in self.rip_networks:
+            self.rip_networks.append(net)
         self._append_console(f"router rip\n network {net}")
         self.rip_network.clear()
 
@@ -178,6 +191,8 @@ class RoutingTab(QWidget):
         area = self.ospf_area.text().strip()
         if not (p and net and wc and area):
             return
+        if [p, net, wc, area] not in self.ospf_networks:
+            self.ospf_networks.append([p, net, wc, area])
         self._append_console(f"router ospf {p}\n network {net} {wc} area {area}")
         self.ospf_process.clear()
         self.ospf_network.clear()
@@ -197,7 +212,13 @@ class RoutingTab(QWidget):
                     for c in range(self.static_table.columnCount())
                 ]
             )
-        return {"routes": routes, "console": self.console.toPlainText()}
+        return {
+            "routes": routes,
+            "rip": [[net] for net in self.rip_networks],
+            "rip_off": self.rip_off,
+            "ospf": [list(row) for row in self.ospf_networks],
+            "console": self.console.toPlainText(),
+        }
 
     def import_state(self, data):
         self.static_table.setRowCount(0)
@@ -206,6 +227,9 @@ class RoutingTab(QWidget):
             self.static_table.insertRow(r)
             for c, val in enumerate(row):
                 self.static_table.setItem(r, c, QTableWidgetItem(val))
+        self.rip_networks = [row[0] for row in data.get("rip", []) if row]
+        self.rip_off = data.get("rip_off", False)
+        self.ospf_networks = [list(row) for row in data.get("ospf", [])]
         self.console.setPlainText(data.get("console", ""))
 
     def sync_from_config(self, conf: ParsedConfig):
@@ -220,15 +244,25 @@ class RoutingTab(QWidget):
 
         # RIP
         # (minimalnie — pokażemy w logu)
+        self.rip_networks = list(conf.routing.rip_networks)
+        self.rip_off = False
         if conf.routing.rip_networks:
             self._append_console(
                 "[SYNC] RIP networks: " + ", ".join(conf.routing.rip_networks)
             )
+        if conf.routing.rip_interfaces:
+            self._append_console(
+                "[SYNC] RIP interfaces: " + ", ".join(conf.routing.rip_interfaces)
+            )
 
         # OSPF
+        self.ospf_networks = [
+            [o.process, o.network, o.wildcard, o.area] for o in conf.routing.ospf
+        ]
         for o in conf.routing.ospf:
             self._append_console(
                 f"[SYNC] OSPF {o['process']} net {o['network']} {o['wildcard']} area {o['area']}"
+                + (f" (interface {o.interface})" if o.interface else "")
             )
 
         self.console.appendPlainText("[SYNC] Routing updated from running-config.")
@@ -15,6 +15,7 @@ from PySide6.QtWidgets import (
     QComboBox,
 )
 
+from services.config_delta import ConfigDelta
 from services.parsed_config import ParsedConfig
 
 
@@ -194,11 +195,34 @@ class VLANsTab(QWidget):
         self.combo_vlan.clear()
         vids = sorted(conf.vlans.items.keys(), key=lambda x: int(x))
         for vid in vids:
-            v = conf.vlans.items[vid]
             r = self.table.rowCount()
             self.table.insertRow(r)
-            self.table.setItem(r, 0, QTableWidgetItem(vid))
-            self.table.setItem(r, 1, QTableWidgetItem(v.get("name", "")))
-            self.table.setItem(r, 2, QTableWidgetItem(", ".join(v.get("ports", []))))
+            self._set_row(r, vid, conf.vlans.items[vid])
             self.combo_vlan.addItem(vid)
         self.console.appendPlainText("[SYNC] VLANs updated from running-config.")
+
+    def apply_delta(self, delta: ConfigDelta):
+        """Aktualizuje tylko wiersze zmienionych VLAN-ów."""
+        ch = delta.vlans
+        for vid in ch.removed:
+            row = self._find_vlan_row(vid)
+            if row is not None:
+                self.table.removeRow(row)
+            index = self.combo_vlan.findText(vid)
+            if index >= 0:
+                self.combo_vlan.removeItem(index)
+        for vid, v in {**ch.changed, **ch.added}.items():
+            row = self._find_vlan_row(vid)
+            if row is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                self.combo_vlan.addItem(vid)
+            self._set_row(row, vid, v)
+        self.console.appendPlainText(
+            f"[SYNC] VLANs: +{len(ch.added)} ~{len(ch.changed)} -{len(ch.removed)}."
+        )
+
+    def _set_row(self, r: int, vid: str, v: dict):
+        self.table.setItem(r, 0, QTableWidgetItem(vid))
+        self.table.setItem(r, 1, QTableWidgetItem(v.get("name", "")))
+        self.table.setItem(r, 2, QTableWidgetItem(", ".join(v.get("ports", []))))
@@ -0,0 +1,430 @@
+# services/acl_engine.py
+"""
+Skompilowany silnik dopasowania ACL ("która reguła trafi dla 10.1.2.3 → 10.9.9.9 tcp/443").
+
+Każde ACL jest kompilowane do klasyfikatora bitowego: dla każdego pola
+(src, dst, protokół, port źródłowy, port docelowy) oś wartości dzielona jest
+na przedziały elementarne, a każdy przedział ma bitset reguł, które go pokrywają.
+Lookup = bisect w każdym wymiarze (O(log n)) + AND bitsetów; najniższy
+ustawiony bit to pierwsza pasująca reguła (semantyka first-match IOS).
+"""
+
+import ipaddress
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable
+
+from services.parsed_config import ParsedConfig
+
+# słowa kluczowe protokołów IOS (pozostałe protokoły IOS przyjmuje jako numer)
+_PROTO = {
+    "ip": None,
+    "icmp": 1,
+    "igmp": 2,
+    "ipinip": 4,
+    "tcp": 6,
+    "udp": 17,
+    "gre": 47,
+    "esp": 50,
+    "ahp": 51,
+    "eigrp": 88,
+    "ospf": 89,
+    "nos": 94,
+    "pim": 103,
+    "pcp": 108,
+}
+# nazwy portów TCP/UDP akceptowane przez IOS w "eq/lt/gt/neq/range"
+_PORTS = {
+    "echo": 7,
+    "discard": 9,
+    "daytime": 13,
+    "chargen": 19,
+    "ftp-data": 20,
+    "ftp": 21,
+    "ssh": 22,
+    "telnet": 23,
+    "smtp": 25,
+    "time": 37,
+    "nameserver": 42,
+    "whois": 43,
+    "tacacs": 49,
+    "domain": 53,
+    "bootps": 67,
+    "bootpc": 68,
+    "tftp": 69,
+    "gopher": 70,
+    "finger": 79,
+    "www": 80,
+    "hostname": 101,
+    "pop2": 109,
+    "pop3": 110,
+    "sunrpc": 111,
+    "ident": 113,
+    "nntp": 119,
+    "ntp": 123,
+    "msrpc": 135,
+    "netbios-ns": 137,
+    "netbios-dgm": 138,
+    "netbios-ss": 139,
+    "snmp": 161,
+    "snmptrap": 162,
+    "xdmcp": 177,
+    "bgp": 179,
+    "irc": 194,
+    "dnsix": 195,
+    "mobile-ip": 434,
+    "https": 443,
+    "pim-auto-rp": 496,
+    "isakmp": 500,
+    "exec": 512,
+    "biff": 512,
+    "login": 513,
+    "who": 513,
+    "cmd": 514,
+    "syslog": 514,
+    "lpd": 515,
+    "talk": 517,
+    "rip": 520,
+    "uucp": 540,
+    "klogin": 543,
+    "kshell": 544,
+    "non500-isakmp": 4500,
+}
+_ADDR_MAX = 0xFFFFFFFF
+_PORT_MAX = 0xFFFF
+_FULL_ADDR = (0, _ADDR_MAX)
+_FULL_PORT = (0, _PORT_MAX)
+
+
+@dataclass(slots=True)
+class ACLEntry:
+    """Jedna reguła ACL w postaci numerycznej (zakresy domknięte)."""
+
+    acl: str
+    index: int  # pozycja w ACL (kolejność dopasowania)
+    action: str  # permit / deny
+    line: str  # oryginalna linia (do wyświetlenia)
+    proto: tuple[int, int] = (0, 255)
+    src: tuple[int, int] = _FULL_ADDR
+    dst: tuple[int, int] = _FULL_ADDR
+    sport: tuple[int, int] = _FULL_PORT
+    dport: tuple[int, int] = _FULL_PORT
+    # maski niesąsiadujące (np. 0.0.255.0) nie są przedziałem — sprawdzane dokładnie
+    src_mask: tuple[int, int] | None = None  # (adres, wildcard)
+    dst_mask: tuple[int, int] | None = None
+    # "neq P" to dwa przedziały — zakres pełny + sprawdzenie dokładne
+    sport_neq: int | None = None
+    dport_neq: int | None = None
+    # reguła permit/deny, której nie umiemy sparsować (object-group, nieznany
+    # port...) — pokrywa wszystko, żeby dopasowanie zatrzymało się na niej:
+    # wynik jest wtedy nieokreślony, a nie fałszywie "trafia dalsza reguła"
+    unparsed: bool = False
+
+    @property
+    def inexact(self) -> bool:
+        return bool(
+            self.src_mask
+            or self.dst_mask
+            or self.sport_neq is not None
+            or self.dport_neq is not None
+        )
+
+    def exact(self, src: int, dst: int, sport: int, dport: int) -> bool:
+        if sport == self.sport_neq or dport == self.dport_neq:
+            return False
+        if self.src_mask and (src | self.src_mask[1]) != (
+            self.src_mask[0] | self.src_mask[1]
+        ):
+            return False
+        if self.dst_mask and (dst | self.dst_mask[1]) != (
+            self.dst_mask[0] | self.dst_mask[1]
+        ):
+            return False
+        return True
+
+
+class _Axis:
+    """Jeden wymiar klasyfikatora: granice przedziałów + bitset na przedział."""
+
+    __slots__ = ("bounds", "masks")
+
+    def __init__(self, ranges: list[tuple[int, int]]):
+        points = {0}
+        for lo, hi in ranges:
+            points.add(lo)
+            points.add(hi + 1)
+        self.bounds = sorted(points)
+        # różnicowo: +bit na początku przedziału, -bit za końcem
+        starts: dict[int, int] = {}
+        ends: dict[int, int] = {}
+        for i, (lo, hi) in enumerate(ranges):
+            starts[lo] = starts.get(lo, 0) | (1 << i)
+            ends[hi + 1] = ends.get(hi + 1, 0) | (1 << i)
+        masks = []
+        cur = 0
+        for b in self.bounds:
+            cur = (cur & ~ends.get(b, 0)) | starts.get(b, 0)
+            masks.append(cur)
+        self.masks = masks
+
+    def lookup(self, value: int) -> int:
+        return self.masks[bisect_right(self.bounds, value) - 1]
+
+
+class CompiledACL:
+    def __init__(self, name: str, entries: list[ACLEntry]):
+        self.name = name
+        self.entries = entries
+        self._src = _Axis([e.src for e in entries])
+        self._dst = _Axis([e.dst for e in entries])
+        self._proto = _Axis([e.proto for e in entries])
+        self._sport = _Axis([e.sport for e in entries])
+        self._dport = _Axis([e.dport for e in entries])
+        self._inexact = 0
+        for i, e in enumerate(entries):
+            if e.inexact:
+                self._inexact |= 1 << i
+
+    def __len__(self):
+        return len(self.entries)
+
+    def match(
+        self, src, dst, proto="ip", sport: int = 0, dport: int = 0
+    ) -> ACLEntry | None:
+        """
+        Pierwsza pasująca reguła albo None (niejawne 'deny any').
+        Reguła z unparsed=True → wynik nieokreślony (nie wiadomo, czy pasuje).
+        """
+        return self._match(_addr(src), _addr(dst), _flow_proto(proto), sport, dport)
+
+    def _match(self, s: int, d: int, p: int, sp: int, dp: int) -> ACLEntry | None:
+        bits = (
+            self._src.lookup(s)
+            & self._dst.lookup(d)
+            & self._proto.lookup(p)
+            & self._sport.lookup(sp)
+            & self._dport.lookup(dp)
+        )
+        while bits:
+            low = bits & -bits
+            e = self.entries[low.bit_length() - 1]
+            if not (low & self._inexact) or e.exact(s, d, sp, dp):
+                return e
+            bits ^= low
+        return None
+
+    def classify_many(self, flows: Iterable[tuple]) -> list[ACLEntry | None]:
+        """
+        Klasyfikuje wiele przepływów (src, dst, proto[, sport, dport]).
+        Powtarzające się przepływy liczone są raz (memo).
+        """
+        memo: dict[tuple, ACLEntry | None] = {}
+        out = []
+        append = out.append
+        for flow in flows:
+            hit = memo.get(flow, memo)
+            if hit is memo:
+                src, dst, proto, *ports = flow
+                sp = ports[0] if len(ports) > 0 else 0
+                dp = ports[1] if len(ports) > 1 else 0
+                hit = self._match(_addr(src), _addr(dst), _flow_proto(proto), sp, dp)
+                memo[flow] = hit
+            append(hit)
+        return out
+
+
+class ACLEngine:
+    """Zbiór skompilowanych ACL jednego urządzenia (po nazwie / numerze)."""
+
+    def __init__(self, acls: dict[str, list[ACLEntry]]):
+        self.acls = {name: CompiledACL(name, es) for name, es in acls.items()}
+        # reguły, których wynik dopasowania jest nieokreślony (do pokazania)
+        self.unparsed = [e for es in acls.values() for e in es if e.unparsed]
+
+    @classmethod
+    def from_config(cls, conf: ParsedConfig) -> "ACLEngine":
+        """
+        IOS: numerowane 'access-list' i nazwane 'ip access-list standard|extended'
+        czytane z drzewa konfiguracji. Inni vendorzy: z conf.acls.rules.
+        """
+        acls: dict[str, list[ACLEntry]] = {}
+        if conf.vendor == "CISCO":
+            tree = conf.tree
+            for node in tree.sections("access-list"):
+                w = node.words
+                if len(w) < 3:
+                    continue
+                entries = acls.setdefault(w[1], [])
+                e = parse_entry(
+                    w[1], len(entries), w[2:], _is_standard(w[1]), node.text
+                )
+                if e:
+                    entries.append(e)
+            for node in tree.sections("ip"):
+                w = node.words
+                kind = w[2] if len(w) >= 4 and w[1] == "access-list" else ""
+                if kind in ("standard", "extended"):
+                    entries = acls.setdefault(w[3], [])
+                    for child in node.children:
+                        cw = child.words
+                        if cw and cw[0].isdigit():
+                            cw = cw[1:]  # numer sekwencyjny
+                        e = parse_entry(
+                            w[3], len(entries), cw, kind == "standard", child.text
+                        )
+                        if e:
+                            entries.append(e)
+        else:
+            for r in conf.acls.rules:
+                entries = acls.setdefault(r["acl"], [])
+                e = _entry_from_rule(r, len(entries))
+                if e:
+                    entries.append(e)
+        return cls(acls)
+
+    def names(self) -> list[str]:
+        return list(self.acls)
+
+    def match(self, acl: str, src, dst, proto="ip", sport=0, dport=0):
+        return self.acls[acl].match(src, dst, proto, sport, dport)
+
+    def classify_many(self, acl: str, flows: Iterable[tuple]):
+        return self.acls[acl].classify_many(flows)
+
+
+# ==============================================================
+#                  PARSOWANIE LINII ACL
+# ==============================================================
+
+
+def parse_entry(
+    acl: str, index: int, w: list[str], standard: bool, line: str = ""
+) -> ACLEntry | None:
+    """
+    w: słowa po numerze/nazwie ACL, np.
+       ['permit', 'tcp', 'any', 'host', '1.1.1.1', 'eq', '443']   (extended)
+       ['deny', '10.0.0.0', '0.0.0.255']                          (standard)
+    Linie inne niż permit/deny (remark, ...) → None. Reguła permit/deny,
+    której nie umiemy odczytać (object-group, nieznany protokół/port, ...) →
+    wpis z unparsed=True — pominięcie zmieniłoby wynik first-match.
+    """
+    if not w or w[0] not in ("permit", "deny"):
+        return None
+    e = ACLEntry(acl=acl, index=index, action=w[0], line=line or " ".join(w))
+    unparsed = ACLEntry(acl, index, w[0], e.line, unparsed=True)
+    try:
+        if standard:
+            e.src, e.src_mask, _ = _addr_spec(w, 1, standard=True)
+            return e
+        if len(w) < 4:
+            return unparsed
+        p = _proto_num(w[1])
+        e.proto = (0, 255) if p is None else (p, p)
+        i = 2
+        e.src, e.src_mask, i = _addr_spec(w, i)
+        if w[1] in ("tcp", "udp"):
+            e.sport, e.sport_neq, i = _port_spec(w, i)
+        e.dst, e.dst_mask, i = _addr_spec(w, i)
+        if w[1] in ("tcp", "udp"):
+            e.dport, e.dport_neq, i = _port_spec(w, i)
+        return e
+    except (ValueError, IndexError, KeyError):
+        unparsed.proto = e.proto  # protokół (jeśli odczytany) zawęża wpis
+        return unparsed
+
+
+def _entry_from_rule(r, index: int) -> ACLEntry | None:
+    """ACLRule (acl/action/protocol/src/wildcard/dest) → ACLEntry."""
+    words = [r["action"], r["protocol"] or "ip"]
+    src = r["src"]
+    if src in ("", "any"):
+        words += ["any"]
+    elif "/" in src:  # prefiks (filtry Junos) → adres + wildcard
+        words += _prefix_words(src)
+    else:
+        words += [src, r["wildcard"] or "0.0.0.0"]
+    dest = r["dest"]
+    if dest in ("", "any"):
+        words += ["any"]
+    elif "/" in dest:
+        words += _prefix_words(dest)
+    else:
+        words += ["host", dest]
+    return parse_entry(r["acl"], index, words, False, " ".join(words))
+
+
+def _prefix_words(prefix: str) -> list[str]:
+    net = ipaddress.ip_network(prefix, strict=False)
+    return [str(net.network_address), str(net.hostmask)]
+
+
+def _addr_spec(w: list[str], i: int, standard: bool = False):
+    """any | host A | A W | (standard) A → ((lo, hi), maska_niesąsiadująca, i)."""
+    tok = w[i]
+    if tok == "any":
+        return _FULL_ADDR, None, i + 1
+    if tok == "host":
+        a = _addr(w[i + 1])
+        return (a, a), None, i + 2
+    a = _addr(tok)
+    if i + 1 < len(w) and _looks_like_ip(w[i + 1]):
+        wc = _addr(w[i + 1])
+        base = a & ~wc & _ADDR_MAX
+        if ((wc + 1) & wc) == 0:  # maska ciągła → przedział
+            return (base, base | wc), None, i + 2
+        return _FULL_ADDR, (base, wc), i + 2
+    if standard:
+        return (a, a), None, i + 1
+    raise ValueError(f"brak wildcard po {tok}")
+
+
+def _port_spec(w: list[str], i: int):
+    """eq|lt|gt|neq P, range A B → ((lo, hi), port_neq, i)."""
+    if i >= len(w):
+        return _FULL_PORT, None, i
+    op = w[i]
+    if op == "eq":
+        p = _port(w[i + 1])
+        return (p, p), None, i + 2
+    if op == "lt":
+        return (0, _port(w[i + 1]) - 1), None, i + 2
+    if op == "gt":
+        return (_port(w[i + 1]) + 1, _PORT_MAX), None, i + 2
+    if op == "range":
+        return (_port(w[i + 1]), _port(w[i + 2])), None, i + 3
+    if op == "neq":
+        return _FULL_PORT, _port(w[i + 1]), i + 2
+    return _FULL_PORT, None, i
+
+
+def _port(tok: str) -> int:
+    return int(tok) if tok.isdigit() else _PORTS[tok]
+
+
+def _looks_like_ip(tok: str) -> bool:
+    return tok.count(".") == 3 and tok.replace(".", "").isdigit()
+
+
+def _addr(value) -> int:
+    return value if isinstance(value, int) else int(ipaddress.IPv4Address(value))
+
+
+def _proto_num(proto) -> int | None:
+    if isinstance(proto, int):
+        return proto
+    if proto.isdigit():
+        return int(proto)
+    return _PROTO[proto]
+
+
+def _flow_proto(proto) -> int:
+    # przepływ "ip" (bez konkretnego protokołu) traktujemy jak protokół 0
+    p = _proto_num(proto)
+    return 0 if p is None else p
+
+
+def _is_standard(number: str) -> bool:
+    if not number.isdigit():
+        return False
+    n = int(number)
+    return 1 <= n <= 99 or 1300 <= n <= 1999
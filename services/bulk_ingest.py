@@ -0,0 +1,238 @@
+# services/bulk_ingest.py
+"""
+Masowy import zapisanych running-configów (np. nocnych zrzutów) bez połączenia
+z urządzeniami. Pliki są parsowane równolegle w puli procesów, a wyniki
+spływają strumieniowo do kompaktowego indeksu SQLite (klucz: hostname —
+przy kilku zrzutach jednego hosta zostaje najnowszy wg mtime).
+
+Uruchomienie:
+    python -m services.bulk_ingest ./archiwum ./logs/configs.db
+
+W GUI: Plik → Importuj archiwum configów (indeks w logs/configs.db);
+match_devices() łączy wpisy indeksu z urządzeniami z inventory.
+"""
+
+import fnmatch
+import logging
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import sys
+import time
+import zlib
+from typing import Callable, Iterator
+
+from services.parsed_config import ParsedConfig
+from services.parsers import cisco_ios
+
+DEFAULT_PATTERNS = ("*.txt", "*.cfg", "*.conf", "*.log")
+
+
+class ConfigIndex:
+    """
+    Indeks sparsowanych configów na dysku: jeden wiersz na hostname
+    (najnowszy zrzut wg mtime, remis → większa ścieżka, niezależnie od
+    kolejności wyników z puli), ParsedConfig jako skompresowany pickle (zlib).
+    Tabela sources pamięta każdy zaindeksowany plik — także starsze zrzuty,
+    które nie wygrały — więc is_current nie parsuje ich przy każdym imporcie.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS configs (
+                hostname TEXT PRIMARY KEY,
+                source   TEXT NOT NULL,
+                size     INTEGER NOT NULL,
+                mtime    REAL NOT NULL,
+                data     BLOB NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS configs_source ON configs(source)")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                source   TEXT PRIMARY KEY,
+                size     INTEGER NOT NULL,
+                mtime    REAL NOT NULL,
+                hostname TEXT NOT NULL
+            )
+        """)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.db.commit()
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM configs").fetchone()[0]
+
+    def __contains__(self, hostname: str) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM configs WHERE hostname = ?", (hostname,)
+        ).fetchone()
+        return row is not None
+
+    def hostnames(self) -> list[str]:
+        return [r[0] for r in self.db.execute("SELECT hostname FROM configs")]
+
+    def get(self, hostname: str) -> ParsedConfig | None:
+        row = self.db.execute(
+            "SELECT data FROM configs WHERE hostname = ?", (hostname,)
+        ).fetchone()
+        return pickle.loads(zlib.decompress(row[0])) if row else None
+
+    def is_current(self, source: str, size: int, mtime: float) -> bool:
+        """Czy plik źródłowy był już zaindeksowany w tej samej wersji."""
+        row = self.db.execute(
+            "SELECT 1 FROM sources WHERE source = ? AND size = ? AND mtime = ?",
+            (source, size, mtime),
+        ).fetchone()
+        return row is not None
+
+    def put_many(self, rows: list[tuple]):
+        """rows: (hostname, source, size, mtime, blob)."""
+        with self.db:
+            self.db.executemany(
+                """
+                INSERT INTO configs VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(hostname) DO UPDATE SET
+                    source = excluded.source,
+                    size = excluded.size,
+                    mtime = excluded.mtime,
+                    data = excluded.data
+                WHERE excluded.mtime > configs.mtime
+                   OR (excluded.mtime = configs.mtime
+                       AND excluded.source >= configs.source)
+                """,
+                rows,
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                [(src, size, mtime, host) for host, src, size, mtime, _ in rows],
+            )
+
+
+def match_devices(index: ConfigIndex, devices: dict[str, str]) -> dict[str, str]:
+    """
+    Dopasowuje urządzenia z inventory do wpisów indeksu (bez rozróżniania
+    wielkości liter): najpierw hostname znany z ostatniego synca, potem host
+    (nazwa DNS lub IP), na końcu nazwa pliku zrzutu (np. 10.0.0.1.cfg).
+    devices: {host: znany hostname albo ""}; zwraca {host: hostname w indeksie}.
+    """
+    by_name: dict[str, str] = {}
+    by_file: dict[str, str] = {}
+    for hostname, source in index.db.execute("SELECT hostname, source FROM configs"):
+        by_name[hostname.lower()] = hostname
+        stem = os.path.splitext(os.path.basename(source))[0]
+        by_file.setdefault(stem.lower(), hostname)
+
+    matched = {}
+    for host, known in devices.items():
+        for key, table in ((known, by_name), (host, by_name), (host, by_file)):
+            if key and key.lower() in table:
+                matched[host] = table[key.lower()]
+                break
+    return matched
+
+
+def iter_config_files(directory: str, patterns=DEFAULT_PATTERNS) -> Iterator[str]:
+    for root, _dirs, files in os.walk(directory):
+        for name in sorted(files):
+            if any(fnmatch.fnmatch(name.lower(), p) for p in patterns):
+                yield os.path.join(root, name)
+
+
+def _parse_file(path: str) -> tuple:
+    """
+    Worker (osobny proces): czyta i parsuje jeden plik.
+    Zwraca (hostname, source, size, mtime, blob, błąd) — blob już skompresowany,
+    żeby do procesu głównego trafiało jak najmniej danych.
+    """
+    try:
+        st = os.stat(path)
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            raw = f.read()
+        conf = cisco_ios.parse(raw)
+        hostname = conf.hostname or os.path.splitext(os.path.basename(path))[0]
+        blob = zlib.compress(pickle.dumps(conf, protocol=pickle.HIGHEST_PROTOCOL), 6)
+        return hostname, path, st.st_size, st.st_mtime, blob, None
+    except Exception as e:
+        return None, path, 0, 0.0, None, f"{type(e).__name__}: {e}"
+
+
+def ingest(
+    directory: str,
+    index_path: str,
+    workers: int | None = None,
+    chunk: int = 64,
+    patterns=DEFAULT_PATTERNS,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict:
+    """
+    Parsuje wszystkie configi z katalogu w puli procesów (domyślnie wszystkie rdzenie)
+    i zapisuje wyniki do indeksu partiami po `chunk`. Niezmienione pliki
+    (ten sam rozmiar i mtime) są pomijane. Zwraca statystyki importu.
+    """
+    stats = {"files": 0, "parsed": 0, "skipped": 0, "errors": 0, "seconds": 0.0}
+    t0 = time.perf_counter()
+
+    with ConfigIndex(index_path) as index:
+        todo = []
+        for path in iter_config_files(directory, patterns):
+            stats["files"] += 1
+            st = os.stat(path)
+            if index.is_current(path, st.st_size, st.st_mtime):
+                stats["skipped"] += 1
+            else:
+                todo.append(path)
+
+        total = len(todo)
+        if total:
+            workers = workers or os.cpu_count() or 1
+            batch: list[tuple] = []
+            done = 0
+            with multiprocessing.Pool(processes=min(workers, total)) as pool:
+                # imap_unordered: wyniki wracają strumieniowo, nic się nie kumuluje
+                for hostname, path, size, mtime, blob, err in pool.imap_unordered(
+                    _parse_file, todo, chunksize=max(1, chunk // 8)
+                ):
+                    done += 1
+                    if err:
+                        stats["errors"] += 1
+                        logging.error(f"[INGEST] {path}: {err}")
+                    else:
+                        stats["parsed"] += 1
+                        batch.append((hostname, path, size, mtime, blob))
+                    if len(batch) >= chunk:
+                        index.put_many(batch)
+                        batch = []
+                    if progress:
+                        progress(done, total)
+            if batch:
+                index.put_many(batch)
+
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Użycie: python -m services.bulk_ingest <katalog> <index.db> [procesy]")
+        sys.exit(2)
+    n = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    result = ingest(sys.argv[1], sys.argv[2], workers=n)
+    print(
+        f"[INGEST] plików: {result['files']}, sparsowano: {result['parsed']}, "
+        f"pominięto: {result['skipped']}, błędy: {result['errors']}, "
+        f"czas: {result['seconds']:.1f} s"
+    )
@@ -0,0 +1,235 @@
+# services/config_backup.py
+"""
+Kopie zapasowe konfiguracji przez transfer pliku zamiast zrzutu z CLI.
+
+"show running-config" przez kanał interaktywny przy dużych configach jest wolne
+i zależy od wykrywania promptu. Tutaj plik (system:running-config,
+nvram:startup-config) jest pobierany przez SCP albo SFTP na osobnym kanale
+istniejącej sesji SSH i zapisywany na dysk kawałkami, bez składania całości
+w jeden str. CLI (stream_command) jest tylko awaryjnym wyjściem — gdy
+urządzenie nie ma serwera SCP/SFTP albo połączenie idzie przez Telnet.
+Działająca metoda jest zapamiętywana w profilu połączenia (file_transfer),
+więc kolejne kopie nie sprawdzają niedziałających metod od nowa. "cli" trafia
+do profilu tylko po jawnej odmowie każdej metody (TransferUnsupported) —
+przerwany kanał czy timeout nie wyłączają transferu plików na stałe.
+
+    backup = ConfigBackup(cm)
+    result = backup.backup(device, "running", "r1_running-config.txt")
+    for res in backup.backup_many(devices, "startup", "./backups"): ...
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+from devices.Device import Device
+
+# rodzaj → (plik na urządzeniu, polecenie CLI)
+SOURCES = {
+    "running": ("system:running-config", "show running-config"),
+    "startup": ("nvram:startup-config", "show startup-config"),
+}
+METHODS = ("scp", "sftp")
+
+# nagłówek "show running-config", którego nie ma w pliku konfiguracji
+_CLI_HEADER = ("Building configuration", "Current configuration", "Using ")
+
+
+class FileTransferError(Exception):
+    """Transfer pliku nie powiódł się (brak serwera, odmowa, przerwany kanał)."""
+
+
+class TransferUnsupported(FileTransferError):
+    """Jawna odmowa metody (błąd SCP \\x01/\\x02, brak podsystemu SFTP)."""
+
+
+@dataclass
+class BackupResult:
+    host: str
+    which: str
+    path: str
+    bytes: int
+    method: str  # scp / sftp / cli
+    seconds: float
+
+
+class ConfigBackup:
+    CHUNK = 32768
+
+    def __init__(self, cm, methods: tuple[str, ...] = METHODS, timeout: float = 30.0):
+        self.cm = cm
+        self.methods = methods
+        self.timeout = timeout
+
+    def backup(self, device: Device, which: str, path: str) -> BackupResult:
+        """Zapisuje running/startup-config urządzenia do path (atomowo)."""
+        remote, command = SOURCES[which]
+        key = self.cm.profiles.key(device.host, self.cm.connection_type)
+        profile = self.cm.profiles.get(key)
+        known = profile.file_transfer if profile else ""
+
+        t0 = time.perf_counter()
+        part = path + ".part"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        try:
+            with open(part, "wb") as out:
+                method, unsupported = self._transfer(device, remote, out, known)
+                if method is None:
+                    method = "cli"
+                    out.seek(0)
+                    out.truncate()
+                    self._cli(device, command, out)
+                size = out.tell()
+            os.replace(part, path)
+        except BaseException:
+            # niedokończony plik nie może zostać obok kopii
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+            raise
+
+        # "cli" zapamiętane tylko po jawnej odmowie wszystkich metod — po
+        # przerwanym kanale czy timeoucie następna kopia spróbuje znowu
+        if method != known and (method != "cli" or unsupported):
+            self.cm.profiles.update(key, file_transfer=method)
+        seconds = time.perf_counter() - t0
+        logging.info(
+            f"[BACKUP] {device.host}: {which} {size} B przez {method} "
+            f"w {seconds:.2f} s → {path}"
+        )
+        return BackupResult(device.host, which, path, size, method, seconds)
+
+    def backup_many(self, devices, which: str, folder: str, **kwargs) -> Iterator:
+        """backup na wielu urządzeniach (argumenty jak w run_many) → DeviceResult."""
+
+        def job(device: Device) -> str:
+            path = os.path.join(folder, f"{device.host}_{which}-config.txt")
+            res = self.backup(device, which, path)
+            return f"{res.bytes} B ({res.method})"
+
+        return self.cm.run_many(devices, job, **kwargs)
+
+    # --- transfer pliku ---
+
+    def _transfer(
+        self, device: Device, remote: str, out, known: str
+    ) -> tuple[str | None, bool]:
+        """
+        Pierwsza działająca metoda (zapamiętana najpierw) albo None → CLI,
+        plus czy wszystkie metody były jawnie nieobsługiwane (Telnet,
+        TransferUnsupported), a nie tylko chwilowo niedostępne.
+        """
+        if known == "cli":
+            return None, False
+        transport = self.cm.ssh_transport(device)
+        if transport is None:
+            return None, True
+        unsupported = True
+        methods = sorted(self.methods, key=lambda m: m != known)
+        for method in methods:
+            out.seek(0)
+            out.truncate()
+            try:
+                if method == "scp":
+                    scp_get(transport, remote, out, self.timeout, self.CHUNK)
+                else:
+                    sftp_get(transport, remote, out)
+                return method, False
+            except Exception as e:
+                unsupported = unsupported and isinstance(e, TransferUnsupported)
+                logging.info(f"[BACKUP] {device.host}: {method} niedostępne ({e})")
+        return None, unsupported
+
+    def _cli(self, device: Device, command: str, out):
+        header, tail = True, ""
+        for block in self.cm.stream_command(device, command):
+            if header:
+                # pomijamy nagłówek CLI, żeby kopia wyglądała jak plik z SCP
+                lines = block.splitlines(keepends=True)
+                while lines and (
+                    not lines[0].strip() or lines[0].startswith(_CLI_HEADER)
+                ):
+                    lines.pop(0)
+                block = "".join(lines)
+                header = not block
+            # końcowe puste linie wstrzymane do następnego bloku — plik kończy
+            # się jednym "\n", tak jak przy SCP
+            body = (tail + block).rstrip("\n")
+            tail = (tail + block)[len(body) :]
+            out.write(body.encode("utf-8"))
+        if not header:
+            out.write(b"\n")
+
+
+def scp_get(transport, remote: str, out, timeout: float = 30.0, chunk: int = 32768):
+    """
+    Pobiera jeden plik protokołem SCP ("scp -f") na nowym kanale transportu,
+    zapisując do out kawałkami. Zwraca liczbę bajtów.
+    """
+    import paramiko
+
+    chan = transport.open_session(timeout=timeout)
+    try:
+        chan.settimeout(timeout)
+        try:
+            chan.exec_command(f"scp -f {remote}")
+        except paramiko.SSHException as e:
+            # serwer odrzucił "exec" — brak "ip scp server enable"
+            raise TransferUnsupported(f"SCP: odrzucone polecenie ({e})") from e
+        chan.sendall(b"\0")
+        header = _read_line(chan)
+        if header[:1] in (b"\x01", b"\x02"):
+            raise TransferUnsupported(header[1:].decode(errors="replace").strip())
+        if not header.startswith(b"C"):
+            raise FileTransferError(f"nieoczekiwana odpowiedź SCP: {header[:40]!r}")
+        size = int(header.split()[1])
+        chan.sendall(b"\0")
+        left = size
+        while left:
+            data = chan.recv(min(chunk, left))
+            if not data:
+                raise FileTransferError("SCP: kanał zamknięty w trakcie transferu")
+            out.write(data)
+            left -= len(data)
+        if chan.recv(1) != b"\0":
+            raise FileTransferError("SCP: brak potwierdzenia końca pliku")
+        chan.sendall(b"\0")
+        return size
+    finally:
+        chan.close()
+
+
+def sftp_get(transport, remote: str, out) -> int:
+    """Pobiera plik przez SFTP (paramiko) prosto do out. Zwraca liczbę bajtów."""
+    import paramiko
+
+    # jak SFTPClient.from_transport, ale odmowa podsystemu jest rozróżniona
+    # od problemu z otwarciem kanału (ten może być chwilowy)
+    chan = transport.open_session()
+    if chan is None:
+        raise FileTransferError("SFTP: nie udało się otworzyć kanału")
+    try:
+        chan.invoke_subsystem("sftp")
+    except paramiko.SSHException as e:
+        chan.close()
+        raise TransferUnsupported(f"SFTP: brak podsystemu ({e})") from e
+    sftp = paramiko.SFTPClient(chan)
+    try:
+        return sftp.getfo(remote, out)
+    finally:
+        sftp.close()
+
+
+def _read_line(chan, limit: int = 1024) -> bytes:
+    line = b""
+    while not line.endswith(b"\n"):
+        ch = chan.recv(1)
+        if not ch:
+            raise FileTransferError("SCP: kanał zamknięty (brak serwera SCP?)")
+        line += ch
+        if len(line) > limit:
+            raise FileTransferError("SCP: zbyt długi nagłówek")
+    return line
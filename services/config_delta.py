@@ -0,0 +1,188 @@
+# services/config_delta.py
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from services.parsed_config import ParsedConfig
+from services.parsers.tokenizer import Section, iter_sections
+
+
+@dataclass
+class KeyedChanges:
+    """Zmiany w rekordach z kluczem (interfejsy po nazwie, VLAN-y po ID)."""
+
+    added: Dict[str, Mapping] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+    changed: Dict[str, Mapping] = field(default_factory=dict)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass
+class ListChanges:
+    """Zmiany w listach rekordów bez klucza (trasy, reguły ACL)."""
+
+    added: List[Any] = field(default_factory=list)
+    removed: List[Any] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+
+@dataclass
+class ConfigDelta:
+    hostname: Optional[str] = None  # nowy hostname, jeśli się zmienił
+    interfaces: KeyedChanges = field(default_factory=KeyedChanges)
+    vlans: KeyedChanges = field(default_factory=KeyedChanges)
+    static: ListChanges = field(default_factory=ListChanges)
+    rip_networks: ListChanges = field(default_factory=ListChanges)
+    ospf: ListChanges = field(default_factory=ListChanges)
+    rip_interfaces: ListChanges = field(default_factory=ListChanges)
+    acls: ListChanges = field(default_factory=ListChanges)
+    sections_reparsed: int = 0  # ile sekcji sparsowano ponownie
+    fetched: bool = True  # False → sonda zmian: configu nie pobierano ponownie
+
+    @property
+    def routing(self) -> bool:
+        return bool(
+            self.static or self.rip_networks or self.ospf or self.rip_interfaces
+        )
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.hostname is not None
+            or self.interfaces
+            or self.vlans
+            or self.routing
+            or self.acls
+        )
+
+
+def _section_key(sec: Section) -> tuple:
+    return (sec.header, tuple(sec.children))
+
+
+def reparse(prev: ParsedConfig, raw_running: str) -> tuple[ParsedConfig, ConfigDelta]:
+    """
+    Parsowanie przyrostowe: porównuje nowy running-config z poprzednim snapshotem
+    na poziomie sekcji i parsuje ponownie tylko sekcje zmienione.
+    Rekordy niezmienionych interfejsów / VLAN-ów / procesów routingu są przejmowane
+    z prev. Zwraca (nowy ParsedConfig, delta względem prev).
+    """
+    if raw_running == prev.raw_running:
+        return prev, ConfigDelta()
+
+    from services.parsers.cisco_ios import ConfigBuilder
+
+    old_keys = Counter(_section_key(s) for s in iter_sections(prev.raw_running))
+    builder = ConfigBuilder(raw_running)
+    changed = 0
+
+    for sec in iter_sections(raw_running):
+        key = _section_key(sec)
+        if old_keys[key] > 0:
+            old_keys[key] -= 1
+            if _reuse(builder, sec, prev):
+                continue
+        else:
+            changed += 1
+        builder.feed(sec)
+
+    conf = builder.finish()
+    conf.vendor = prev.vendor
+    conf.raw_startup = prev.raw_startup
+
+    delta = diff(prev, conf)
+    delta.sections_reparsed = changed
+    return conf, delta
+
+
+def _reuse(builder, sec: Section, prev: ParsedConfig) -> bool:
+    """Przejmuje rekordy niezmienionej sekcji z prev (True = sekcja obsłużona)."""
+    words = sec.header.split()
+    if len(words) < 2:
+        return False
+    kw = words[0]
+
+    if kw == "interface" and words[1] in prev.interfaces.items:
+        # sekcja identyczna jak w prev — wystarczy odczytać access vlan z linii
+        access_vlan = ""
+        for child in sec.children:
+            parts = child.split()
+            if parts[:3] == ["switchport", "access", "vlan"] and len(parts) > 3:
+                access_vlan = parts[3] if parts[3].isdigit() else ""
+                break
+        builder.add_interface(words[1], prev.interfaces.items[words[1]], access_vlan)
+        return True
+
+    if kw == "vlan" and words[1] in prev.vlans.items:
+        builder.add_vlan(words[1], prev.vlans.items[words[1]].get("name", ""))
+        return True
+
+    if kw == "router" and words[1] == "ospf" and len(words) > 2:
+        builder.add_ospf([o for o in prev.routing.ospf if o["process"] == words[2]])
+        return True
+
+    # sekcje jednoliniowe (ip route, access-list, hostname) parsuje się tanio
+    return False
+
+
+# ==============================================================
+#                        DIFF
+# ==============================================================
+
+
+def diff(prev: ParsedConfig | None, conf: ParsedConfig) -> ConfigDelta:
+    """Delta rekordów między dwoma ParsedConfig (prev=None → wszystko dodane)."""
+    prev = prev or ParsedConfig(vendor=conf.vendor)
+    delta = ConfigDelta()
+    if prev.hostname != conf.hostname:
+        delta.hostname = conf.hostname or ""
+    delta.interfaces = _diff_keyed(prev.interfaces.items, conf.interfaces.items)
+    delta.vlans = _diff_keyed(prev.vlans.items, conf.vlans.items)
+    delta.static = _diff_list(prev.routing.static, conf.routing.static)
+    delta.rip_networks = _diff_list(
+        prev.routing.rip_networks, conf.routing.rip_networks
+    )
+    delta.ospf = _diff_list(prev.routing.ospf, conf.routing.ospf)
+    delta.rip_interfaces = _diff_list(
+        prev.routing.rip_interfaces, conf.routing.rip_interfaces
+    )
+    delta.acls = _diff_list(prev.acls.rules, conf.acls.rules)
+    return delta
+
+
+def _diff_keyed(old: dict, new: dict) -> KeyedChanges:
+    ch = KeyedChanges()
+    for key, rec in new.items():
+        if key not in old:
+            ch.added[key] = rec
+        elif old[key] is not rec and old[key] != rec:
+            ch.changed[key] = rec
+    ch.removed = [key for key in old if key not in new]
+    return ch
+
+
+def _freeze(rec):
+    return tuple(sorted(rec.items())) if isinstance(rec, Mapping) else rec
+
+
+def _diff_list(old: list, new: list) -> ListChanges:
+    ch = ListChanges()
+    remaining = Counter(_freeze(r) for r in old)
+    for rec in new:
+        key = _freeze(rec)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            ch.added.append(rec)
+    left = Counter(remaining)
+    for rec in old:
+        key = _freeze(rec)
+        if left[key] > 0:
+            left[key] -= 1
+            ch.removed.append(rec)
+    return ch
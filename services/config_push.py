@@ -0,0 +1,472 @@
+# services/config_push.py
+"""
+Minimalna delta konfiguracji do wypchnięcia na urządzenie.
+
+plan_from_tabs() porównuje stan zakładek (export_state() z DeviceBuffer.tabs)
+z ostatnim snapshotem (ParsedConfig z synca) i zwraca najmniejszą uporządkowaną
+listę komend IOS — razem z formami "no" dla usuniętych elementów.
+merge_commands() robi to samo dla pliku konfiguracyjnego: z pliku zostają tylko
+linie, których brakuje w running-configu (w tej samej sekcji).
+
+Kolejność komend:
+    hostname → VLAN-y (nowe/zmiana nazwy) → interfejsy (z przypisaniami portów)
+    → ACL → nowe trasy → RIP/OSPF → usunięte trasy → usunięte VLAN-y
+    i interfejsy,
+czyli najpierw wszystko, do czego mogą się odwoływać kolejne linie, a usuwanie
+na końcu (np. zamiana trasy domyślnej nie zostawia urządzenia bez trasy).
+"""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+from services.parsed_config import InterfaceRecord, ParsedConfig
+from services.parsers.cisco_ios import is_standard_acl, parse_acl
+from services.parsers.tokenizer import iter_section_lines, iter_sections
+
+# interfejsy, które można usunąć "no interface X" (fizycznych się nie da)
+VIRTUAL_PREFIXES = ("Loopback", "Vlan", "Tunnel", "Port-channel", "BVI", "Dialer")
+
+# vendorzy, dla których plan_from_tabs umie pisać komendy (składnia IOS)
+PUSH_VENDORS = ("CISCO",)
+
+# linie z "show running-config", które nie są komendami
+_NOT_COMMANDS = ("Building configuration", "Current configuration")
+
+
+@dataclass
+class PushPlan:
+    commands: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)  # czego nie da się wypchnąć
+
+    @property
+    def empty(self) -> bool:
+        return not self.commands
+
+    def preview(self) -> str:
+        return "\n".join(self.commands)
+
+
+# ==============================================================
+#                  STAN ZAKŁADEK → KOMENDY
+# ==============================================================
+
+
+def supported(snapshot: ParsedConfig) -> bool:
+    """Czy dla tego snapshotu można planować wypychanie (tylko Cisco IOS)."""
+    return snapshot.vendor in PUSH_VENDORS
+
+
+def plan_from_tabs(
+    snapshot: ParsedConfig, tabs: dict[str, dict], names: list[str] | None = None
+) -> PushPlan:
+    """
+    Delta między stanem zakładek a snapshotem. names — zakładki widoczne dla
+    urządzenia (pozostałe widgety są współdzielone i mogą trzymać cudze dane);
+    None → wszystkie obecne w tabs. Komendy są w składni IOS — dla innych
+    vendorów ValueError (sprawdź wcześniej supported()).
+    """
+    if not supported(snapshot):
+        raise ValueError(f"Wypychanie zmian nieobsługiwane dla {snapshot.vendor}")
+    plan = PushPlan()
+    tabs = {k: v for k, v in tabs.items() if names is None or k in names}
+
+    global_cmds: list[str] = []
+    vlan_cmds: list[str] = []
+    acl_cmds: list[str] = []
+    route_add: list[str] = []
+    route_del: list[str] = []
+    dynamic_cmds: list[str] = []
+    removals: list[str] = []
+    # komendy w blokach "interface X" — wspólne dla INTERFACES i portów z VLANs
+    blocks: dict[str, list[str]] = {}
+    headers: dict[str, str] = {}
+
+    def block(name: str) -> list[str]:
+        key = _short(name)
+        headers.setdefault(key, name)
+        return blocks.setdefault(key, [])
+
+    state = tabs.get("GLOBAL") or {}
+    hostname = (state.get("hostname") or "").strip()
+    if hostname and hostname != (snapshot.hostname or ""):
+        if " " in hostname:
+            plan.warnings.append(f"Nieprawidłowy hostname: '{hostname}'")
+        else:
+            global_cmds.append(f"hostname {hostname}")
+
+    rows = _rows(tabs, "INTERFACES", "rows", snapshot.interfaces.items, plan)
+    if rows is not None:
+        _diff_interfaces(snapshot, rows, block, removals, plan)
+
+    rows = _rows(tabs, "VLANs", "rows", snapshot.vlans.items, plan)
+    if rows is not None:
+        _diff_vlans(snapshot, rows, vlan_cmds, block, removals)
+
+    state = tabs.get("ACL")
+    if state is not None and "rules" in state:
+        _diff_acls(snapshot, state, acl_cmds, plan)
+
+    rows = _rows(tabs, "ROUTING", "routes", snapshot.routing.static, plan)
+    if rows is not None:
+        old = [(r.dest, r.mask, r.nh) for r in snapshot.routing.static]
+        new = [tuple(_cells(row, 3)) for row in rows if _cells(row, 3)[0]]
+        route_add = [f"ip route {' '.join(r)}" for r in new if r not in old]
+        route_del = [f"no ip route {' '.join(r)}" for r in old if r not in new]
+    _diff_dynamic(snapshot, tabs, dynamic_cmds, plan)
+
+    plan.commands = global_cmds + vlan_cmds
+    for key, children in blocks.items():
+        if children:
+            plan.commands += [f"interface {headers[key]}"] + children
+    plan.commands += acl_cmds + route_add + dynamic_cmds + route_del + removals
+    return plan
+
+
+def _rows(tabs: dict, name: str, key: str, old, plan: PushPlan) -> list | None:
+    """
+    Wiersze tabeli zakładki albo None, gdy nie ma czego porównywać.
+    Pusta tabela przy niepustym snapshocie to prawie zawsze tab, którego nikt
+    nie wypełnił (sync poza aktywnym urządzeniem) — nie kasujemy wtedy wszystkiego.
+    """
+    state = tabs.get(name)
+    if state is None or key not in state:
+        return None
+    rows = [row for row in state[key] if row and str(row[0]).strip()]
+    if not rows and old:
+        plan.warnings.append(
+            f"{name}: pusta tabela przy niepustym snapshocie — pominięto "
+            f"(zsynchronizuj urządzenie, żeby usuwać wszystko)"
+        )
+        return None
+    return rows
+
+
+def _cells(row: list, n: int) -> list[str]:
+    cells = [str(c).strip() for c in row[:n]]
+    return cells + [""] * (n - len(cells))
+
+
+def _short(name: str) -> str:
+    # ta sama heurystyka aliasu co przy portach VLAN-ów w parserze (Gi0/1)
+    return name.replace("GigabitEthernet", "Gi")
+
+
+def _diff_interfaces(snapshot, rows, block, removals: list[str], plan: PushPlan):
+    seen = set()
+    for row in rows:
+        name, desc, ip, mask, mode, status = _cells(row, 6)
+        seen.add(name)
+        old = snapshot.interfaces.items.get(name) or InterfaceRecord()
+        mode, status = mode.lower(), status.lower()
+        cmds = []
+
+        if mode != old.mode:
+            if mode == "routed":
+                cmds.append("no switchport")
+            elif mode in ("access", "trunk"):
+                if old.mode == "routed":
+                    cmds.append("switchport")
+                cmds.append(f"switchport mode {mode}")
+            elif not mode and old.mode in ("access", "trunk"):
+                cmds.append("no switchport mode")
+            elif mode:
+                plan.warnings.append(f"{name}: nieznany tryb '{mode}'")
+
+        if (ip, mask) != (old.ip, old.mask):
+            if ip and mask:
+                cmds.append(f"ip address {ip} {mask}")
+            elif not ip and old.ip:
+                cmds.append("no ip address")
+            elif ip:
+                plan.warnings.append(f"{name}: adres {ip} bez maski — pominięto")
+
+        if desc != old.description:
+            cmds.append(f"description {desc}" if desc else "no description")
+
+        if status and status != old.status:
+            if status == "down":
+                cmds.append("shutdown")
+            elif status == "up":
+                cmds.append("no shutdown")
+            else:
+                plan.warnings.append(f"{name}: nieznany status '{status}'")
+
+        if cmds:
+            block(name).extend(f" {c}" for c in cmds)
+
+    for name in snapshot.interfaces.items:
+        if name in seen:
+            continue
+        if name.startswith(VIRTUAL_PREFIXES):
+            removals.append(f"no interface {name}")
+        else:
+            plan.warnings.append(
+                f"{name}: interfejsu fizycznego nie można usunąć — pominięto"
+            )
+
+
+def _diff_vlans(snapshot, rows, vlan_cmds: list[str], block, removals: list[str]):
+    old_ports = {
+        _short(p): vid for vid, v in snapshot.vlans.items.items() for p in v.ports
+    }
+    new_ports: dict[str, tuple[str, str]] = {}  # skrót → (nazwa z tabeli, vlan)
+    seen = set()
+    for row in rows:
+        vid, name, ports = _cells(row, 3)
+        seen.add(vid)
+        old = snapshot.vlans.items.get(vid)
+        if old is None:
+            vlan_cmds.append(f"vlan {vid}")
+            if name:
+                vlan_cmds.append(f" name {name}")
+        elif name != old.name:
+            vlan_cmds += [f"vlan {vid}", f" name {name}" if name else " no name"]
+        for port in (p.strip() for p in ports.split(",")):
+            if port:
+                new_ports[_short(port)] = (port, vid)
+
+    for key, (port, vid) in new_ports.items():
+        if old_ports.get(key) != vid:
+            block(port).append(f" switchport access vlan {vid}")
+    for key, vid in old_ports.items():
+        if key not in new_ports:
+            block(key).append(" no switchport access vlan")
+
+    removals += [f"no vlan {vid}" for vid in snapshot.vlans.items if vid not in seen]
+
+
+def _diff_dynamic(snapshot, tabs: dict, cmds: list[str], plan: PushPlan):
+    """Sieci RIP i OSPF z zakładki ROUTING (dodane/usunięte "network")."""
+    state = tabs.get("ROUTING") or {}
+    old_rip = snapshot.routing.rip_networks
+    if state.get("rip_off"):
+        if old_rip:
+            cmds.append("no router rip")
+    else:
+        rows = _rows(tabs, "ROUTING", "rip", old_rip, plan)
+        if rows is not None:
+            new_rip = [_cells(row, 1)[0] for row in rows]
+            children = [f" network {n}" for n in new_rip if n not in old_rip]
+            children += [f" no network {n}" for n in old_rip if n not in new_rip]
+            if children:
+                version = [] if old_rip else [" version 2"]
+                cmds += ["router rip"] + version + children
+
+    rows = _rows(tabs, "ROUTING", "ospf", snapshot.routing.ospf, plan)
+    if rows is None:
+        return
+    old = [(o.process, o.network, o.wildcard, o.area) for o in snapshot.routing.ospf]
+    new = [tuple(_cells(row, 4)) for row in rows]
+    processes: dict[str, list[str]] = defaultdict(list)
+    for entry in new:
+        if not all(entry):
+            plan.warnings.append(f"OSPF: niepełna sieć {' '.join(entry)} — pominięto")
+        elif entry not in old:
+            processes[entry[0]].append(
+                f" network {entry[1]} {entry[2]} area {entry[3]}"
+            )
+    for entry in old:
+        if entry not in new:
+            processes[entry[0]].append(
+                f" no network {entry[1]} {entry[2]} area {entry[3]}"
+            )
+    for process, children in processes.items():
+        cmds += [f"router ospf {process}"] + children
+
+
+def _diff_acls(snapshot, state: dict, acl_cmds: list[str], plan: PushPlan):
+    """
+    ACL numerowane. Stan "przed" to linie access-list z running-configu (nie
+    reguły ze snapshotu), więc numery sekwencji zgadzają się z urządzeniem.
+    Samo dopisanie na końcu → tylko nowe linie. Każdą inną zmianę robimy
+    w trybie "ip access-list" po numerach sekwencji, a nie przez "no
+    access-list N" i dodanie od nowa: między tymi krokami lista przypięta do
+    interfejsu albo vty nie istnieje lub ma pierwszą regułę z niejawnym deny,
+    co potrafi odciąć sesję, którą wysyłamy zmiany. Usuwane są tylko reguły
+    skasowane w zakładce — nigdy cała lista. Lista z linią, której parser nie
+    rozpoznał (np. remark), nie jest ruszana: nie wiadomo, które numery
+    sekwencji mają jej reguły.
+    """
+    acls = state.get("acls") or [state.get("acl")] * len(state["rules"])
+    new: dict[str, list[tuple]] = defaultdict(list)
+    for number, row in zip(acls, state["rules"]):
+        if not number:
+            plan.warnings.append("ACL: reguła bez numeru listy — pominięto")
+            continue
+        new[str(number)].append(_acl_key(str(number), _cells(row, 5)))
+
+    old = _raw_aces(snapshot.raw_running)
+    if not new and old:
+        plan.warnings.append(
+            "ACL: pusta tabela przy niepustym snapshocie — pominięto "
+            "(zsynchronizuj urządzenie, żeby usuwać reguły)"
+        )
+        return
+
+    for number in list(old) + [n for n in new if n not in old]:
+        aces = old.get(number, [])
+        before = [key for key, _ in aces]
+        after = new.get(number, [])
+        if [key for key in before if key is not None] == after:
+            continue
+        unknown = [line for key, line in aces if key is None]
+        if unknown:
+            plan.warnings.append(
+                f"ACL {number}: linia nierozpoznana przez parser ('{unknown[0]}') "
+                f"— zmiany tej listy pominięte"
+            )
+            continue
+        if after[: len(before)] == before:
+            acl_cmds += [_acl_line(key) for key in after[len(before) :]]
+        else:
+            acl_cmds += _acl_sequence_edit(number, aces, after)
+
+
+def _acl_sequence_edit(
+    number: str, aces: list[tuple[tuple, str]], after: list[tuple]
+) -> list[str]:
+    """
+    "ip access-list resequence" nadaje regułom numery step, 2*step, ...
+    w kolejności linii z running-configu (aces). Reguły wspólne (najdłuższy
+    wspólny podciąg) zostają na miejscu, nowe wchodzą w luki tuż za poprzednią
+    zachowaną regułą, a usunięte kasujemy dopiero po wstawieniu nowych.
+    """
+    before = [key for key, _ in aces]
+    raw: dict[tuple, deque] = defaultdict(deque)
+    for key, line in aces:
+        raw[key].append(line)
+    kept = _common_subsequence(before, after)
+    # nowe reguły pogrupowane wg indeksu poprzedniej zachowanej reguły (-1: początek)
+    groups: dict[int, list[tuple]] = defaultdict(list)
+    prev = -1
+    pairs = iter(kept)
+    pair = next(pairs, None)
+    for j, key in enumerate(after):
+        if pair is not None and pair[1] == j:
+            prev = pair[0]
+            pair = next(pairs, None)
+        else:
+            groups[prev].append(key)
+    step = 10 * (max((len(g) for g in groups.values()), default=0) // 10 + 1)
+
+    kind = "standard" if is_standard_acl(number) else "extended"
+    cmds = [
+        f"ip access-list resequence {number} {step} {step}",
+        f"ip access-list {kind} {number}",
+    ]
+    for i, keys in groups.items():
+        for offset, key in enumerate(keys, start=1):
+            rule = _acl_line(key, raw).split(None, 2)[2]
+            cmds.append(f" {(i + 1) * step + offset} {rule}")
+    kept_before = {i for i, _ in kept}
+    cmds += [
+        f" no {(i + 1) * step}" for i in range(len(before)) if i not in kept_before
+    ]
+    return cmds
+
+
+def _common_subsequence(a: list, b: list) -> list[tuple[int, int]]:
+    """Pary indeksów (i, j) najdłuższego wspólnego podciągu a i b, rosnąco."""
+    n, m = len(a), len(b)
+    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        for j in range(m - 1, -1, -1):
+            dp[i][j] = (
+                dp[i + 1][j + 1] + 1
+                if a[i] == b[j]
+                else max(dp[i + 1][j], dp[i][j + 1])
+            )
+    out, i, j = [], 0, 0
+    while i < n and j < m:
+        if a[i] == b[j]:
+            out.append((i, j))
+            i, j = i + 1, j + 1
+        elif dp[i + 1][j] >= dp[i][j + 1]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def _acl_key(number: str, cells: list[str]) -> tuple:
+    """
+    Klucz reguły do porównań (zakładka ↔ running-config). Standardowe ACL nie
+    mają protokołu ani celu — zakładka wpisuje tam domyślnie "ip"/"any".
+    """
+    action, proto, src, wildcard, dest = cells
+    if is_standard_acl(number):
+        return (number, action, "", src or "any", wildcard, "")
+    return (number, action, proto or "ip", src or "any", wildcard, dest or "any")
+
+
+def _acl_line(key: tuple, raw: dict | None = None) -> str:
+    if raw and raw.get(key):
+        return raw[key].popleft()
+    # dla standardowych pola protokołu i celu są puste
+    return " ".join(["access-list", *(w for w in key if w)])
+
+
+def _raw_aces(running: str) -> dict[str, list[tuple[tuple | None, str]]]:
+    """
+    Linie "access-list N ..." z running-configu w kolejności urządzenia:
+    numer → [(klucz jak w _acl_key albo None, gdy parser jej nie rozpoznał, linia)].
+    """
+    out: dict[str, list[tuple[tuple | None, str]]] = defaultdict(list)
+    for line in running.splitlines():
+        words = line.split()
+        if len(words) < 3 or words[0] != "access-list" or not words[1].isdigit():
+            continue
+        rule = parse_acl(words)
+        key = None
+        if rule is not None:
+            cells = [rule.action, rule.protocol, rule.src, rule.wildcard, rule.dest]
+            key = _acl_key(rule.acl, cells)
+        out[words[1]].append((key, line.strip()))
+    return out
+
+
+# ==============================================================
+#                  PLIK KONFIGURACYJNY → KOMENDY
+# ==============================================================
+
+
+def merge_commands(running: str, lines: list[str]) -> list[str]:
+    """
+    Linie pliku (z wcięciami), których nie ma w running-configu. Linia wcięta
+    jest porównywana tylko z liniami tej samej sekcji i wysyłana razem ze
+    swoim nagłówkiem (i nadrzędnymi liniami podsekcji, np. address-family).
+    """
+    present: dict[str, set[str]] = defaultdict(set)
+    for sec in iter_sections(running):
+        present[sec.header.strip()].update(sec.children)
+
+    out: list[str] = []
+    lines = [
+        line.rstrip()
+        for line in lines
+        if line.strip() and line.strip() != "end" and not line.startswith(_NOT_COMMANDS)
+    ]
+    for sec in iter_section_lines(lines):
+        header = sec.header.strip()
+        if not sec.lines:
+            if header not in present:
+                out.append(sec.header)
+            continue
+        have = present.get(header, set())
+        emitted: list[str] = []
+        parents: list[tuple[int, str, bool]] = []  # (wcięcie, linia, wysłana)
+        for line in sec.lines:
+            indent = len(line) - len(line.lstrip())
+            while parents and parents[-1][0] >= indent:
+                parents.pop()
+            needed = line.strip() not in have
+            if needed:
+                for i, (lvl, parent, sent) in enumerate(parents):
+                    if not sent:
+                        emitted.append(parent)
+                        parents[i] = (lvl, parent, True)
+                emitted.append(line)
+            parents.append((indent, line, needed))
+        if emitted or header not in present:
+            out += [sec.header] + emitted
+    return out
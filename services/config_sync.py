@@ -1,8 +1,11 @@
 # services/config_sync.py
-from typing import Protocol
+import threading
+from typing import Callable, Protocol
 from devices.Device import Device
+from services import parsers
+from services.config_delta import ConfigDelta, diff, reparse
 from services.parsed_config import ParsedConfig
-from services.parsers import cisco_ios
+from services.parse_cache import ParseCache
 
 
 class SyncableTab(Protocol):
@@ -10,13 +13,141 @@ class SyncableTab(Protocol):
 
 
 class ConfigSyncService:
-    def __init__(self, connection_manager):
+    def __init__(
+        self,
+        connection_manager,
+        cache: ParseCache | None = None,
+        conditional: bool = False,
+    ):
         self.cm = connection_manager
+        self.cache = cache if cache is not None else ParseCache()
+        # synchronizacja warunkowa: sonda zmian przed pełnym pobraniem configu
+        self.conditional = conditional
+        # host → (znacznik zmiany, licznik cm.config_writes, snapshot) — stan
+        # urządzenia w chwili ostatniego pełnego pobrania z sondą
+        self._probes: dict[str, tuple[str, int, ParsedConfig]] = {}
+        # host → config_writes, przy którym sonda nie dała znacznika (IOS pokazuje
+        # go dopiero po pierwszej zmianie od startu) — do następnego send_config
+        self._no_probe: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._probe_stats = {"probes": 0, "unchanged": 0}
 
     def fetch_and_parse(self, device: Device) -> ParsedConfig:
-        # Na razie: Cisco/Juniper → użyj Cisco parsera jako domyślnego
-        raw = self.cm.send_command(device, "show running-config")
-        # TODO: w przyszłości detekcja po vendorze/banerze i wybór parsera
-        conf = cisco_ios.parse(raw)
-        conf.vendor = device.vendor.name
+        # parser wybierany po vendorze (moduł ładowany przy pierwszym użyciu)
+        parser = parsers.get_parser(device.vendor.name)
+        raw = self.cm.send_command(device, parser.FETCH_COMMAND)
+        # identyczny tekst → ten sam ParsedConfig z cache (bez ponownego parsowania)
+        return self.cache.get_or_parse(raw, parser.parse, device.vendor.name)
+
+    def fetch_streaming(
+        self,
+        device: Device,
+        on_block: Callable[[str, ParsedConfig], None] | None = None,
+    ) -> ParsedConfig:
+        """
+        Pobiera running-config strumieniowo i parsuje go w trakcie transferu.
+        on_block dostaje częściowe wyniki (patrz parse_stream w parserach).
+        Parsery bez parse_stream → zwykłe fetch_and_parse.
+        """
+        parser = parsers.get_parser(device.vendor.name)
+        if not hasattr(parser, "parse_stream") or not hasattr(
+            self.cm, "stream_command"
+        ):
+            return self.fetch_and_parse(device)
+        chunks = self.cm.stream_command(device, parser.FETCH_COMMAND)
+        conf = parser.parse_stream(chunks, on_block)
+        conf.vendor = device.vendor.name  # nowy obiekt, jeszcze spoza cache
+        # do cache, żeby kolejny identyczny config nie był parsowany ponownie
+        self.cache.put(conf.raw_running, conf, device.vendor.name)
         return conf
+
+    def fetch_incremental(
+        self,
+        device: Device,
+        previous: ParsedConfig | None,
+        on_block: Callable[[str, ParsedConfig], None] | None = None,
+        conditional: bool | None = None,
+    ) -> tuple[ParsedConfig, ConfigDelta | None]:
+        """
+        Pobiera running-config i parsuje tylko sekcje zmienione względem previous.
+        Zwraca (config, delta); delta=None oznacza pełne parsowanie (brak snapshotu)
+        — wtedy config jest pobierany strumieniowo, a on_block dostaje podgląd.
+        conditional (domyślnie self.conditional): najpierw tania sonda zmian;
+        jeśli urządzenie nie zmieniło się od pobrania previous → (previous,
+        pusta delta z fetched=False) bez pobierania i parsowania configu.
+        """
+        if self.conditional if conditional is None else conditional:
+            return self._fetch_conditional(device, previous, on_block)
+        return self._fetch_incremental(device, previous, on_block)
+
+    def probe_stats(self) -> dict:
+        """Ile sond wykonano i ile z nich oszczędziło pełne pobranie."""
+        with self._lock:
+            return dict(self._probe_stats)
+
+    def forget(self, host: str):
+        """Zapomina znacznik hosta (np. po usunięciu urządzenia z listy)."""
+        with self._lock:
+            self._probes.pop(host, None)
+            self._no_probe.pop(host, None)
+
+    def _fetch_conditional(self, device, previous, on_block):
+        parser = parsers.get_parser(device.vendor.name)
+        host = device.host
+        # licznik przed sondą: send_config w trakcie → różnica przy następnej
+        writes = getattr(self.cm, "config_writes", {}).get(host, 0)
+        with self._lock:
+            skip = self._no_probe.get(host) == writes
+        if skip or not hasattr(parser, "CHANGE_PROBE"):
+            return self._fetch_incremental(device, previous, on_block)
+
+        token = parser.change_token(self.cm.send_command(device, parser.CHANGE_PROBE))
+        with self._lock:
+            self._probe_stats["probes"] += 1
+            if token is None:
+                # bez znacznika — kolejne synce bez zbędnej sondy
+                self._no_probe[host] = writes
+            elif self._unchanged(host, token, writes, previous):
+                self._probe_stats["unchanged"] += 1
+                return previous, ConfigDelta(fetched=False)
+
+        conf, delta = self._fetch_incremental(device, previous, on_block)
+        if token is not None:
+            # znacznik sprzed pobrania: zmiana w trakcie da inny przy następnej sondzie
+            with self._lock:
+                self._probes[host] = (token, writes, conf)
+        return conf, delta
+
+    def _unchanged(self, host, token, writes, previous) -> bool:
+        stored = self._probes.get(host)
+        if stored is None or previous is None or stored[:2] != (token, writes):
+            return False
+        # Znacznik dotyczy snapshotu zwróconego z tamtego pobrania. Wołający,
+        # którzy przekazują go dalej bez kopiowania (MainWindow: buf.config
+        # z _sync_done, sync po wdrożeniu; fleet_bench), trafiają w szybką
+        # ścieżkę "is". Snapshot odtworzony inaczej (kopia, wczytany z dysku)
+        # porównujemy po tekście — inny tekst → pełne pobranie.
+        return stored[2] is previous or stored[2].raw_running == previous.raw_running
+
+    def _fetch_incremental(self, device, previous, on_block):
+        if previous is None or not previous.raw_running:
+            return self.fetch_streaming(device, on_block), None
+        parser = parsers.get_parser(device.vendor.name)
+        if not hasattr(parser, "ConfigBuilder"):
+            # parser bez obsługi sekcji (np. Junos "display set") — pełne parsowanie
+            conf = self.fetch_and_parse(device)
+            return conf, diff(previous, conf)
+        raw = self._fetch_raw(device, parser.FETCH_COMMAND)
+        conf, delta = reparse(previous, raw)
+        if conf is not previous:
+            # vendor przed put — obiektów już w cache nie modyfikujemy
+            conf.vendor = device.vendor.name
+            self.cache.put(raw, conf, device.vendor.name)
+        return conf, delta
+
+    def _fetch_raw(self, device: Device, command: str) -> str:
+        # ten sam tekst co z fetch_streaming (bez promptu), żeby porównanie
+        # z poprzednim snapshotem nie widziało fałszywej zmiany
+        if hasattr(self.cm, "stream_command"):
+            return "".join(self.cm.stream_command(device, command)).strip()
+        return self.cm.send_command(device, command)
@@ -0,0 +1,188 @@
+# services/config_tree.py
+import re
+from functools import cached_property
+from typing import Iterator
+
+from services.parsers.tokenizer import Section
+
+# skróty nazw interfejsów (pełna nazwa → alias używany w GUI)
+_IFACE_ALIASES = {
+    "GigabitEthernet": "Gi",
+    "FastEthernet": "Fa",
+    "TenGigabitEthernet": "Te",
+    "Ethernet": "Eth",
+    "Port-channel": "Po",
+    "Loopback": "Lo",
+    "Serial": "Se",
+}
+
+
+def _key(text: str) -> str:
+    """Klucz indeksu — nagłówek ze ściśniętymi białymi znakami."""
+    return " ".join(text.split())
+
+
+def _alias_key(key: str) -> str | None:
+    """'interface GigabitEthernet0/1' → 'interface Gi0/1' (albo None)."""
+    if not key.startswith("interface "):
+        return None
+    name = key[len("interface ") :]
+    for full, short in _IFACE_ALIASES.items():
+        if name.startswith(full):
+            return f"interface {short}{name[len(full):]}"
+    return None
+
+
+class ConfigNode:
+    """
+    Węzeł drzewa konfiguracji: jedna linia + jej linie potomne (wcięte głębiej).
+    Dzieci są indeksowane po nagłówku, więc get() działa w O(1).
+    Liście (większość linii) nie mają własnej listy ani indeksu — oszczędza pamięć
+    przy snapshotach tysięcy urządzeń.
+    """
+
+    __slots__ = ("text", "parent", "line", "children", "_index")
+
+    def __init__(self, text: str, parent: "ConfigNode | None" = None, line: int = -1):
+        self.text = text
+        self.parent = parent
+        self.line = line  # numer linii nagłówka sekcji w raw_running, inaczej -1
+        self.children: list[ConfigNode] | tuple = ()
+        self._index: dict[str, ConfigNode] | None = None
+
+    def __repr__(self):
+        return f"ConfigNode({self.text!r}, children={len(self.children)})"
+
+    def __iter__(self) -> Iterator["ConfigNode"]:
+        return iter(self.children)
+
+    def __len__(self):
+        return len(self.children)
+
+    def __contains__(self, header: str) -> bool:
+        return self.get(header) is not None
+
+    def __getitem__(self, header: str) -> "ConfigNode":
+        node = self.get(header)
+        if node is None:
+            raise KeyError(header)
+        return node
+
+    # ==============================================================
+    #                        BUDOWA
+    # ==============================================================
+
+    def add(self, text: str, line: int = -1) -> "ConfigNode":
+        """Dodaje dziecko (przy powtórzonym nagłówku indeks wskazuje ostatnie)."""
+        node = ConfigNode(text, self, line)
+        if self._index is None:
+            self.children = []
+            self._index = {}
+        self.children.append(node)
+        key = _key(text)
+        self._index[key] = node
+        alias = _alias_key(key)
+        if alias:
+            self._index.setdefault(alias, node)
+        return node
+
+    # ==============================================================
+    #                        ZAPYTANIA
+    # ==============================================================
+
+    def get(self, header: str) -> "ConfigNode | None":
+        """Dziecko o danym nagłówku, np. 'interface Gi0/1' lub 'router ospf 1'."""
+        if self._index is None:
+            return None
+        return self._index.get(_key(header))
+
+    def find_prefix(self, prefix: str) -> list["ConfigNode"]:
+        """Dzieci, których linia zaczyna się od prefix (np. 'ip address')."""
+        prefix = _key(prefix)
+        return [c for c in self.children if _key(c.text).startswith(prefix)]
+
+    def find_re(self, pattern: str | re.Pattern) -> list["ConfigNode"]:
+        """Dzieci, których linia pasuje do wyrażenia regularnego (re.search)."""
+        rx = re.compile(pattern) if isinstance(pattern, str) else pattern
+        return [c for c in self.children if rx.search(c.text)]
+
+    def walk(self) -> Iterator["ConfigNode"]:
+        """Wszystkie węzły poddrzewa (pre-order, bez samego węzła)."""
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+    @property
+    def words(self) -> list[str]:
+        return self.text.split()
+
+    @property
+    def path(self) -> tuple[str, ...]:
+        """Ścieżka nagłówków od korzenia, np. ('router bgp 1', 'address-family ipv4')."""
+        if self.parent is None:
+            return ()
+        return self.parent.path + (self.text,)
+
+    def lines(self, indent: int = 0) -> Iterator[str]:
+        """Odtwarza tekst poddrzewa (z wcięciem o jedną spację na poziom)."""
+        for child in self.children:
+            yield " " * indent + child.text
+            yield from child.lines(indent + 1)
+
+
+class ConfigTree(ConfigNode):
+    """
+    Korzeń drzewa sekcji running-configu.
+    Budowany z sekcji tokenizera, więc nie wymaga osobnego przebiegu po tekście.
+    """
+
+    def __init__(self):
+        super().__init__("")
+
+    def add_section(self, sec: Section):
+        """Dodaje sekcję tokenizera razem z zagnieżdżonymi liniami."""
+        node = self.add(sec.header, sec.start)
+        # stos (wcięcie, węzeł) — głębsze wcięcie = dziecko poprzedniej linii
+        stack: list[tuple[int, ConfigNode]] = [(-1, node)]
+        for raw in sec.lines:
+            text = raw.strip()
+            if not text or text == "!":
+                continue
+            depth = len(raw) - len(raw.lstrip())
+            while len(stack) > 1 and stack[-1][0] >= depth:
+                stack.pop()
+            child = stack[-1][1].add(text)
+            stack.append((depth, child))
+        # widoki liczone leniwie — po zmianie drzewa do przeliczenia
+        self.__dict__.pop("by_keyword", None)
+        self.__dict__.pop("interfaces", None)
+
+    @classmethod
+    def from_sections(cls, sections) -> "ConfigTree":
+        tree = cls()
+        for sec in sections:
+            tree.add_section(sec)
+        return tree
+
+    # ==============================================================
+    #                  WIDOKI (liczone leniwie)
+    # ==============================================================
+
+    @cached_property
+    def by_keyword(self) -> dict[str, list[ConfigNode]]:
+        """Sekcje najwyższego poziomu pogrupowane po pierwszym słowie."""
+        groups: dict[str, list[ConfigNode]] = {}
+        for node in self.children:
+            words = node.words
+            if words:
+                groups.setdefault(words[0], []).append(node)
+        return groups
+
+    def sections(self, keyword: str) -> list[ConfigNode]:
+        """Np. sections('interface') albo sections('router')."""
+        return self.by_keyword.get(keyword, [])
+
+    @cached_property
+    def interfaces(self) -> dict[str, ConfigNode]:
+        """{nazwa interfejsu: węzeł}."""
+        return {n.words[1]: n for n in self.sections("interface") if len(n.words) > 1}
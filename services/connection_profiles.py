@@ -0,0 +1,138 @@
+# services/connection_profiles.py
+"""
+Zapamiętane profile połączeń (per urządzenie): prompt, czy trzeba enable,
+zmierzone opóźnienie i działające ustawienia czasowe. Pozwalają pominąć
+wykrywanie promptu i check_enable_mode() przy kolejnych połączeniach.
+Plik JSON obok logów; zapis atomowy (plik tymczasowy + rename).
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+
+
+@dataclass
+class ConnectionProfile:
+    device_type: str  # typ Netmiko, dla którego profil był zmierzony
+    base_prompt: str
+    needs_enable: bool = False
+    latency_ms: float = 0.0  # czas jednej wymiany (polecenie → prompt)
+    read_timeout: float = 20.0  # read_timeout, który działał dla send_command
+    delay_factor: float = 1.0  # global_delay_factor Netmiko
+    updated: float = 0.0  # time.time() ostatniej aktualizacji
+    hits: int = 0  # ile razy profil pozwolił pominąć wykrywanie
+    # --- wyuczone przez TimingTuner ---
+    throughput_bps: float = 0.0  # przepustowość dużych wyników (bajty/s)
+    max_bytes: int = 0  # największy dotąd wynik polecenia
+    conn_timeout: float = 0.0  # timeout połączenia (0 → globalny z ustawień)
+    samples: int = 0
+    timeouts: int = 0
+    # read_timeout po ostatnim timeoucie — dolna granica przez FLOOR_WINDOW poleceń
+    timeout_floor: float = 0.0
+    floor_left: int = 0
+    # --- kopie zapasowe (services/config_backup.py) ---
+    file_transfer: str = ""  # scp / sftp / cli; "" → jeszcze nie sprawdzono
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConnectionProfile":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+class ProfileStore:
+    """Słownik klucz → ConnectionProfile trzymany w pliku JSON."""
+
+    SAVE_INTERVAL = 10.0
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._profiles: dict[str, ConnectionProfile] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._load()
+
+    @staticmethod
+    def key(host: str, connection_type: str) -> str:
+        return f"{host}/{connection_type}"
+
+    def get(self, key: str) -> ConnectionProfile | None:
+        with self._lock:
+            return self._profiles.get(key)
+
+    def put(self, key: str, profile: ConnectionProfile, persist: bool = True):
+        """Wstawia/zastępuje profil; persist jak w update()."""
+        profile.updated = time.time()
+        with self._lock:
+            self._profiles[key] = profile
+            self._dirty = True
+        if persist or time.time() - self._saved_at >= self.SAVE_INTERVAL:
+            self.save()
+
+    def update(self, key: str, persist: bool = True, **changes):
+        """
+        Zmienia pola istniejącego profilu (bez efektu, jeśli go nie ma).
+        persist=False → zapis na dysk najwyżej co SAVE_INTERVAL sekund
+        (częste aktualizacje, np. pomiary czasów po każdym poleceniu).
+        """
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is None:
+                return
+            for name, value in changes.items():
+                setattr(profile, name, value)
+            profile.updated = time.time()
+            self._dirty = True
+        if persist or time.time() - self._saved_at >= self.SAVE_INTERVAL:
+            self.save()
+
+    def flush(self):
+        """Zapisuje zaległe zmiany (np. przy zamykaniu aplikacji)."""
+        if self._dirty:
+            self.save()
+
+    def invalidate(self, key: str):
+        with self._lock:
+            removed = self._profiles.pop(key, None)
+        if removed is not None:
+            self.save()
+
+    def all(self) -> dict[str, ConnectionProfile]:
+        with self._lock:
+            return dict(self._profiles)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {k: asdict(p) for k, p in self._profiles.items()}
+            self._dirty = False
+            self._saved_at = time.time()
+        tmp = None
+        try:
+            folder = os.path.dirname(self.path) or "."
+            fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logging.warning(f"[PROFILE] Nie zapisano {self.path}: {e}")
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._profiles = {
+                k: ConnectionProfile.from_dict(v) for k, v in data.items()
+            }
+        except Exception as e:
+            logging.warning(f"[PROFILE] Uszkodzony plik {self.path}: {e}")
+            self._profiles = {}
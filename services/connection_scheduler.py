@@ -0,0 +1,209 @@
+# services/connection_scheduler.py
+"""
+Harmonogram logowań do urządzeń.
+Przy wielu równoległych połączeniach wąskim gardłem są serwery AAA (TACACS/RADIUS)
+i linie VTY urządzeń — zbyt wiele logowań naraz kończy się odmowami, a powtarzane
+odmowy potrafią zablokować konto. Scheduler stoi przed ConnectionManager.connect:
+
+- globalny token bucket (rate logowań/s, burst),
+- limit równoczesnych logowań na lokalizację (site) i na urządzenie,
+- ponawianie z wykładniczym backoffem i losowym rozrzutem (jitter),
+- metryki: długość kolejki, czasy oczekiwania, liczba ponowień.
+"""
+
+import ipaddress
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def default_site(host: str) -> str:
+    """Lokalizacja urządzenia: podsieć /24 (IPv4), /64 (IPv6) albo domena nazwy."""
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        _, _, domain = host.partition(".")
+        return domain or host
+    prefix = 24 if ip.version == 4 else 64
+    return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+
+@dataclass
+class SchedulerStats:
+    waiting: int = 0  # logowania czekające na slot / token (głębokość kolejki)
+    active: int = 0  # logowania w toku
+    admitted: int = 0  # ile prób logowania wpuszczono
+    retries: int = 0
+    failures: int = 0  # próby zakończone błędem (także te ponowione)
+    wait_total: float = 0.0  # suma czasów oczekiwania [s]
+    wait_max: float = 0.0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.admitted if self.admitted else 0.0
+
+
+class TokenBucket:
+    """rate tokenów na sekundę, najwyżej burst naraz."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return  # bez limitu
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._stamp) * self.rate
+                )
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class ConnectionScheduler:
+    """
+    rate        — globalny limit nowych logowań na sekundę (0 → bez limitu),
+    burst       — ile logowań może ruszyć od razu,
+    per_site    — równoczesne logowania w jednej lokalizacji (site_of(host)),
+    per_device  — równoczesne logowania do jednego urządzenia,
+    retries     — ile razy ponowić nieudaną próbę (tylko błędy przejściowe),
+    base_delay / max_delay — zakres backoffu (pełny jitter: losowo 0..limit).
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 5,
+        per_site: int = 8,
+        per_device: int = 1,
+        retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        site_of: Callable[[str], str] = default_site,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.per_site = max(1, int(per_site))
+        self.per_device = max(1, int(per_device))
+        self.retries = max(0, int(retries))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(self.base_delay, float(max_delay))
+        self.site_of = site_of
+
+        self._lock = threading.Lock()
+        self._sites: dict[str, threading.BoundedSemaphore] = {}
+        self._devices: dict[str, threading.BoundedSemaphore] = {}
+        self._stats = SchedulerStats()
+
+    # ==============================================================
+    #                        GŁÓWNE API
+    # ==============================================================
+
+    def call(
+        self,
+        host: str,
+        fn: Callable[[], T],
+        retryable: Callable[[Exception], bool] = lambda e: True,
+    ) -> T:
+        """
+        Wykonuje fn() (logowanie do host) w ramach limitów; błąd, dla którego
+        retryable(e) → True, jest ponawiany po odczekaniu (poza slotem, żeby nie
+        blokować innych). Ostatni błąd albo błąd nieprzejściowy jest rzucany dalej.
+        """
+        attempt = 0
+        while True:
+            with self.slot(host):
+                try:
+                    return fn()
+                except Exception as e:
+                    with self._lock:
+                        self._stats.failures += 1
+                    if attempt >= self.retries or not retryable(e):
+                        raise
+                    error = e
+            attempt += 1
+            delay = self.backoff(attempt)
+            with self._lock:
+                self._stats.retries += 1
+            logging.warning(
+                f"[SCHEDULER] {host}: {error} — ponowienie {attempt}/{self.retries} "
+                f"za {delay:.1f} s"
+            )
+            time.sleep(delay)
+
+    @contextmanager
+    def slot(self, host: str):
+        """Czeka na wolne miejsce (urządzenie → site) i token, potem wpuszcza."""
+        site_sem = self._semaphore(self._sites, self.site_of(host), self.per_site)
+        dev_sem = self._semaphore(self._devices, host, self.per_device)
+        t0 = time.monotonic()
+        with self._lock:
+            self._stats.waiting += 1
+        try:
+            dev_sem.acquire()
+            try:
+                site_sem.acquire()
+                try:
+                    # token na końcu — nie marnujemy go na czekanie w kolejce
+                    self.bucket.acquire()
+                except BaseException:
+                    site_sem.release()
+                    raise
+            except BaseException:
+                dev_sem.release()
+                raise
+        finally:
+            waited = time.monotonic() - t0
+            with self._lock:
+                self._stats.waiting -= 1
+
+        with self._lock:
+            s = self._stats
+            s.active += 1
+            s.admitted += 1
+            s.wait_total += waited
+            s.wait_max = max(s.wait_max, waited)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._stats.active -= 1
+            site_sem.release()
+            dev_sem.release()
+
+    def backoff(self, attempt: int) -> float:
+        """Opóźnienie przed ponowieniem nr attempt (pełny jitter)."""
+        limit = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, limit)
+
+    def stats(self) -> SchedulerStats:
+        with self._lock:
+            return SchedulerStats(**vars(self._stats))
+
+    # ==============================================================
+    #                        POMOCNICZE
+    # ==============================================================
+
+    def _semaphore(
+        self, table: dict[str, threading.BoundedSemaphore], key: str, limit: int
+    ) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = table.get(key)
+            if sem is None:
+                sem = table[key] = threading.BoundedSemaphore(limit)
+            return sem
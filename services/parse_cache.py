@@ -0,0 +1,265 @@
+# services/parse_cache.py
+import hashlib
+import logging
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+import services.config_tree
+import services.parsed_config
+import services.parsers
+from services.parsed_config import ParsedConfig
+
+# podbić przy zmianie formatu wpisów, której nie widać w źródłach poniżej
+SCHEMA_VERSION = 1
+_VERSION_DIR = re.compile(r"^v[0-9a-f]{12}$")
+
+
+def schema_fingerprint() -> str:
+    """
+    Wersja formatu wpisów na dysku: SCHEMA_VERSION + skrót źródeł rekordów
+    i wbudowanych parserów. Zmiana parsera albo rekordów (np. sloty) →
+    nowy katalog, więc stare pickle nigdy nie są wczytywane.
+    """
+    h = hashlib.sha256(str(SCHEMA_VERSION).encode())
+    parsers_dir = os.path.dirname(services.parsers.__file__)
+    files = [services.parsed_config.__file__, services.config_tree.__file__]
+    files += sorted(
+        os.path.join(parsers_dir, name)
+        for name in os.listdir(parsers_dir)
+        if name.endswith(".py")
+    )
+    for path in files:
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(path.encode())
+    return h.hexdigest()[:12]
+
+
+class ParseCache:
+    """
+    Cache sparsowanych konfiguracji adresowany treścią (sha256 surowego tekstu).
+    Pamięć: ograniczone LRU. Dysk (opcjonalnie): pliki .pickle w podkatalogu
+    wersji schematu w disk_dir, ograniczone do max_disk_mb (najdawniej używane
+    usuwane pierwsze). Zwracane obiekty są współdzielone — tylko do odczytu,
+    także po put() (ustaw wszystkie pola przed zapisaniem do cache).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        disk_dir: str | None = None,
+        max_disk_mb: int = 256,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max(1, int(max_disk_mb)) * 1024 * 1024
+        self._disk_bytes = 0
+        self._mem: OrderedDict[str, ParsedConfig] = OrderedDict()
+        self._lock = threading.Lock()  # sync wielu urządzeń z wątków w tle
+
+        # --- statystyki ---
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.parse_seconds = 0.0  # łączny czas parsowania przy missach
+        self.saved_seconds = 0.0  # szacowany czas zaoszczędzony przez trafienia
+
+        if disk_dir:
+            version = f"v{schema_fingerprint()}"
+            self.disk_dir = os.path.join(disk_dir, version)
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                self._drop_old_versions(disk_dir, version)
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+                self._evict_disk()
+            except OSError as e:
+                logging.warning(f"[PARSE CACHE] Dysk wyłączony ({disk_dir}): {e}")
+                self.disk_dir = None
+
+    # ==============================================================
+    #                        GŁÓWNE API
+    # ==============================================================
+
+    @staticmethod
+    def key(raw: str, vendor: str = "") -> str:
+        return hashlib.sha256(f"{vendor}\0{raw}".encode("utf-8")).hexdigest()
+
+    def get_or_parse(
+        self, raw: str, parser: Callable[[str], ParsedConfig], vendor: str = ""
+    ) -> ParsedConfig:
+        """Zwraca ParsedConfig z cache albo parsuje i zapamiętuje wynik."""
+        key = self.key(raw, vendor)
+
+        with self._lock:
+            conf = self._mem.get(key)
+            if conf is not None:
+                self._mem.move_to_end(key)
+                self._hit()
+                return conf
+
+        conf = self._load_disk(key)
+        if conf is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._hit()
+            self._remember(key, conf)
+            return conf
+
+        t0 = time.perf_counter()
+        conf = parser(raw)
+        with self._lock:
+            self.parse_seconds += time.perf_counter() - t0
+            self.misses += 1
+        if vendor:
+            conf.vendor = vendor
+        self._remember(key, conf)
+        self._store_disk(key, conf)
+        return conf
+
+    def put(self, raw: str, conf: ParsedConfig, vendor: str = ""):
+        """Zapamiętuje gotowy wynik (np. z parsowania przyrostowego)."""
+        key = self.key(raw, vendor)
+        self._remember(key, conf)
+        self._store_disk(key, conf)
+
+    def clear(self):
+        """Czyści cache w pamięci (pliki na dysku zostają)."""
+        with self._lock:
+            self._mem.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._mem),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "parse_seconds": self.parse_seconds,
+            "saved_seconds": self.saved_seconds,
+        }
+
+    def __len__(self):
+        return len(self._mem)
+
+    # ==============================================================
+    #                        POMOCNICZE
+    # ==============================================================
+
+    def _hit(self):
+        self.hits += 1
+        # trafienie oszczędza średni czas jednego parsowania
+        if self.misses:
+            self.saved_seconds += self.parse_seconds / self.misses
+
+    def _remember(self, key: str, conf: ParsedConfig):
+        with self._lock:
+            self._mem[key] = conf
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pickle")
+
+    def _load_disk(self, key: str) -> ParsedConfig | None:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                conf = pickle.load(f)
+            if not isinstance(conf, ParsedConfig):
+                raise TypeError(type(conf).__name__)
+        except Exception as e:
+            # uszkodzony albo niezgodny wpis → miss (i usunięcie pliku)
+            logging.warning(f"[PARSE CACHE] Pominięty wpis {path}: {e}")
+            self._remove_disk(path)
+            return None
+        try:
+            os.utime(path)  # LRU na dysku po czasie modyfikacji
+        except OSError:
+            pass
+        return conf
+
+    def _store_disk(self, key: str, conf: ParsedConfig):
+        if not self.disk_dir:
+            return
+        tmp = None
+        path = self._disk_path(key)
+        try:
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            # zapis atomowy: plik tymczasowy + rename
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(conf, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except Exception as e:
+            logging.warning(f"[PARSE CACHE] Nie zapisano {key}: {e}")
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        with self._lock:
+            self._disk_bytes += size - old
+        self._evict_disk()
+
+    def _disk_entries(self) -> list[tuple[float, int, str]]:
+        out = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".pickle"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, entry.path))
+        return out
+
+    def _evict_disk(self):
+        """Usuwa najdawniej używane wpisy, aż dysk zmieści się w limicie."""
+        with self._lock:
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            # do 90% limitu, żeby nie skanować katalogu przy każdym zapisie
+            target = self.max_disk_bytes * 0.9
+            for _, size, path in sorted(self._disk_entries()):
+                if self._disk_bytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._disk_bytes -= size
+
+    def _remove_disk(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes -= size
+
+    @staticmethod
+    def _drop_old_versions(root: str, current: str):
+        """
+        Katalogi innych wersji schematu (i luźne .pickle z układu sprzed
+        wersjonowania) są bezużyteczne — usuwamy je.
+        """
+        for entry in os.scandir(root):
+            if entry.is_dir() and entry.name != current:
+                if _VERSION_DIR.match(entry.name):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.is_file() and entry.name.endswith(".pickle"):
+                os.remove(entry.path)
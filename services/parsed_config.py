@@ -1,34 +1,129 @@
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Optional
+
+from services.config_tree import ConfigTree
+from services.parsers import get_parser
+
+# ==============================================================
+#              REKORDY (sloty + widok zgodny z dict)
+# ==============================================================
+
+
+class _Record(Mapping):
+    """
+    Baza rekordów: pola w __slots__ zamiast dict-a na każdy rekord,
+    a jednocześnie rec["ip"], rec.get("mode") i rec == {...} działają jak dla dict.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+def _i(value: str) -> str:
+    # wartości "enumowe" (mode/status/action/protocol) współdzielą jeden obiekt str
+    return sys.intern(value) if value else ""
+
+
+@dataclass(slots=True, eq=False)
+class InterfaceRecord(_Record):
+    description: str = ""
+    ip: str = ""
+    mask: str = ""
+    mode: str = ""  # access / trunk / routed / ""
+    status: str = "up"  # up / down
+
+    def __post_init__(self):
+        self.mode = _i(self.mode)
+        self.status = _i(self.status)
+
+
+@dataclass(slots=True, eq=False)
+class VLANRecord(_Record):
+    name: str = ""
+    ports: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True, eq=False)
+class StaticRoute(_Record):
+    dest: str = ""
+    mask: str = ""
+    nh: str = ""
+
+
+@dataclass(slots=True, eq=False)
+class OSPFNetwork(_Record):
+    process: str = ""
+    network: str = ""
+    wildcard: str = ""
+    area: str = ""
+    # Junos: OSPF włączane per interfejs — network/wildcard to jego podsieć
+    # (puste, gdy adres nieznany), nazwa interfejsu tylko tutaj
+    interface: str = ""
+
+    def __post_init__(self):
+        self.process = _i(self.process)
+        self.area = _i(self.area)
+
+
+@dataclass(slots=True, eq=False)
+class ACLRule(_Record):
+    acl: str = ""
+    action: str = ""  # permit / deny
+    protocol: str = ""
+    src: str = ""
+    wildcard: str = ""  # wildcard src (IOS); Junos: src i dest jako prefiksy
+    dest: str = "any"
+
+    def __post_init__(self):
+        self.acl = _i(self.acl)
+        self.action = _i(self.action)
+        self.protocol = _i(self.protocol)
+
+
+# ==============================================================
+#                        KONTENERY
+# ==============================================================
 
 
 @dataclass
 class ParsedInterfaces:
-    # { "GigabitEthernet0/0": {"description": "...", "ip": "x.x.x.x", "mask": "y.y.y.y", "mode": "access/trunk/routed", "status": "up/down"} }
-    items: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # { "GigabitEthernet0/0": InterfaceRecord(description=..., ip=..., mask=..., mode=..., status=...) }
+    items: Dict[str, InterfaceRecord] = field(default_factory=dict)
 
 
 @dataclass
 class ParsedVLANs:
-    # { "10": {"name": "Management", "ports": ["Gi0/2", ...]} }
-    items: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # { "10": VLANRecord(name="Management", ports=["Gi0/2", ...]) }
+    items: Dict[str, VLANRecord] = field(default_factory=dict)
 
 
 @dataclass
 class ParsedRouting:
-    static: List[Dict[str, str]] = field(
-        default_factory=list
-    )  # [{"dest":"", "mask":"", "nh":""}, ...]
+    static: List[StaticRoute] = field(default_factory=list)
     rip_networks: List[str] = field(default_factory=list)
-    ospf: List[Dict[str, str]] = field(
-        default_factory=list
-    )  # [{"process":"1","network":"x.x.x.x","wildcard":"0.0.0.255","area":"0"}]
+    ospf: List[OSPFNetwork] = field(default_factory=list)
+    # Junos: interfejsy RIP (neighbor w grupie) — nie sieci jak rip_networks
+    rip_interfaces: List[str] = field(default_factory=list)
 
 
 @dataclass
 class ParsedACLs:
-    # [{"acl":"10","action":"permit","protocol":"ip","src":"any","wildcard":"","dest":"any"}]
-    rules: List[Dict[str, str]] = field(default_factory=list)
+    rules: List[ACLRule] = field(default_factory=list)
 
 
 @dataclass
@@ -41,3 +136,23 @@ class ParsedConfig:
     vlans: ParsedVLANs = field(default_factory=ParsedVLANs)
     routing: ParsedRouting = field(default_factory=ParsedRouting)
     acls: ParsedACLs = field(default_factory=ParsedACLs)
+    # drzewo sekcji budowane leniwie przy pierwszym użyciu (patrz .tree)
+    _tree: Optional[ConfigTree] = field(default=None, repr=False, compare=False)
+
+    @property
+    def tree(self) -> ConfigTree:
+        """
+        Drzewo wszystkich sekcji raw_running (zapytania bez ponownego regexowania).
+        Budowane dopiero przy pierwszym odwołaniu, więc snapshoty w buforach
+        nie trzymają drzewa, dopóki nikt go nie potrzebuje. Sekcje dzieli parser
+        vendora (sections()); vendor bez niej → puste drzewo, a nie config
+        pocięty tokenizerem IOS.
+        """
+        if self._tree is None:
+            try:
+                split = getattr(get_parser(self.vendor), "sections", None)
+            except KeyError:
+                split = None
+            sections = split(self.raw_running) if split else ()
+            self._tree = ConfigTree.from_sections(sections)
+        return self._tree
@@ -0,0 +1,59 @@
+# services/parsers/__init__.py
+"""
+Rejestr parserów konfiguracji: (vendor, platforma) → moduł parsera.
+Moduły są importowane dopiero przy pierwszym użyciu, więc start aplikacji
+nie płaci za parsery, których nikt nie potrzebuje.
+
+Każdy moduł parsera udostępnia:
+    FETCH_COMMAND: str              — polecenie pobierające config z urządzenia
+    parse(raw: str) -> ParsedConfig
+oraz opcjonalnie:
+    parse_stream(chunks, on_block=None) -> ParsedConfig  — parsowanie w trakcie transferu
+    CHANGE_PROBE: str + change_token(output) -> str | None — tania sonda zmian
+                                    (ConfigSyncService, synchronizacja warunkowa)
+    sections(raw: str) -> Iterable[Section] — sekcje dla ParsedConfig.tree
+                                    (bez niej drzewo jest puste)
+"""
+
+import importlib
+from types import ModuleType
+
+# (VENDOR, platforma) → ścieżka modułu
+_REGISTRY: dict[tuple[str, str], str] = {
+    ("CISCO", "ios"): "services.parsers.cisco_ios",
+    ("JUNIPER", "junos"): "services.parsers.juniper_junos",
+}
+
+# domyślna platforma dla vendora (gdy urządzenie nie ma jej określonej)
+_DEFAULT_PLATFORM: dict[str, str] = {
+    "CISCO": "ios",
+    "JUNIPER": "junos",
+}
+
+_loaded: dict[str, ModuleType] = {}
+
+
+def register(vendor: str, platform: str, module: str, default: bool = False):
+    """Rejestruje moduł parsera (np. z wtyczki) bez jego importowania."""
+    vendor = vendor.upper()
+    _REGISTRY[(vendor, platform)] = module
+    if default or vendor not in _DEFAULT_PLATFORM:
+        _DEFAULT_PLATFORM[vendor] = platform
+
+
+def get_parser(vendor: str, platform: str | None = None) -> ModuleType:
+    """Zwraca moduł parsera dla vendora/platformy (import leniwy, z cache)."""
+    vendor = vendor.upper()
+    platform = platform or _DEFAULT_PLATFORM.get(vendor)
+    path = _REGISTRY.get((vendor, platform))
+    if path is None:
+        raise KeyError(f"Brak parsera dla {vendor}/{platform}")
+    module = _loaded.get(path)
+    if module is None:
+        module = importlib.import_module(path)
+        _loaded[path] = module
+    return module
+
+
+def available() -> list[tuple[str, str]]:
+    return sorted(_REGISTRY)
@@ -1,139 +1,278 @@
-import re
+from typing import Callable, Iterable
+
 from services.parsed_config import (
+    ACLRule,
+    InterfaceRecord,
+    OSPFNetwork,
     ParsedConfig,
     ParsedInterfaces,
     ParsedVLANs,
     ParsedRouting,
     ParsedACLs,
+    StaticRoute,
+    VLANRecord,
 )
-
-_HOST_RE = re.compile(r"^\s*hostname\s+(\S+)", re.M)
-_INT_START = re.compile(r"^\s*interface\s+(\S+)", re.M)
-_DESC_RE = re.compile(r"^\s*description\s+(.+)$", re.M)
-_IP_RE = re.compile(r"^\s*ip\s+address\s+(\S+)\s+(\S+)", re.M)
-_NO_SWITCHPORT = re.compile(r"^\s*no\s+switchport", re.M)
-_MODE_ACCESS = re.compile(r"^\s*switchport\s+mode\s+access", re.M)
-_MODE_TRUNK = re.compile(r"^\s*switchport\s+mode\s+trunk", re.M)
-_SHUT = re.compile(r"^\s*shutdown", re.M)
-
-_VLAN_BLOCK = re.compile(r"(?ms)^\s*vlan\s+(\d+)\s*(.*?)^\s*exit\b")
-_VLAN_NAME = re.compile(r"^\s*name\s+(.+)$", re.M)
-_INT_ACCESS_VLAN = re.compile(r"^\s*switchport\s+access\s+vlan\s+(\d+)", re.M)
-
-_STATIC_ROUTE = re.compile(r"^\s*ip\s+route\s+(\S+)\s+(\S+)\s+(\S+)", re.M)
-_RIP = re.compile(r"(?ms)^\s*router\s+rip\s*(.*?)^(?:!\s*|router\s|\Z)")
-_RIP_NETWORK = re.compile(r"^\s*network\s+(\S+)", re.M)
-
-_OSPF = re.compile(r"(?ms)^\s*router\s+ospf\s+(\d+)\s*(.*?)^(?:!\s*|router\s|\Z)")
-_OSPF_NET = re.compile(r"^\s*network\s+(\S+)\s+(\S+)\s+area\s+(\S+)", re.M)
-
-_ACL = re.compile(
-    r"^\s*access-list\s+(\d+)\s+(permit|deny)\s+(\S+)\s+(\S+)(?:\s+(\S+))?(?:\s+(\S+))?",
-    re.M,
+from services.parsers.tokenizer import (
+    Section,
+    iter_lines,
+    iter_section_lines,
+    iter_sections,
 )
 
+FETCH_COMMAND = "show running-config"
+# tania sonda zmian: jedna linia nagłówka running-config zamiast całego configu
+CHANGE_PROBE = "show running-config | include Last configuration change"
+
+
+def change_token(output: str) -> str | None:
+    """
+    "! Last configuration change at 10:11:12 UTC Mon Mar 1 2021 by admin"
+    z wyniku CHANGE_PROBE; None → brak znacznika (np. config nigdy nie zmieniany).
+    """
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith("! Last configuration change"):
+            return line
+    return None
+
+
+def sections(raw_running: str) -> Iterable[Section]:
+    """Sekcje running-configu dla ParsedConfig.tree (ten sam tokenizer co parse)."""
+    return iter_sections(raw_running)
+
 
 def parse(raw_running: str) -> ParsedConfig:
-    cfg = ParsedConfig(vendor="CISCO", raw_running=raw_running)
-
-    # hostname
-    m = _HOST_RE.search(raw_running)
-    if m:
-        cfg.hostname = m.group(1)
-
-    # interfaces
-    ifaces = ParsedInterfaces()
-    for m in _INT_START.finditer(raw_running):
-        name = m.group(1)
-        # blok interfejsu: od tej linii do następnego "interface" lub końca/!
-        start = m.start()
-        next_m = _INT_START.search(raw_running, m.end())
-        end = next_m.start() if next_m else len(raw_running)
-        block = raw_running[start:end]
-
-        info = {"description": "", "ip": "", "mask": "", "mode": "", "status": "up"}
-        d = _DESC_RE.search(block)
-        if d:
-            info["description"] = d.group(1).strip()
-        ipm = _IP_RE.search(block)
-        if ipm:
-            info["ip"] = ipm.group(1)
-            info["mask"] = ipm.group(2)
-        if _NO_SWITCHPORT.search(block):
-            info["mode"] = "routed"
-        elif _MODE_TRUNK.search(block):
-            info["mode"] = "trunk"
-        elif _MODE_ACCESS.search(block):
-            info["mode"] = "access"
-        if _SHUT.search(block):
-            info["status"] = "down"
-        ifaces.items[name] = info
-    cfg.interfaces = ifaces
-
-    # VLANs (z sekcji "vlan X")
-    vlans = ParsedVLANs()
-    for vm in _VLAN_BLOCK.finditer(raw_running):
-        vid = vm.group(1)
-        block = vm.group(2)
-        name = ""
-        nm = _VLAN_NAME.search(block)
-        if nm:
-            name = nm.group(1).strip()
-        vlans.items.setdefault(vid, {"name": name, "ports": []})
-    # przypięcia portów po śladach w interfejsach
-    for ifname, data in ifaces.items.items():
-        # heurystyka aliasu: Gi0/1 itd.
-        short = ifname.replace("GigabitEthernet", "Gi")
-        for vlan_id in list(vlans.items.keys()):
-            # sprawdź czy interfejs ma access vlan X
-            # (szukamy w bloku interfejsu, więc zróbmy szybkie sprawdzenie raz jeszcze)
-            # prościej: jeśli mode == access, spróbujemy znaleźć "switchport access vlan" w raw
-            start = raw_running.find(f"interface {ifname}")
-            end = raw_running.find("interface ", start + 1)
-            if start != -1:
-                block = raw_running[start : end if end != -1 else len(raw_running)]
-                m = _INT_ACCESS_VLAN.search(block)
-                if m and m.group(1) == vlan_id:
-                    vlans.items[vlan_id]["ports"].append(short)
-    cfg.vlans = vlans
-
-    # Routing
-    routing = ParsedRouting()
-    for sm in _STATIC_ROUTE.finditer(raw_running):
-        routing.static.append(
-            {"dest": sm.group(1), "mask": sm.group(2), "nh": sm.group(3)}
-        )
-    rm = _RIP.search(raw_running)
-    if rm:
-        for net in _RIP_NETWORK.findall(rm.group(1)):
-            routing.rip_networks.append(net)
-    for om in _OSPF.finditer(raw_running):
-        pid, block = om.group(1), om.group(2)
-        for nm in _OSPF_NET.finditer(block):
-            routing.ospf.append(
-                {
-                    "process": pid,
-                    "network": nm.group(1),
-                    "wildcard": nm.group(2),
-                    "area": nm.group(3),
-                }
-            )
-    cfg.routing = routing
-
-    # ACLs
-    acls = ParsedACLs()
-    for am in _ACL.finditer(raw_running):
-        acl, action, proto, src, wc, dest = am.groups()
-        acls.rules.append(
-            {
-                "acl": acl,
-                "action": action,
-                "protocol": proto,
-                "src": src,
-                "wildcard": (wc or ""),
-                "dest": (dest or "any"),
-            }
+    """
+    Parsuje running-config Cisco IOS w jednym przebiegu.
+    Tokenizer dzieli tekst na sekcje, a każda sekcja trafia od razu
+    do odpowiedniego pola ParsedConfig — czas liniowy względem długości configu.
+    """
+    builder = ConfigBuilder(raw_running)
+    for sec in iter_sections(raw_running):
+        builder.feed(sec)
+    return builder.finish()
+
+
+def parse_stream(
+    chunks: Iterable[str],
+    on_block: Callable[[str, ParsedConfig], None] | None = None,
+) -> ParsedConfig:
+    """
+    Parsuje running-config przychodzący kawałkami (np. z
+    ConnectionManager.stream_command) — parsowanie biegnie równolegle z transferem.
+    on_block(słowo kluczowe, częściowy config) jest wołane po każdym zamkniętym
+    bloku sekcji o tym samym słowie kluczowym (np. wszystkie "interface"),
+    więc GUI może wypełniać taby, zanim dotrze reszta configu.
+    """
+    received: list[str] = []
+    builder = ConfigBuilder()
+    block = None
+    for sec in iter_section_lines(iter_lines(chunks, received)):
+        kw = sec.header.split(None, 1)[0]
+        if on_block is not None and block is not None and kw != block:
+            on_block(block, builder.snapshot())
+        block = kw
+        builder.feed(sec)
+    conf = builder.finish()
+    conf.raw_running = "".join(received).strip()
+    if on_block is not None and block is not None:
+        on_block(block, conf)
+    return conf
+
+
+class ConfigBuilder:
+    """
+    Składa ParsedConfig z kolejnych sekcji tokenizera.
+    feed() parsuje sekcję; metody add_*() pozwalają wstawić gotowe rekordy
+    (np. z poprzedniego snapshotu przy parsowaniu przyrostowym).
+    """
+
+    def __init__(self, raw_running: str = ""):
+        self.cfg = ParsedConfig(vendor="CISCO", raw_running=raw_running)
+        self.ifaces = ParsedInterfaces()
+        self.vlans = ParsedVLANs()
+        self.routing = ParsedRouting()
+        self.acls = ParsedACLs()
+        # interfejs → "switchport access vlan X" (rozwiązywane w finish())
+        self.access_vlans: dict[str, str] = {}
+        self.rip_seen = False
+
+    def feed(self, sec: Section):
+        words = sec.header.split()
+        if not words:
+            return
+        kw = words[0]
+
+        if kw == "hostname" and len(words) > 1:
+            if self.cfg.hostname is None:
+                self.cfg.hostname = words[1]
+
+        elif kw == "interface" and len(words) > 1:
+            info, access_vlan = _parse_interface(sec)
+            self.add_interface(words[1], info, access_vlan)
+
+        elif kw == "vlan" and len(words) > 1 and words[1].isdigit():
+            name = ""
+            for child in sec.children:
+                if child.startswith("name "):
+                    name = child[5:].strip()
+                    break
+            self.add_vlan(words[1], name)
+
+        elif kw == "ip" and len(words) >= 5 and words[1] == "route":
+            self.routing.static.append(StaticRoute(words[2], words[3], words[4]))
+
+        elif kw == "router" and len(words) > 1:
+            if words[1] == "rip":
+                networks = []
+                for child in sec.children:
+                    parts = child.split()
+                    if len(parts) > 1 and parts[0] == "network":
+                        networks.append(parts[1])
+                self.add_rip(networks)
+            elif words[1] == "ospf" and len(words) > 2 and words[2].isdigit():
+                entries = []
+                for child in sec.children:
+                    parts = child.split()
+                    if len(parts) >= 5 and parts[0] == "network" and parts[3] == "area":
+                        entries.append(
+                            OSPFNetwork(words[2], parts[1], parts[2], parts[4])
+                        )
+                self.add_ospf(entries)
+
+        elif kw == "access-list":
+            rule = parse_acl(words)
+            if rule:
+                self.acls.rules.append(rule)
+
+    # --- wstawianie gotowych rekordów ---
+
+    def add_interface(self, name: str, info: InterfaceRecord, access_vlan: str = ""):
+        self.ifaces.items[name] = info
+        if access_vlan:
+            self.access_vlans[name] = access_vlan
+        else:
+            self.access_vlans.pop(name, None)
+
+    def add_vlan(self, vid: str, name: str):
+        if vid not in self.vlans.items:
+            self.vlans.items[vid] = VLANRecord(name)
+
+    def add_rip(self, networks: list[str]):
+        # liczy się tylko pierwsza sekcja "router rip"
+        if not self.rip_seen:
+            self.rip_seen = True
+            self.routing.rip_networks.extend(networks)
+
+    def add_ospf(self, entries: list[OSPFNetwork]):
+        self.routing.ospf.extend(entries)
+
+    def snapshot(self) -> ParsedConfig:
+        """
+        Częściowy config na potrzeby podglądu w trakcie parsowania.
+        Kontenery są współdzielone z builderem (bez kopiowania), a porty
+        VLAN-ów nie są jeszcze przypięte — to robi dopiero finish().
+        """
+        return ParsedConfig(
+            hostname=self.cfg.hostname,
+            vendor=self.cfg.vendor,
+            interfaces=self.ifaces,
+            vlans=self.vlans,
+            routing=self.routing,
+            acls=self.acls,
         )
-    cfg.acls = acls
 
-    return cfg
+    def finish(self) -> ParsedConfig:
+        # przypięcia portów do VLAN-ów po śladach w interfejsach
+        for ifname, vid in self.access_vlans.items():
+            if vid in self.vlans.items:
+                # heurystyka aliasu: Gi0/1 itd.
+                short = ifname.replace("GigabitEthernet", "Gi")
+                self.vlans.items[vid].ports.append(short)
+
+        cfg = self.cfg
+        cfg.interfaces = self.ifaces
+        cfg.vlans = self.vlans
+        cfg.routing = self.routing
+        cfg.acls = self.acls
+        return cfg
+
+
+# ==============================================================
+#                        POMOCNICZE
+# ==============================================================
+
+
+def _parse_interface(sec: Section) -> tuple[InterfaceRecord, str]:
+    """Zwraca (rekord interfejsu, access vlan lub "")."""
+    description = ip = mask = ""
+    status = "up"
+    routed = trunk = access = False
+    access_vlan = ""
+    for child in sec.children:
+        parts = child.split()
+        kw = parts[0]
+        if kw == "description" and len(parts) > 1:
+            if not description:
+                description = child.split(None, 1)[1].strip()
+        elif kw == "ip" and len(parts) >= 4 and parts[1] == "address":
+            if not ip:
+                ip, mask = parts[2], parts[3]
+        elif kw == "no" and len(parts) > 1 and parts[1] == "switchport":
+            routed = True
+        elif kw == "switchport" and len(parts) >= 3:
+            if parts[1] == "mode":
+                trunk = trunk or parts[2] == "trunk"
+                access = access or parts[2] == "access"
+            elif parts[1] == "access" and len(parts) >= 4 and parts[2] == "vlan":
+                if not access_vlan and parts[3].isdigit():
+                    access_vlan = parts[3]
+        elif kw == "shutdown":
+            status = "down"
+
+    if routed:
+        mode = "routed"
+    elif trunk:
+        mode = "trunk"
+    elif access:
+        mode = "access"
+    else:
+        mode = ""
+    return InterfaceRecord(description, ip, mask, mode, status), access_vlan
+
+
+def is_standard_acl(number: str) -> bool:
+    """ACL standardowe IOS (1-99, 1300-1999): tylko źródło, bez protokołu i celu."""
+    if not number.isdigit():
+        return False
+    n = int(number)
+    return 1 <= n <= 99 or 1300 <= n <= 1999
+
+
+def parse_acl(words: list[str]) -> ACLRule | None:
+    """
+    access-list <nr> <permit|deny> ...
+      standard:  <src> [<wildcard>] | host <src> | any [log]
+                 → protocol i dest puste (standardowe ACL ich nie mają)
+      extended:  <proto> <src> [<wildcard>] [<dest>] (pozycyjnie)
+    None → linia nie jest regułą permit/deny listy numerowanej (np. remark).
+    """
+    if len(words) < 4 or not words[1].isdigit() or words[2] not in ("permit", "deny"):
+        return None
+    if is_standard_acl(words[1]):
+        rest = words[3:]
+        if rest[0] == "host" and len(rest) > 1:
+            rest = rest[1:2]
+        # maska tylko jako adres z kropkami (nie "log" itp.)
+        wildcard = rest[1] if len(rest) > 1 and "." in rest[1] else ""
+        return ACLRule(words[1], words[2], "", rest[0], wildcard, "")
+    if len(words) < 5:
+        return None
+    return ACLRule(
+        acl=words[1],
+        action=words[2],
+        protocol=words[3],
+        src=words[4],
+        wildcard=words[5] if len(words) > 5 else "",
+        dest=words[6] if len(words) > 6 else "any",
+    )
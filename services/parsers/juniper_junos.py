@@ -0,0 +1,254 @@
+# services/parsers/juniper_junos.py
+import ipaddress
+import shlex
+from typing import Callable, Iterable
+
+from services.parsed_config import (
+    ACLRule,
+    InterfaceRecord,
+    OSPFNetwork,
+    ParsedConfig,
+    StaticRoute,
+    VLANRecord,
+)
+from services.parsers.tokenizer import Section, iter_lines
+
+FETCH_COMMAND = "show configuration | display set"
+# ostatni commit: "0   2021-03-01 10:11:12 UTC by admin via cli"
+CHANGE_PROBE = 'show system commit | match "^0 "'
+
+
+def change_token(output: str) -> str | None:
+    """Linia commitu 0 z wyniku CHANGE_PROBE; None → brak (sonda nieobsługiwana)."""
+    for line in output.splitlines():
+        if line.startswith("0 "):
+            return " ".join(line.split())
+    return None
+
+
+def sections(raw_running: str) -> Iterable[Section]:
+    """
+    Linie "set" jako sekcje dla ParsedConfig.tree: nagłówek to dwa pierwsze
+    słowa ścieżki ("interfaces ge-0/0/0", "vlans V10"), reszta linii to jego
+    dziecko. Linie z tym samym nagłówkiem trafiają do jednej sekcji.
+    """
+    out: dict[str, Section] = {}
+    for no, line in enumerate(raw_running.splitlines()):
+        w = _words(line.strip())
+        if len(w) < 3 or w[0] != "set":
+            continue
+        header = f"{w[1]} {w[2]}"
+        sec = out.get(header)
+        if sec is None:
+            sec = out[header] = Section(header, start=no)
+        if len(w) > 3:
+            sec.lines.append(" " + " ".join(w[3:]))
+    return out.values()
+
+
+def parse(raw_running: str) -> ParsedConfig:
+    """Parsuje wynik 'show configuration | display set'."""
+    return parse_lines(raw_running.splitlines(), raw_running)
+
+
+def parse_stream(
+    chunks: Iterable[str],
+    on_block: Callable[[str, ParsedConfig], None] | None = None,
+) -> ParsedConfig:
+    """
+    Parsuje config przychodzący kawałkami (linie "set" w miarę ich nadejścia).
+    Rekordy składane są dopiero po ostatniej linii, więc on_block dostaje
+    jeden, pełny config na końcu.
+    """
+    received: list[str] = []
+    conf = parse_lines(iter_lines(chunks, received), "")
+    conf.raw_running = "".join(received).strip()
+    if on_block is not None:
+        on_block("set", conf)
+    return conf
+
+
+def parse_lines(lines: Iterable[str], raw_running: str | None = None) -> ParsedConfig:
+    """
+    Strumieniowy parser Junos (format "set ..."): jeden przebieg po liniach,
+    linie mogą przychodzić z dowolnego iteratora (np. kawałkami z kanału SSH).
+    Wypełnia te same struktury ParsedConfig co parser Cisco; tam, gdzie Junos
+    opisuje coś inaczej, wartości trafiają do osobnych pól zamiast udawać IOS:
+    OSPF per interfejs → podsieć interfejsu + OSPFNetwork.interface (Junos nie
+    ma numeru procesu), RIP neighbor → routing.rip_interfaces, adresy w filtrach
+    → prefiksy w src/dest (bez wildcard).
+    """
+    cfg = ParsedConfig(vendor="JUNIPER")
+    seen: list[str] | None = [] if raw_running is None else None
+
+    ifaces: dict[str, dict] = {}  # nazwa → pola rekordu
+    if_members: dict[str, list[str]] = {}  # nazwa → vlan members (ID lub nazwy)
+    unit_addrs: dict[str, str] = {}  # "ge-0/0/0.0" → pierwszy adres inet (prefiks)
+    ospf_ifaces: list[tuple[str, str]] = []  # (obszar, interfejs)
+    vlan_ids: dict[str, str] = {}  # nazwa VLAN-u → ID
+    vlan_ports: dict[str, list[str]] = {}  # nazwa VLAN-u → porty (stara składnia)
+    terms: dict[tuple[str, str], dict] = {}  # (filtr, term) → pola reguły
+
+    for line in lines:
+        if seen is not None:
+            seen.append(line)
+        line = line.strip()
+        if not line.startswith("set "):
+            continue
+        w = _words(line)
+        n = len(w)
+
+        if n >= 4 and w[1] == "system" and w[2] == "host-name":
+            cfg.hostname = w[3]
+
+        elif n >= 4 and w[1] == "interfaces":
+            _interface(w, ifaces, if_members, unit_addrs)
+
+        elif n >= 5 and w[1] == "vlans":
+            if w[3] == "vlan-id":
+                vlan_ids[w[2]] = w[4]
+            elif w[3] == "interface":
+                vlan_ports.setdefault(w[2], []).append(w[4].split(".")[0])
+
+        elif n >= 7 and w[1:4] == ["routing-options", "static", "route"]:
+            if w[5] == "next-hop":
+                dest, mask = _split_prefix(w[4])
+                cfg.routing.static.append(StaticRoute(dest, mask, w[6]))
+
+        elif n >= 6 and w[1] == "protocols":
+            if w[2] == "rip" and w[3] == "group" and n >= 7 and w[5] == "neighbor":
+                if w[6] not in cfg.routing.rip_interfaces:
+                    cfg.routing.rip_interfaces.append(w[6])
+            elif w[2] == "ospf" and w[3] == "area" and w[5] == "interface" and n >= 7:
+                ospf_ifaces.append((w[4], w[6]))
+
+        elif n >= 8 and w[1] == "firewall":
+            _filter_term(w, terms)
+
+    # --- interfejsy ---
+    for name, f in ifaces.items():
+        cfg.interfaces.items[name] = InterfaceRecord(**f)
+
+    # --- OSPF: podsieć interfejsu (jak "network ... area" w IOS) ---
+    for area, name in ospf_ifaces:
+        unit = name if "." in name else f"{name}.0"
+        network, wildcard = (
+            _prefix_wildcard(unit_addrs[unit]) if unit in unit_addrs else ("", "")
+        )
+        cfg.routing.ospf.append(OSPFNetwork("", network, wildcard, area, name))
+
+    # --- VLAN-y (po ID, jak w Cisco) ---
+    id_by_name = dict(vlan_ids)
+    for vname, vid in vlan_ids.items():
+        cfg.vlans.items.setdefault(vid, VLANRecord(vname))
+    for name, members in if_members.items():
+        for m in members:
+            vid = m if m.isdigit() else id_by_name.get(m)
+            if vid in cfg.vlans.items:
+                cfg.vlans.items[vid].ports.append(name)
+    for vname, ports in vlan_ports.items():
+        vid = id_by_name.get(vname)
+        if vid in cfg.vlans.items:
+            cfg.vlans.items[vid].ports.extend(ports)
+
+    # --- filtry firewall jako reguły ACL ---
+    for (fname, _term), t in terms.items():
+        cfg.acls.rules.append(
+            ACLRule(
+                acl=fname,
+                action=t.get("action", "permit"),
+                protocol=t.get("protocol", "ip"),
+                src=t.get("src", "any"),
+                dest=t.get("dest", "any"),
+            )
+        )
+
+    cfg.raw_running = raw_running if raw_running is not None else "\n".join(seen)
+    return cfg
+
+
+# ==============================================================
+#                        POMOCNICZE
+# ==============================================================
+
+
+def _words(line: str) -> list[str]:
+    """
+    Słowa linii "set"; cudzysłowy (opisy ze spacjami) przez shlex.
+    Niedomknięty cudzysłów (ucięty opis) → zwykły split zamiast ValueError,
+    żeby jedna zepsuta linia nie przerywała parsowania całego configu.
+    """
+    if '"' not in line:
+        return line.split()
+    try:
+        return shlex.split(line)
+    except ValueError:
+        return line.split()
+
+
+def _interface(w: list[str], ifaces: dict, if_members: dict, unit_addrs: dict):
+    name = w[2]
+    f = ifaces.setdefault(
+        name, {"description": "", "ip": "", "mask": "", "mode": "", "status": "up"}
+    )
+    rest = w[3:]
+    if rest[0] == "description" and len(rest) > 1:
+        f["description"] = " ".join(rest[1:])
+    elif rest[0] == "disable":
+        f["status"] = "down"
+    elif rest[0] == "unit" and len(rest) >= 4 and rest[2] == "family":
+        fam = rest[3]
+        tail = rest[4:]
+        if fam == "inet" and len(tail) >= 2 and tail[0] == "address":
+            unit_addrs.setdefault(f"{name}.{rest[1]}", tail[1])
+            if not f["ip"]:
+                f["ip"], f["mask"] = _split_prefix(tail[1])
+            f["mode"] = f["mode"] or "routed"
+        elif fam == "ethernet-switching" and len(tail) >= 2:
+            if tail[0] in ("interface-mode", "port-mode"):
+                f["mode"] = tail[1] if tail[1] in ("access", "trunk") else f["mode"]
+            elif tail[0] == "vlan" and len(tail) >= 3 and tail[1] == "members":
+                if_members.setdefault(name, []).extend(tail[2:])
+                f["mode"] = f["mode"] or "access"
+
+
+def _filter_term(w: list[str], terms: dict):
+    # set firewall [family inet] filter F term T from|then ...
+    try:
+        i = w.index("filter")
+    except ValueError:
+        return
+    if len(w) < i + 6 or w[i + 2] != "term":
+        return
+    fname, term, kind, rest = w[i + 1], w[i + 3], w[i + 4], w[i + 5 :]
+    t = terms.setdefault((fname, term), {})
+    if kind == "from" and len(rest) >= 2:
+        if rest[0] == "source-address":
+            t["src"] = rest[1]
+        elif rest[0] == "destination-address":
+            t["dest"] = rest[1]
+        elif rest[0] == "protocol":
+            t["protocol"] = rest[1]
+    elif kind == "then" and rest:
+        if rest[0] == "accept":
+            t["action"] = "permit"
+        elif rest[0] in ("discard", "reject"):
+            t["action"] = "deny"
+
+
+def _split_prefix(prefix: str) -> tuple[str, str]:
+    """'10.0.0.1/24' → ('10.0.0.1', '255.255.255.0')."""
+    try:
+        iface = ipaddress.ip_interface(prefix)
+        return str(iface.ip), str(iface.netmask)
+    except ValueError:
+        return prefix, ""
+
+
+def _prefix_wildcard(prefix: str) -> tuple[str, str]:
+    """'10.0.0.1/8' → ('10.0.0.0', '0.255.255.255') — jak w "network" IOS."""
+    try:
+        net = ipaddress.ip_network(prefix, strict=False)
+        return str(net.network_address), str(net.hostmask)
+    except ValueError:
+        return prefix, ""
@@ -0,0 +1,71 @@
+# services/parsers/tokenizer.py
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+
+@dataclass
+class Section:
+    """
+    Jedna sekcja konfiguracji: linia bez wcięcia + linie wcięte pod nią.
+    Np. "interface Gi0/1" z liniami " description ...", " shutdown".
+    """
+
+    header: str
+    lines: list[str] = field(default_factory=list)  # surowe linie (z wcięciem)
+    start: int = 0  # numer linii nagłówka (od 0)
+
+    @property
+    def children(self) -> list[str]:
+        """Linie potomne bez wcięć i bez pustych."""
+        return [s for s in (line.strip() for line in self.lines) if s]
+
+
+def iter_sections(raw: str) -> Iterator[Section]:
+    """
+    Jednoprzebiegowy tokenizer running-configu.
+    Czyta tekst raz, linia po linii, i emituje sekcje w kolejności wystąpienia.
+    Separatory "!" kończą bieżącą sekcję i nie są emitowane.
+    """
+    return iter_section_lines(raw.splitlines())
+
+
+def iter_section_lines(lines: Iterable[str]) -> Iterator[Section]:
+    """Jak iter_sections(), ale dla dowolnego iteratora linii (np. iter_lines())."""
+    current: Section | None = None
+    for no, line in enumerate(lines):
+        if not line.strip():
+            continue
+        if line[0] in " \t":
+            # linia wcięta → dziecko bieżącej sekcji (jeśli jakaś jest otwarta)
+            if current is not None:
+                current.lines.append(line)
+            continue
+        if current is not None:
+            yield current
+            current = None
+        if line.startswith("!"):
+            continue
+        current = Section(header=line.rstrip(), start=no)
+    if current is not None:
+        yield current
+
+
+def iter_lines(chunks: Iterable[str], sink: list[str] | None = None) -> Iterator[str]:
+    """
+    Składa kawałki tekstu (np. kolejne odczyty z kanału SSH) w pełne linie.
+    Linia jest emitowana, gdy tylko dotrze jej koniec (CRLF → LF).
+    Jeśli podano sink, trafiają do niego surowe kawałki (do odtworzenia tekstu).
+    """
+    tail = ""
+    for chunk in chunks:
+        if sink is not None:
+            sink.append(chunk)
+        if "\n" not in chunk:
+            tail += chunk
+            continue
+        parts = (tail + chunk).split("\n")
+        tail = parts.pop()
+        for line in parts:
+            yield line.rstrip("\r")
+    if tail:
+        yield tail.rstrip("\r")
@@ -0,0 +1,184 @@
+# services/pending_saves.py
+"""
+Odroczony zapis konfiguracji (write memory) — jeden zapis NVRAM na serię zmian.
+
+Na starszych platformach "write memory" trwa 5–30 s, więc przy kilku małych
+zmianach z rzędu większość czasu zajmują powtarzane zapisy. W trybie odroczonym
+ConnectionManager.send_config tylko oznacza urządzenie jako "niezapisane",
+a zapis wykonuje się raz: na jawne commit() albo po idle sekundach bez
+kolejnych zmian na danym urządzeniu (wątek w tle).
+
+Nieudany automatyczny zapis (najczęściej: logowanie) nie wraca od razu do
+kolejki — następna próba po RETRY_BASE, 2×, 4×… sekundach (max RETRY_MAX),
+a po MAX_FAILURES porażkach automat odpuszcza ten host (wpis zostaje, GUI
+pokazuje go jako wstrzymany; zapis tylko ręczny). Inaczej niedostępne
+urządzenie byłoby logowane w pętli, aż AAA zablokuje konto.
+
+    saves = PendingSaves(save=cm.commit_host, idle=60)
+    saves.mark(device, commands=3)   # po send_config_set
+    saves.pending()                  # {host: PendingSave} — do pokazania w GUI
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable
+
+
+@dataclass
+class PendingSave:
+    device: Any  # Device — potrzebny do ponownego połączenia przed zapisem
+    since: float  # time.time() pierwszej niezapisanej zmiany
+    last: float  # time.monotonic() ostatniej zmiany (od niej liczy się idle)
+    sets: int = 0  # ile send_config_set czeka na zapis
+    commands: int = 0
+    failures: int = 0  # nieudane automatyczne zapisy pod rząd
+    retry_at: float = 0.0  # time.monotonic(), przed którym automat nie próbuje
+    stalled: bool = False  # automat się poddał — zapis tylko jawnym commit
+
+
+class PendingSaves:
+    """
+    Rejestr urządzeń z niezapisanymi zmianami + automatyczny zapis po bezczynności.
+    save(host) wykonuje zapis (ConnectionManager: take() pod blokadą hosta);
+    idle <= 0 → tylko jawne commit.
+    """
+
+    RETRY_BASE = 30.0  # s — odstęp po pierwszej nieudanej próbie, dalej ×2
+    RETRY_MAX = 900.0
+    MAX_FAILURES = 5
+
+    def __init__(
+        self, save: Callable[[str], Any], idle: float = 60.0, max_workers: int = 4
+    ):
+        self.save = save
+        self.idle = float(idle)
+        self._entries: dict[str, PendingSave] = {}
+        self._saving: set[str] = set()  # zapis w toku (z wątku w tle)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max(1, max_workers), "pending-save")
+        self._thread = threading.Thread(
+            target=self._run, name="pending-saves", daemon=True
+        )
+        self._thread.start()
+
+    def mark(self, device, commands: int = 0):
+        """Zestaw komend wysłany bez zapisu — (re)startuje odliczanie idle."""
+        with self._cond:
+            entry = self._entries.get(device.host)
+            if entry is None:
+                entry = PendingSave(device, time.time(), 0.0)
+                self._entries[device.host] = entry
+            entry.device = device
+            entry.last = time.monotonic()
+            entry.sets += 1
+            entry.commands += commands
+            # zmiana przeszła, więc urządzenie znów odpowiada
+            entry.failures, entry.retry_at, entry.stalled = 0, 0.0, False
+            self._cond.notify()
+
+    def take(self, host: str) -> PendingSave | None:
+        """Zdejmuje wpis przed zapisem (wołać pod blokadą hosta)."""
+        with self._cond:
+            return self._entries.pop(host, None)
+
+    def restore(self, entry: PendingSave):
+        """Zapis się nie udał — wpis wraca (łącznie ze zmianami wysłanymi w międzyczasie)."""
+        with self._cond:
+            newer = self._entries.get(entry.device.host)
+            if newer is not None:
+                entry = replace(
+                    entry,
+                    device=newer.device,
+                    sets=entry.sets + newer.sets,
+                    commands=entry.commands + newer.commands,
+                )
+            # kolejna automatyczna próba dopiero po następnym okresie idle
+            entry.last = time.monotonic()
+            self._entries[entry.device.host] = entry
+            self._cond.notify()
+
+    def pending(self) -> dict[str, PendingSave]:
+        with self._cond:
+            return {h: replace(e) for h, e in self._entries.items()}
+
+    def is_pending(self, host: str) -> bool:
+        with self._cond:
+            return host in self._entries
+
+    def set_idle(self, idle: float):
+        with self._cond:
+            self.idle = float(idle)
+            self._cond.notify()
+
+    def close(self):
+        """Zatrzymuje wątek; niezapisane wpisy zostają (do decyzji wołającego)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(2)
+        self._pool.shutdown(wait=True)
+
+    # --- wątek w tle ---
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                timeout, due = self._due()
+                for host in due:
+                    self._saving.add(host)
+                if not due:
+                    self._cond.wait(timeout)
+                    continue
+            for host in due:
+                self._pool.submit(self._auto_save, host)
+
+    def _due(self) -> tuple[float | None, list[str]]:
+        """(ile czekać na najbliższy termin, hosty do zapisu teraz)."""
+        if self.idle <= 0:
+            return None, []
+        now = time.monotonic()
+        due, wait = [], None
+        for host, entry in self._entries.items():
+            if host in self._saving or entry.stalled:
+                continue
+            left = max(entry.last + self.idle, entry.retry_at) - now
+            if left <= 0:
+                due.append(host)
+            else:
+                wait = left if wait is None else min(wait, left)
+        return wait, due
+
+    def _auto_save(self, host: str):
+        try:
+            self.save(host)
+        except Exception as e:
+            logging.error(f"[SAVE] {host}: automatyczny zapis nie powiódł się: {e}")
+            self._failed(host)
+        finally:
+            with self._cond:
+                self._saving.discard(host)
+                self._cond.notify()
+
+    def _failed(self, host: str):
+        """Odsuwa kolejną automatyczną próbę (backoff) albo wstrzymuje automat."""
+        with self._cond:
+            entry = self._entries.get(host)
+            if entry is None:
+                return
+            entry.failures += 1
+            if entry.failures >= self.MAX_FAILURES:
+                entry.stalled = True
+                logging.error(
+                    f"[SAVE] {host}: {entry.failures} nieudanych prób — "
+                    f"automatyczny zapis wstrzymany, zapisz ręcznie"
+                )
+                return
+            delay = min(self.RETRY_BASE * 2 ** (entry.failures - 1), self.RETRY_MAX)
+            entry.retry_at = time.monotonic() + delay
+            logging.warning(f"[SAVE] {host}: kolejna próba za {delay:.0f} s")
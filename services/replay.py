@@ -0,0 +1,228 @@
+# services/replay.py
+"""
+Odtwarzanie sesji z nagranych logów ({host}_session.txt + archiwum .gz)
+zamiast prawdziwego połączenia — do profilowania i testów regresji
+sync → parse → zakładki bez sprzętu, deterministycznie.
+
+    library = ReplayLibrary("./logs", timing="recorded")
+    cm = ConnectionManager(log_path="/tmp/replay", replay=library)
+
+Każde polecenie exec z logu jest nagraniem; kolejne wywołania tego samego
+polecenia dostają kolejne nagrane wyniki (po wyczerpaniu — ostatni), więc
+powtórzone synchronizacje widzą zmiany w tej kolejności, w jakiej zaszły.
+
+Tryby czasu:
+    "fast"     — zero oczekiwania (sam koszt CPU: parsowanie, delty, GUI),
+    "recorded" — opóźnienie i przepustowość z profilu połączenia nagranego
+                 urządzenia (connection_profiles.json obok logów); logi Netmiko
+                 nie mają znaczników czasu, więc czas jest odtwarzany z modelu
+                 latency + bajty / przepustowość, zawsze tak samo.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from services import session_logs
+from services.connection_profiles import ProfileStore
+
+INVALID = "% Invalid input detected at '^' marker."
+
+_PROMPT_ONLY = re.compile(r"^([^\s#>()]+)(?:\([^)]*\))?[#>]\s*$")
+
+
+def parse_session_log(text: str) -> tuple[str, dict[str, list[str]]]:
+    """
+    Dzieli log sesji na (prompt bazowy, {polecenie: [wyniki w kolejności]}).
+    Prompt bazowy to najczęstsza linia składająca się z samego promptu.
+    Zapisywane są tylko polecenia trybu exec (nie linie configure terminal).
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    names = Counter(m.group(1) for x in lines if (m := _PROMPT_ONLY.match(x)))
+    if not names:
+        return "", {}
+    base = names.most_common(1)[0][0]
+    prompt = re.compile(rf"^{re.escape(base)}(\([^)]*\))?[#>](.*)$")
+
+    recorded: dict[str, list[str]] = {}
+    command, config, output = None, False, []
+    for line in lines:
+        m = prompt.match(line)
+        if m is None:
+            if command is not None:
+                output.append(line)
+            continue
+        if command and not config:
+            recorded.setdefault(command, []).append("\n".join(output).strip("\n"))
+        command, config, output = m.group(2).strip(), bool(m.group(1)), []
+    # ostatnie polecenie bez końcowego promptu = nagranie urwane → pomijane
+    return base, recorded
+
+
+class ReplayLibrary:
+    """Nagrania wszystkich urządzeń z folderu logów (ładowane leniwie)."""
+
+    def __init__(self, folder: str, timing: str = "fast", speed: float = 1.0):
+        if timing not in ("fast", "recorded"):
+            raise ValueError(f"Nieznany tryb czasu: {timing}")
+        self.folder = folder
+        self.timing = timing
+        self.speed = max(1e-6, float(speed))
+        self._profiles = ProfileStore(
+            os.path.join(folder, "connection_profiles.json")
+            if timing == "recorded"
+            else None
+        )
+        self._lock = threading.Lock()
+        self._hosts: dict[str, tuple[str, dict[str, list[str]]]] = {}
+
+    def hosts(self) -> list[str]:
+        return session_logs.hosts(self.folder)
+
+    def add_log(self, host: str, text: str):
+        """Dodaje nagranie z tekstu (np. plik testowy) — dopisuje do istniejących."""
+        base, recorded = parse_session_log(text)
+        with self._lock:
+            old_base, old = self._hosts.get(host, ("", {}))
+            for command, outputs in recorded.items():
+                old.setdefault(command, []).extend(outputs)
+            self._hosts[host] = (base or old_base, old)
+
+    def recording(self, host: str) -> tuple[str, dict[str, list[str]]]:
+        with self._lock:
+            loaded = self._hosts.get(host)
+        if loaded is None:
+            for log in session_logs.history(self.folder, host):
+                self.add_log(host, session_logs.read(log))
+            with self._lock:
+                loaded = self._hosts.setdefault(host, ("", {}))
+        return loaded
+
+    def connect(self, host: str) -> "ReplayConnection":
+        base, recorded = self.recording(host)
+        if not base:
+            raise ValueError(f"Brak nagranej sesji dla {host} w {self.folder}")
+        latency, throughput = 0.0, 0.0
+        if self.timing == "recorded":
+            profile = next(
+                (
+                    p
+                    for k, p in self._profiles.all().items()
+                    if k.startswith(host + "/")
+                ),
+                None,
+            )
+            if profile is not None:
+                latency = profile.latency_ms / 1000 / self.speed
+                throughput = profile.throughput_bps * self.speed
+        conn = ReplayConnection(host, base, recorded, latency, throughput)
+        if latency:
+            time.sleep(3 * latency)  # logowanie: kilka wymian z urządzeniem
+        return conn
+
+
+class ReplayConnection:
+    """
+    Atrapa sesji Netmiko z interfejsem używanym przez ConnectionManager:
+    send_command / send_config_set / save_config oraz kanał (write_channel,
+    read_channel) dla stream_command i send_commands.
+    """
+
+    CHUNK = 4096
+
+    def __init__(
+        self,
+        host: str,
+        base_prompt: str,
+        recorded: dict[str, list[str]],
+        latency: float = 0.0,
+        throughput: float = 0.0,
+    ):
+        self.host = host
+        self.base_prompt = base_prompt
+        self.latency = latency
+        self.throughput = throughput
+        self._queues = {cmd: deque(outs) for cmd, outs in recorded.items()}
+        self._pending: deque[tuple[float, str]] = deque()  # (od kiedy, dane)
+        self._closed = False
+
+    # --- odpowiedzi ---
+
+    def answer(self, command: str) -> str:
+        command = command.strip()
+        queue = self._queues.get(command)
+        if not queue:
+            logging.warning(f"[REPLAY] {self.host}: brak nagrania '{command}'")
+            return INVALID
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def _delay(self, nbytes: int) -> float:
+        transfer = nbytes / self.throughput if self.throughput else 0.0
+        return self.latency + transfer
+
+    # --- API Netmiko ---
+
+    def find_prompt(self) -> str:
+        return f"{self.base_prompt}#"
+
+    def send_command(self, command: str, strip_prompt: bool = True, **kwargs) -> str:
+        output = self.answer(command)
+        if self.latency or self.throughput:
+            time.sleep(self._delay(len(output)))
+        return output if strip_prompt else f"{output}\n{self.find_prompt()}"
+
+    def send_config_set(self, commands, **kwargs) -> str:
+        if isinstance(commands, str):
+            commands = [commands]
+        lines = [f"{self.find_prompt()}configure terminal"]
+        lines += [f"{self.base_prompt}(config)#{c}" for c in commands]
+        lines += [f"{self.base_prompt}(config)#end", self.find_prompt()]
+        if self.latency:
+            time.sleep(self.latency * (len(commands) + 2))
+        return "\n".join(lines)
+
+    def save_config(self, *args, **kwargs) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return "Building configuration...\n[OK]"
+
+    def normalize_cmd(self, command: str) -> str:
+        return command.rstrip() + "\n"
+
+    def clear_buffer(self, *args, **kwargs) -> str:
+        self._pending.clear()
+        return ""
+
+    def write_channel(self, data: str):
+        """Polecenia oddzielone \\n → odpowiedzi jak z urządzenia (echo, wynik, prompt)."""
+        at = time.monotonic()
+        commands = data.split("\n")[:-1] if data.endswith("\n") else [data]
+        for i, command in enumerate(commands):
+            echo = command if i == 0 else self.find_prompt() + command
+            text = f"{echo}\n{self.answer(command)}\n"
+            if i == len(commands) - 1:
+                text += self.find_prompt()
+            at += self.latency
+            # duży wynik przychodzi kawałkami, w tempie nagranej przepustowości
+            for j in range(0, len(text), self.CHUNK):
+                chunk = text[j : j + self.CHUNK]
+                if self.throughput:
+                    at += len(chunk) / self.throughput
+                self._pending.append((at, chunk))
+
+    def read_channel(self) -> str:
+        now = time.monotonic()
+        out = []
+        while self._pending and self._pending[0][0] <= now:
+            out.append(self._pending.popleft()[1])
+        return "".join(out)
+
+    def is_alive(self) -> bool:
+        return not self._closed
+
+    def disconnect(self):
+        self._closed = True
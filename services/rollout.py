@@ -0,0 +1,213 @@
+# services/rollout.py
+"""
+Etapowe wdrożenie konfiguracji na flotę urządzeń.
+
+Urządzenia dostają swoje komendy falami: najpierw kanarek (canary urządzeń),
+potem coraz większe partie (× factor), każda fala równolegle przez
+ConnectionManager.run_many (najwyżej max_workers naraz). Po wysłaniu komend
+na każdym urządzeniu wykonywany jest post-check; błąd komendy, błąd post-checku
+albo brak oczekiwanego wzorca = porażka urządzenia. Gdy odsetek porażek
+przekroczy max_failure_rate, wdrożenie zatrzymuje się samo — urządzenia,
+które jeszcze nie wystartowały, są pomijane.
+
+    engine = RolloutEngine(cm, canary=1, factor=2, post_check="show ip int brief")
+    report = engine.run(targets, on_event=print)
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+
+from devices.Device import Device
+
+# odpowiedzi IOS na odrzuconą linię / polecenie
+ERROR_MARKERS = (
+    "% Invalid input",
+    "% Incomplete command",
+    "% Ambiguous command",
+    "% Unknown command",
+    "% Error",
+)
+
+
+class RolloutCheckFailed(Exception):
+    """Urządzenie odrzuciło komendę albo nie przeszło post-checku."""
+
+
+@dataclass
+class RolloutTarget:
+    device: Device
+    commands: list[str]
+
+
+@dataclass
+class RolloutResult:
+    device: Device
+    wave: int
+    status: str  # ok / failed / skipped
+    error: str | None = None
+    output: str = ""
+    seconds: float = 0.0
+
+
+@dataclass
+class RolloutEvent:
+    kind: str  # wave / device / halt
+    wave: int
+    result: RolloutResult | None = None
+    message: str = ""
+
+
+@dataclass
+class RolloutReport:
+    total: int = 0
+    waves: int = 0
+    results: list[RolloutResult] = field(default_factory=list)
+    halted: str | None = None  # powód zatrzymania (None → przeszło do końca)
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def failure_rate(self) -> float:
+        done = self.count("ok") + self.count("failed")
+        return self.count("failed") / done if done else 0.0
+
+
+def plan_waves(
+    count: int, canary: int = 1, factor: float = 2.0, max_wave: int = 0
+) -> list[int]:
+    """Rozmiary kolejnych fal, np. 100 urządzeń → [1, 2, 4, 8, 16, 32, 37]."""
+    sizes, size = [], max(1, int(canary))
+    left = count
+    while left > 0:
+        n = min(size, left, max_wave or left)
+        sizes.append(n)
+        left -= n
+        size = max(size + 1, math.ceil(size * factor))
+    return sizes
+
+
+class RolloutEngine:
+    def __init__(
+        self,
+        cm,
+        canary: int = 1,
+        factor: float = 2.0,
+        max_wave: int = 0,
+        max_workers: int | None = None,
+        post_check: str = "",
+        expect: str = "",
+        max_failure_rate: float = 0.1,
+        min_sample: int | None = None,
+    ):
+        self.cm = cm
+        self.canary = max(1, int(canary))
+        self.factor = max(1.0, float(factor))
+        self.max_wave = int(max_wave)
+        self.max_workers = max_workers
+        self.post_check = post_check.strip()
+        self.expect = re.compile(expect) if expect else None
+        self.max_failure_rate = float(max_failure_rate)
+        # decyzja o zatrzymaniu dopiero po tylu wynikach (domyślnie: kanarek)
+        self.min_sample = self.canary if min_sample is None else max(1, min_sample)
+
+    def waves(self, targets: list[RolloutTarget]) -> list[list[RolloutTarget]]:
+        out, pos = [], 0
+        for size in plan_waves(len(targets), self.canary, self.factor, self.max_wave):
+            out.append(targets[pos : pos + size])
+            pos += size
+        return out
+
+    def run(
+        self,
+        targets: list[RolloutTarget],
+        on_event: Callable[[RolloutEvent], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> RolloutReport:
+        """
+        Wdraża falami; on_event dostaje zdarzenia z wątku wołającego.
+        Ustawienie stop z zewnątrz zatrzymuje wdrożenie jak przekroczony próg.
+        """
+        emit = on_event or (lambda event: None)
+        stop = stop or threading.Event()
+        waves = self.waves(targets)
+        report = RolloutReport(total=len(targets), waves=len(waves))
+
+        for number, batch in enumerate(waves, 1):
+            if stop.is_set():
+                report.halted = report.halted or "Zatrzymano ręcznie"
+                self._skip(report, waves[number - 1 :], number, emit)
+                break
+            emit(
+                RolloutEvent(
+                    "wave", number, message=f"Fala {number}/{len(waves)}: {len(batch)}"
+                )
+            )
+            commands = {t.device.host: t.commands for t in batch}
+            started: set[str] = set()
+
+            def job(device: Device) -> str:
+                # stop sprawdzany tutaj, a nie w run_many: tamten przestaje
+                # zwracać wyniki, a urządzenia w toku muszą trafić do raportu
+                if stop.is_set():
+                    return ""
+                started.add(device.host)
+                return self._apply(device, commands[device.host])
+
+            for res in self.cm.run_many(
+                [t.device for t in batch], job, max_workers=self.max_workers
+            ):
+                if res.device.host not in started:
+                    status = "skipped"
+                else:
+                    status = "ok" if res.ok else "failed"
+                result = RolloutResult(
+                    res.device, number, status, res.error, res.output, res.seconds
+                )
+                report.results.append(result)
+                emit(RolloutEvent("device", number, result))
+
+                if not stop.is_set() and self._breached(report):
+                    report.halted = (
+                        f"Odsetek porażek {report.failure_rate:.0%} > "
+                        f"{self.max_failure_rate:.0%}"
+                    )
+                    stop.set()
+                    emit(RolloutEvent("halt", number, message=report.halted))
+        if stop.is_set() and not report.halted and report.count("skipped"):
+            report.halted = "Zatrzymano ręcznie"  # w trakcie ostatniej fali
+        return report
+
+    def _apply(self, device: Device, commands: list[str]) -> str:
+        output = self.cm.send_config(device, commands)
+        _raise_on_error(output, "komenda odrzucona")
+        if not self.post_check:
+            return output
+        check = self.cm.send_command(device, self.post_check)
+        _raise_on_error(check, "post-check")
+        if self.expect and not self.expect.search(check):
+            raise RolloutCheckFailed(
+                f"post-check: brak '{self.expect.pattern}' w wyniku {self.post_check}"
+            )
+        return f"{output}\n{check}"
+
+    def _breached(self, report: RolloutReport) -> bool:
+        done = report.count("ok") + report.count("failed")
+        return done >= self.min_sample and report.failure_rate > self.max_failure_rate
+
+    @staticmethod
+    def _skip(report: RolloutReport, waves, first: int, emit):
+        for number, batch in enumerate(waves, first):
+            for target in batch:
+                result = RolloutResult(target.device, number, "skipped")
+                report.results.append(result)
+                emit(RolloutEvent("device", number, result))
+
+
+def _raise_on_error(output: str, what: str):
+    for line in output.splitlines():
+        if line.lstrip().startswith(ERROR_MARKERS):
+            raise RolloutCheckFailed(f"{what}: {line.strip()}")
@@ -0,0 +1,302 @@
+# services/session_logs.py
+"""
+Logi sesji Netmiko ({host}_session.txt) zapisywane w tle.
+Netmiko dostaje strumień (SessionLogStream), który tylko wrzuca dane do kolejki —
+zapis na dysk, rotacja (rozmiar / wiek) i kompresja gzip odbywają się w jednym
+wątku zapisującym, poza ścieżką poleceń.
+
+Układ plików w folderze logów:
+    {host}_session.txt                      — bieżący log urządzenia
+    session_archive/{host}/{czas}.txt.gz    — zrotowane, skompresowane
+    session_index.json                      — indeks: host → pliki z zakresem czasu
+Historia jednego urządzenia: SessionLogWriter.history(host) (albo history(folder,
+host) bez uruchamiania wątku zapisu) — bez skanowania logów.
+"""
+
+import atexit
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+_STOP = object()
+INDEX_FILE = "session_index.json"
+SUFFIX = "_session.txt"
+
+
+@dataclass
+class SessionLogFile:
+    path: str
+    start: float  # time.time() pierwszego wpisu
+    end: float = 0.0  # 0 → plik bieżący (wciąż dopisywany)
+    bytes: int = 0  # rozmiar przed kompresją
+
+    @property
+    def compressed(self) -> bool:
+        return self.path.endswith(".gz")
+
+
+class SessionLogStream(io.BufferedIOBase):
+    """Plik-atrapa dla Netmiko (session_log=...): write() tylko kolejkuje dane."""
+
+    def __init__(self, writer: "SessionLogWriter", host: str):
+        super().__init__()
+        self.writer = writer
+        self.host = host
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to closed session log")
+        self.writer.write(self.host, bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass  # Netmiko woła flush() po każdym zapisie — dysk obsługuje wątek
+
+
+class SessionLogWriter:
+    """
+    max_bytes — rotacja po przekroczeniu rozmiaru bieżącego pliku,
+    max_age   — rotacja pliku starszego niż tyle sekund (0 → bez limitu),
+    keep      — ile zrotowanych plików trzymać na urządzenie,
+    max_queue — górna granica kolejki (pełna → write() czeka, pamięć nie rośnie).
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_age: float = 24 * 3600,
+        keep: int = 10,
+        max_queue: int = 10000,
+    ):
+        self.folder = folder
+        self.max_bytes = max(1024, int(max_bytes))
+        self.max_age = max(0.0, float(max_age))
+        self.keep = max(1, int(keep))
+
+        try:
+            os.makedirs(folder, exist_ok=True)
+            open(os.path.join(folder, ".session_write_test"), "a").close()
+            os.remove(os.path.join(folder, ".session_write_test"))
+        except OSError:
+            tmp = os.path.join(tempfile.gettempdir(), "pynetwizard_sessions")
+            print(f"[WARN] Nie można pisać do {folder}, logi sesji w {tmp}")
+            os.makedirs(tmp, exist_ok=True)
+            self.folder = tmp
+        self.index_path = os.path.join(self.folder, INDEX_FILE)
+
+        self._lock = threading.Lock()  # indeks
+        self._index: dict[str, dict] = self._load_index()
+        self._dirty = False  # indeks do zapisania po bieżącej partii
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._thread = threading.Thread(
+            target=self._run, name="session-log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ==============================================================
+    #                        GŁÓWNE API
+    # ==============================================================
+
+    def stream(self, host: str) -> SessionLogStream:
+        """Obiekt do przekazania Netmiko jako session_log."""
+        return SessionLogStream(self, host)
+
+    def write(self, host: str, data: bytes):
+        if data and self._thread.is_alive():
+            self._queue.put((host, data))
+
+    def flush(self, timeout: float | None = None):
+        """Czeka, aż wszystko z kolejki trafi na dysk."""
+        done = threading.Event()
+        if self._thread.is_alive():
+            self._queue.put((None, done))
+            done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        if self._thread.is_alive():
+            self._queue.put((None, _STOP))
+            self._thread.join(timeout)
+
+    def history(self, host: str) -> list[SessionLogFile]:
+        """Pliki logu urządzenia od najstarszego; ostatni to plik bieżący."""
+        with self._lock:
+            return _history(self.folder, host, self._index.get(host, {}))
+
+    @staticmethod
+    def read(log: SessionLogFile) -> str:
+        return read(log)
+
+    # ==============================================================
+    #                        WĄTEK ZAPISU
+    # ==============================================================
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # wszystko, co zebrało się w czasie poprzedniego zapisu → jeden zapis/host
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            pending: dict[str, list[bytes]] = {}
+            waiters = []
+            for host, data in batch:
+                if host is None:
+                    stop = stop or data is _STOP
+                    if isinstance(data, threading.Event):
+                        waiters.append(data)
+                    continue
+                pending.setdefault(host, []).append(data)
+
+            for host, chunks in pending.items():
+                try:
+                    self._append(host, b"".join(chunks))
+                except Exception as e:
+                    logging.warning(f"[SESSION LOG] {host}: {e}")
+            if self._dirty:
+                self._save_index()
+            for event in waiters:
+                event.set()
+
+    def _append(self, host: str, data: bytes):
+        path = self._current_path(host)
+        with self._lock:
+            entry = self._index.setdefault(host, {"archived": []})
+            if "start" not in entry:
+                entry["start"] = time.time()
+                self._dirty = True
+            start = entry["start"]
+        with open(path, "ab") as f:
+            f.write(data)
+            size = f.tell()
+        too_old = self.max_age and time.time() - start >= self.max_age
+        if size >= self.max_bytes or too_old:
+            self._rotate(host, path, start, size)
+
+    def _rotate(self, host: str, path: str, start: float, size: int):
+        now = time.time()
+        folder = os.path.join(self.folder, "session_archive", host)
+        os.makedirs(folder, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        target = os.path.join(folder, f"{stamp}.txt.gz")
+        n = 1
+        while os.path.exists(target):
+            n += 1
+            target = os.path.join(folder, f"{stamp}-{n}.txt.gz")
+
+        # rename najpierw — kolejne zapisy idą już do nowego pliku
+        rotating = path + ".rotating"
+        os.replace(path, rotating)
+        with open(rotating, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(rotating)
+
+        with self._lock:
+            entry = self._index[host]
+            archived = entry["archived"]
+            archived.append(asdict(SessionLogFile(target, start, now, size)))
+            for old in archived[: -self.keep]:
+                try:
+                    os.remove(old["path"])
+                except OSError:
+                    pass
+            entry["archived"] = archived[-self.keep :]
+            entry.pop("start", None)
+            self._dirty = True
+
+    # ==============================================================
+    #                        POMOCNICZE
+    # ==============================================================
+
+    def _current_path(self, host: str) -> str:
+        return os.path.join(self.folder, f"{host}{SUFFIX}")
+
+    def _load_index(self) -> dict:
+        return _load_index(self.index_path)
+
+    def _save_index(self):
+        with self._lock:
+            data = json.dumps(self._index, indent=4)
+            self._dirty = False
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp, self.index_path)
+        except Exception as e:
+            logging.warning(f"[SESSION LOG] Nie zapisano indeksu: {e}")
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+
+
+# ==============================================================
+#              ODCZYT (bez wątku zapisu, np. replay)
+# ==============================================================
+
+
+def history(folder: str, host: str) -> list[SessionLogFile]:
+    """Historia logów urządzenia z folderu (indeks z dysku)."""
+    index = _load_index(os.path.join(folder, INDEX_FILE))
+    return _history(folder, host, index.get(host, {}))
+
+
+def hosts(folder: str) -> list[str]:
+    """Urządzenia, które mają jakikolwiek log sesji w folderze."""
+    found = set(_load_index(os.path.join(folder, INDEX_FILE)))
+    if os.path.isdir(folder):
+        found.update(
+            n[: -len(SUFFIX)] for n in os.listdir(folder) if n.endswith(SUFFIX)
+        )
+    return sorted(found)
+
+
+def read(log: SessionLogFile) -> str:
+    opener = gzip.open if log.compressed else open
+    with opener(log.path, "rt", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _history(folder: str, host: str, entry: dict) -> list[SessionLogFile]:
+    files = [
+        SessionLogFile(**f)
+        for f in entry.get("archived", [])
+        if os.path.exists(f["path"])
+    ]
+    current = os.path.join(folder, f"{host}{SUFFIX}")
+    if os.path.exists(current):
+        files.append(
+            SessionLogFile(
+                current,
+                entry.get("start") or os.path.getmtime(current),
+                bytes=os.path.getsize(current),
+            )
+        )
+    return files
+
+
+def _load_index(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"[SESSION LOG] Uszkodzony indeks {path}: {e}")
+        return {}
@@ -0,0 +1,176 @@
+# services/session_monitor.py
+"""
+Sprawdzanie żywotności otwartych sesji w tle.
+Wątek monitora co jakiś czas sonduje ConnectionManager.sessions
+(ConnectionManager.probe — bez pisania w kanał), trzyma ostatni stan
+każdej sesji i powiadamia subskrybentów tylko o zmianach.
+GUI czyta stan z cache zamiast dotykać kanału SSH.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable
+
+
+@dataclass
+class SessionState:
+    host: str
+    alive: bool
+    checked_at: float = 0.0  # time.time() ostatniej próby
+    changed_at: float = 0.0  # time.time() ostatniej zmiany alive
+    failures: int = 0  # kolejne nieudane próby
+    next_check: float = 0.0  # time.monotonic() następnej próby
+
+
+class SessionMonitor:
+    """
+    interval      — co ile sekund sondować zdrową sesję,
+    max_interval  — górna granica odstępu przy ponawianiu (backoff),
+    backoff       — mnożnik odstępu po każdej nieudanej próbie,
+    fail_threshold — ile nieudanych prób z rzędu oznacza martwą sesję
+                     (wtedy jest zamykana w ConnectionManagerze).
+    """
+
+    def __init__(
+        self,
+        connection_manager,
+        interval: float = 5.0,
+        max_interval: float = 60.0,
+        backoff: float = 2.0,
+        fail_threshold: int = 2,
+    ):
+        self.cm = connection_manager
+        self.interval = max(0.5, float(interval))
+        self.max_interval = max(self.interval, float(max_interval))
+        self.backoff = max(1.0, float(backoff))
+        self.fail_threshold = max(1, int(fail_threshold))
+
+        self._states: dict[str, SessionState] = {}
+        self._lock = threading.Lock()
+        self._subscribers: list[Callable[[SessionState], None]] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ==============================================================
+    #                        GŁÓWNE API
+    # ==============================================================
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="session-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Wymusza natychmiastowy przebieg (np. po nowym połączeniu)."""
+        self._wake.set()
+
+    def subscribe(self, callback: Callable[[SessionState], None]):
+        """callback(stan) przy każdej zmianie — wołany z wątku monitora."""
+        self._subscribers.append(callback)
+
+    def status(self, host: str) -> SessionState | None:
+        """Ostatni znany stan sesji (kopia) albo None, jeśli nigdy jej nie było."""
+        with self._lock:
+            st = self._states.get(host)
+            return replace(st) if st else None
+
+    def snapshot(self) -> dict[str, SessionState]:
+        with self._lock:
+            return {host: replace(st) for host, st in self._states.items()}
+
+    def check_now(self):
+        """Jeden przebieg po wszystkich sesjach, których termin minął."""
+        now = time.monotonic()
+        hosts = set(self.cm.sessions)
+        with self._lock:
+            states = dict(self._states)
+
+        for host, st in states.items():
+            # sesja zamknięta poza monitorem (disconnect) → martwa od razu
+            if host not in hosts and st.alive:
+                self._update(host, False, now, closed=True)
+
+        for host in hosts:
+            st = states.get(host)
+            # nowa, ponownie otwarta albo z minionym terminem
+            if st is None or not st.alive or st.next_check <= now:
+                self._update(host, self.cm.probe(host), now)
+
+    # ==============================================================
+    #                        POMOCNICZE
+    # ==============================================================
+
+    def _run(self):
+        logging.info("[MONITOR] Session monitor started")
+        while not self._stop.is_set():
+            try:
+                self.check_now()
+            except Exception as e:
+                logging.exception(f"[MONITOR] {e}")
+            self._wake.wait(self._tick())
+            self._wake.clear()
+        logging.info("[MONITOR] Session monitor stopped")
+
+    def _tick(self) -> float:
+        """Czas do najbliższej zaplanowanej próby (max 1 s — nowe sesje)."""
+        now = time.monotonic()
+        with self._lock:
+            pending = [st.next_check for st in self._states.values() if st.alive]
+        soonest = min(pending, default=now + 1.0)
+        return min(1.0, max(0.05, soonest - now))
+
+    def _update(self, host: str, ok: bool, now: float, closed: bool = False):
+        wall = time.time()
+        with self._lock:
+            st = self._states.get(host)
+            was_alive = st.alive if st else None
+            if st is None:
+                st = self._states[host] = SessionState(host, ok, changed_at=wall)
+            st.checked_at = wall
+
+            if closed:
+                st.failures = 0
+                alive = False
+            elif ok:
+                st.failures = 0
+                st.next_check = now + self.interval
+                alive = True
+            else:
+                st.failures += 1
+                delay = self.interval * self.backoff**st.failures
+                st.next_check = now + min(delay, self.max_interval)
+                # pojedyncza wpadka nie zamyka sesji, która dotąd działała
+                alive = was_alive is True and st.failures < self.fail_threshold
+
+            st.alive = alive
+            changed = was_alive is None or was_alive != alive
+            if changed:
+                st.changed_at = wall
+            event = replace(st)
+
+        if not alive and not closed and host in self.cm.sessions:
+            logging.warning(f"[MONITOR] {host}: sesja martwa, zamykam")
+            self.cm.close_session(host)
+        if changed:
+            self._publish(event)
+
+    def _publish(self, state: SessionState):
+        for cb in list(self._subscribers):
+            try:
+                cb(state)
+            except Exception as e:
+                logging.warning(f"[MONITOR] subscriber failed: {e}")
@@ -0,0 +1,139 @@
+# services/timing_tuner.py
+"""
+Automatyczne strojenie czasów Netmiko per urządzenie.
+Każde polecenie to próbka: małe wyniki mierzą opóźnienie (RTT + prompt),
+duże — przepustowość. Z nich liczone są read_timeout, global_delay_factor
+i timeout połączenia, zawsze w bezpiecznych granicach poniżej.
+Po timeoucie podwojony read_timeout jest dolną granicą przez FLOOR_WINDOW
+kolejnych udanych poleceń, potem maleje o FLOOR_DECAY na polecenie — jedna
+szybka odpowiedź nie cofa zapasu, który dopiero co okazał się potrzebny.
+Wartości żyją w ConnectionProfile (services/connection_profiles.py).
+"""
+
+from services.connection_profiles import ConnectionProfile, ProfileStore
+
+READ_TIMEOUT_MIN, READ_TIMEOUT_MAX = 10.0, 300.0
+DELAY_FACTOR_MIN, DELAY_FACTOR_MAX = 0.5, 4.0
+CONN_TIMEOUT_MAX = 120.0
+
+ALPHA = 0.3  # waga nowej próbki w średniej wykładniczej
+SMALL_OUTPUT = 2048  # bajty — poniżej: próbka opóźnienia, powyżej: przepustowości
+REF_LATENCY_MS = 100.0  # opóźnienie, dla którego delay_factor = 1
+MARGIN = 3.0  # zapas read_timeout względem przewidywanego czasu
+FLOOR_WINDOW = 20  # udane polecenia z pełnym zapasem po timeoucie
+FLOOR_DECAY = 0.9  # potem zapas maleje tak na każde polecenie
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def _ewma(old: float, sample: float) -> float:
+    return sample if old <= 0 else (1 - ALPHA) * old + ALPHA * sample
+
+
+class TimingTuner:
+    """
+    observe() po każdym poleceniu, timed_out() po przekroczeniu czasu.
+    Do czasu zebrania min_samples próbek Netmiko dostaje wartości domyślne.
+    """
+
+    def __init__(self, profiles: ProfileStore, enabled: bool = True, min_samples=3):
+        self.profiles = profiles
+        self.enabled = enabled
+        self.min_samples = max(1, int(min_samples))
+
+    def observe(self, key: str, seconds: float, nbytes: int):
+        profile = self.profiles.get(key)
+        if not self.enabled or profile is None or seconds <= 0:
+            return
+        m = {
+            "latency_ms": profile.latency_ms,
+            "throughput_bps": profile.throughput_bps,
+            "max_bytes": max(profile.max_bytes, nbytes),
+            "samples": profile.samples + 1,
+            "timeout_floor": profile.timeout_floor,
+            "floor_left": max(profile.floor_left - 1, 0),
+        }
+        if not profile.floor_left and profile.timeout_floor:
+            decayed = profile.timeout_floor * FLOOR_DECAY
+            m["timeout_floor"] = decayed if decayed > READ_TIMEOUT_MIN else 0.0
+        if nbytes < SMALL_OUTPUT:
+            m["latency_ms"] = _ewma(profile.latency_ms, seconds * 1000)
+        else:
+            transfer = max(seconds - profile.latency_ms / 1000, 1e-3)
+            m["throughput_bps"] = _ewma(profile.throughput_bps, nbytes / transfer)
+        tuned = self.tune(
+            m["latency_ms"],
+            m["throughput_bps"],
+            m["max_bytes"],
+            profile.timeouts,
+            m["timeout_floor"],
+        )
+        self.profiles.update(key, persist=False, **m, **tuned)
+
+    def timed_out(self, key: str):
+        """Przekroczony czas → od razu podwójny zapas (satelita, przeciążony CPU)."""
+        profile = self.profiles.get(key)
+        if not self.enabled or profile is None:
+            return
+        read_timeout = _clamp(
+            profile.read_timeout * 2, READ_TIMEOUT_MIN, READ_TIMEOUT_MAX
+        )
+        self.profiles.update(
+            key,
+            timeouts=profile.timeouts + 1,
+            read_timeout=read_timeout,
+            timeout_floor=read_timeout,
+            floor_left=FLOOR_WINDOW,
+            delay_factor=_clamp(
+                profile.delay_factor * 1.5, DELAY_FACTOR_MIN, DELAY_FACTOR_MAX
+            ),
+        )
+
+    @staticmethod
+    def tune(
+        latency_ms: float,
+        throughput_bps: float,
+        max_bytes: int,
+        timeouts: int = 0,
+        timeout_floor: float = 0.0,
+    ) -> dict:
+        """
+        Parametry czasowe wyliczone z pomiarów (w granicach bezpieczeństwa).
+        timeout_floor: read_timeout trzymany po ostatnim timeoucie.
+        """
+        latency = latency_ms / 1000
+        transfer = max_bytes / throughput_bps if throughput_bps else 0
+        read_timeout = MARGIN * (latency + transfer) + 5
+        # po timeoutach nie schodzimy poniżej tego, co było potrzebne
+        floor = max(READ_TIMEOUT_MIN * (2 ** min(timeouts, 5)), timeout_floor)
+        return {
+            "read_timeout": _clamp(
+                max(read_timeout, floor), READ_TIMEOUT_MIN, READ_TIMEOUT_MAX
+            ),
+            "delay_factor": _clamp(
+                latency_ms / REF_LATENCY_MS, DELAY_FACTOR_MIN, DELAY_FACTOR_MAX
+            ),
+            "conn_timeout": _clamp(20 * latency, 0, CONN_TIMEOUT_MAX),
+        }
+
+    def read_timeout(self, key: str, default: float = 20.0) -> float:
+        profile = self.profiles.get(key)
+        if profile is None or not self._ready(profile):
+            return default if profile is None else max(default, profile.read_timeout)
+        return profile.read_timeout
+
+    def netmiko_params(self, key: str, base_timeout: float) -> dict:
+        """Nadpisania parametrów ConnectHandler (pusty dict bez pomiarów)."""
+        profile = self.profiles.get(key)
+        if profile is None or not self._ready(profile):
+            return {}
+        return {
+            "global_delay_factor": profile.delay_factor,
+            # globalny timeout z ustawień jest dolną granicą
+            "timeout": max(base_timeout, profile.conn_timeout),
+        }
+
+    def _ready(self, profile: ConnectionProfile) -> bool:
+        return self.enabled and profile.samples >= self.min_samples
@@ -0,0 +1,151 @@
+# tests/test_acl_engine.py
+import ipaddress
+import random
+
+import pytest
+
+from services.acl_engine import ACLEngine, CompiledACL, parse_entry
+from services.parsers import cisco_ios
+
+RUNNING = """hostname FW1
+!
+access-list 10 permit host 192.168.1.5
+access-list 10 deny 192.168.1.0 0.0.0.255
+access-list 10 permit any
+access-list 110 remark management
+access-list 110 deny tcp any host 10.9.9.9 eq telnet
+access-list 110 permit tcp 10.1.0.0 0.0.255.255 host 10.9.9.9 range 22 443
+access-list 110 permit udp any 10.0.0.0 0.255.255.255 neq 53
+access-list 110 permit ip 10.0.5.0 0.255.0.255 any
+!
+ip access-list extended EDGE
+ 10 permit tcp any object-group WEB eq 443
+ 20 deny ip any any
+!
+end
+"""
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return ACLEngine.from_config(cisco_ios.parse(RUNNING))
+
+
+def _hit(entry):
+    return entry.index if entry else None
+
+
+def test_standard_acl_first_match(engine):
+    assert _hit(engine.match("10", "192.168.1.5", "1.1.1.1")) == 0
+    assert _hit(engine.match("10", "192.168.1.6", "1.1.1.1")) == 1
+    assert engine.match("10", "192.168.2.1", "1.1.1.1").action == "permit"
+
+
+@pytest.mark.parametrize(
+    "flow, index",
+    [
+        # deny telnet stoi przed permit range 22-443 (23 mieści się w obu)
+        (("10.1.2.3", "10.9.9.9", "tcp", 1024, 23), 0),
+        (("10.1.2.3", "10.9.9.9", "tcp", 1024, 22), 1),
+        (("10.1.2.3", "10.9.9.9", "tcp", 1024, 444), None),
+        (("10.2.2.3", "10.9.9.9", "tcp", 1024, 22), None),
+        # neq 53: port 53 nie pasuje, każdy inny tak
+        (("1.1.1.1", "10.20.30.40", "udp", 5000, 53), None),
+        (("1.1.1.1", "10.20.30.40", "udp", 5000, 54), 2),
+        # maska niesąsiadująca 0.255.0.255: drugi oktet dowolny, trzeci = 5
+        (("10.77.5.1", "8.8.8.8", "icmp"), 3),
+        (("10.77.6.1", "8.8.8.8", "icmp"), None),
+    ],
+)
+def test_extended_acl_first_match(engine, flow, index):
+    assert _hit(engine.match("110", *flow)) == index
+
+
+def test_remark_is_not_an_entry(engine):
+    assert len(engine.acls["110"]) == 4
+
+
+def test_unparsed_entry_stops_matching(engine):
+    # object-group nieobsługiwany: wynik nieokreślony zamiast "trafia deny"
+    hit = engine.match("EDGE", "1.1.1.1", "2.2.2.2", "tcp", 1024, 443)
+    assert hit.unparsed and hit.index == 0
+    # wpis zna swój protokół, więc udp go omija
+    assert _hit(engine.match("EDGE", "1.1.1.1", "2.2.2.2", "udp", 1024, 443)) == 1
+    assert [e.line.strip() for e in engine.unparsed] == [
+        "10 permit tcp any object-group WEB eq 443"
+    ]
+
+
+def test_classify_many_matches_single_lookups(engine):
+    flows = [
+        ("10.1.2.3", "10.9.9.9", "tcp", 1024, 23),
+        ("1.1.1.1", "10.20.30.40", "udp", 5000, 54),
+        ("10.1.2.3", "10.9.9.9", "tcp", 1024, 23),
+        ("10.77.5.1", "8.8.8.8", "icmp"),
+    ]
+    assert engine.classify_many("110", flows) == [
+        engine.match("110", *flow) for flow in flows
+    ]
+
+
+# --- klasyfikator bitowy vs liniowy first-match ---
+
+
+def _linear(entries, src, dst, proto, sport, dport):
+    """Wzorzec: reguły po kolei, pierwsza pasująca wygrywa."""
+    s, d = int(ipaddress.IPv4Address(src)), int(ipaddress.IPv4Address(dst))
+    p = {"ip": 0, "icmp": 1, "tcp": 6, "udp": 17}[proto]
+    for e in entries:
+        fields = ((e.src, s), (e.dst, d), (e.proto, p), (e.sport, sport))
+        if all(lo <= v <= hi for (lo, hi), v in fields + ((e.dport, dport),)):
+            if not e.inexact or e.exact(s, d, sport, dport):
+                return e
+    return None
+
+
+def _random_rule(rng) -> list[str]:
+    def addr():
+        kind = rng.choice(["any", "host", "host", "prefix", "prefix", "mask"])
+        ip = f"10.{rng.randrange(4)}.{rng.randrange(4)}.{rng.randrange(8)}"
+        if kind == "host":
+            return ["host", ip]
+        if kind == "prefix":
+            return [ip, rng.choice(["0.0.0.3", "0.0.3.255", "0.3.255.255"])]
+        if kind == "mask":
+            return [ip, rng.choice(["0.3.0.7", "0.0.3.0"])]
+        return ["any"]
+
+    def port():
+        op = rng.choice(["", "eq", "lt", "gt", "neq", "range"])
+        if op == "range":
+            lo = rng.randrange(20, 30)
+            return ["range", str(lo), str(lo + rng.randrange(5))]
+        return [op, str(rng.randrange(20, 30))] if op else []
+
+    proto = rng.choice(["icmp", "tcp", "udp", "udp"])
+    words = [rng.choice(["permit", "deny"]), proto] + addr()
+    words += port() if proto in ("tcp", "udp") else []
+    words += addr()
+    words += port() if proto in ("tcp", "udp") else []
+    return words
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bitset_matches_linear_first_match(seed):
+    rng = random.Random(seed)
+    entries = [parse_entry("X", i, _random_rule(rng), False) for i in range(60)]
+    assert not any(e.unparsed for e in entries)
+    acl = CompiledACL("X", entries)
+
+    def ip():
+        return f"10.{rng.randrange(4)}.{rng.randrange(4)}.{rng.randrange(8)}"
+
+    for _ in range(2000):
+        flow = (
+            ip(),
+            ip(),
+            rng.choice(["ip", "icmp", "tcp", "udp"]),
+            rng.randrange(18, 36),
+            rng.randrange(18, 36),
+        )
+        assert acl.match(*flow) is _linear(entries, *flow), flow
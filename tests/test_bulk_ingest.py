@@ -0,0 +1,48 @@
+# tests/test_bulk_ingest.py
+from pathlib import Path
+
+from services.bulk_ingest import ConfigIndex, ingest, match_devices
+
+DATA = Path(__file__).parent / "data"
+
+
+def _archive(tmp_path) -> Path:
+    folder = tmp_path / "archiwum"
+    folder.mkdir()
+    (folder / "r1.cfg").write_text((DATA / "router_ios.txt").read_text())
+    # bez linii hostname — w indeksie pod nazwą pliku
+    raw = (DATA / "switch_ios.txt").read_text()
+    body = "\n".join(l for l in raw.splitlines() if not l.startswith("hostname"))
+    (folder / "10.0.0.2.cfg").write_text(body)
+    return folder
+
+
+def test_ingest_and_match_devices(tmp_path):
+    db = str(tmp_path / "configs.db")
+    stats = ingest(str(_archive(tmp_path)), db, workers=1)
+    assert (stats["parsed"], stats["errors"]) == (2, 0)
+
+    with ConfigIndex(db) as index:
+        matched = match_devices(
+            index,
+            {
+                "10.0.0.1": "r1-edge",  # hostname z wcześniejszego synca
+                "10.0.0.2": "",  # nazwa pliku zrzutu
+                "R1-EDGE": "",  # host jako nazwa DNS
+                "10.0.0.9": "",
+            },
+        )
+        assert matched == {
+            "10.0.0.1": "R1-EDGE",
+            "10.0.0.2": "10.0.0.2",
+            "R1-EDGE": "R1-EDGE",
+        }
+        conf = index.get(matched["10.0.0.2"])
+        assert set(conf.vlans.items) == {"10", "20", "30"}
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    folder, db = _archive(tmp_path), str(tmp_path / "configs.db")
+    ingest(str(folder), db, workers=1)
+    stats = ingest(str(folder), db, workers=1)
+    assert (stats["files"], stats["skipped"], stats["parsed"]) == (2, 2, 0)
@@ -0,0 +1,245 @@
+# tests/test_config_push.py
+import pytest
+
+from services.config_push import plan_from_tabs, supported
+from services.parsers import cisco_ios, juniper_junos
+
+RUNNING = """hostname R1
+!
+vlan 10
+ name Management
+!
+vlan 20
+ name Users
+!
+interface GigabitEthernet0/1
+ description uplink
+ no switchport
+ ip address 10.0.0.1 255.255.255.0
+!
+interface GigabitEthernet0/2
+ switchport mode access
+ switchport access vlan 10
+!
+interface Loopback0
+ ip address 10.255.0.1 255.255.255.255
+!
+access-list 10 permit 192.168.1.5
+access-list 10 permit 192.168.2.0 0.0.0.255
+access-list 10 deny any
+access-list 110 permit tcp any any eq 22
+access-list 110 deny ip any any
+!
+end
+"""
+
+
+def _snapshot(running: str = RUNNING):
+    return cisco_ios.parse(running)
+
+
+def _acl_state(conf) -> dict:
+    """Stan zakładki ACL tak, jak po synchronizacji (ACLTab.sync_from_config)."""
+    rules = [[r.action, r.protocol, r.src, r.wildcard, r.dest] for r in conf.acls.rules]
+    return {"rules": rules, "acls": [r.acl for r in conf.acls.rules]}
+
+
+def _interfaces_state(conf) -> dict:
+    rows = [
+        [name, r.description, r.ip, r.mask, r.mode, r.status]
+        for name, r in conf.interfaces.items.items()
+    ]
+    return {"rows": rows}
+
+
+def _vlans_state(conf) -> dict:
+    rows = [[vid, v.name, ",".join(v.ports)] for vid, v in conf.vlans.items.items()]
+    return {"rows": rows}
+
+
+# --- ACL ---
+
+
+def test_synced_tabs_produce_no_commands():
+    conf = _snapshot()
+    tabs = {
+        "ACL": _acl_state(conf),
+        "INTERFACES": _interfaces_state(conf),
+        "VLANs": _vlans_state(conf),
+    }
+    plan = plan_from_tabs(conf, tabs)
+    assert plan.commands == [] and plan.warnings == []
+
+
+def test_edit_standard_rule_uses_device_sequence_numbers():
+    conf = _snapshot()
+    state = _acl_state(conf)
+    state["rules"][1] = ["permit", "", "192.168.3.0", "0.0.0.255", ""]
+    plan = plan_from_tabs(conf, {"ACL": state})
+    assert plan.commands == [
+        "ip access-list resequence 10 10 10",
+        "ip access-list standard 10",
+        " 11 permit 192.168.3.0 0.0.0.255",
+        " no 20",
+    ]
+
+
+def test_append_standard_rule_from_tab_defaults():
+    # zakładka wpisuje dla nowej reguły "ip" i "any" — nie dla listy standardowej
+    conf = _snapshot()
+    state = _acl_state(conf)
+    state["rules"].append(["permit", "ip", "10.9.9.0", "0.0.0.255", "any"])
+    state["acls"].append("10")
+    plan = plan_from_tabs(conf, {"ACL": state})
+    assert plan.commands == ["access-list 10 permit 10.9.9.0 0.0.0.255"]
+
+
+def test_insert_extended_rule_keeps_original_lines():
+    conf = _snapshot()
+    state = _acl_state(conf)
+    state["rules"].insert(4, ["permit", "icmp", "any", "", "any"])
+    state["acls"].insert(4, "110")
+    plan = plan_from_tabs(conf, {"ACL": state})
+    assert plan.commands == [
+        "ip access-list resequence 110 10 10",
+        "ip access-list extended 110",
+        " 11 permit icmp any any",
+    ]
+
+
+def test_emptied_list_removes_only_its_entries():
+    conf = _snapshot()
+    state = _acl_state(conf)
+    keep = [i for i, acl in enumerate(state["acls"]) if acl != "10"]
+    state = {
+        "rules": [state["rules"][i] for i in keep],
+        "acls": [state["acls"][i] for i in keep],
+    }
+    plan = plan_from_tabs(conf, {"ACL": state})
+    assert "no access-list 10" not in plan.commands
+    assert plan.commands == [
+        "ip access-list resequence 10 10 10",
+        "ip access-list standard 10",
+        " no 10",
+        " no 20",
+        " no 30",
+    ]
+
+
+def test_empty_acl_tab_is_skipped():
+    plan = plan_from_tabs(_snapshot(), {"ACL": {"rules": [], "acls": []}})
+    assert plan.commands == []
+    assert plan.warnings
+
+
+def test_list_with_unparsed_line_is_not_edited():
+    conf = _snapshot(RUNNING.replace("!\nend", "access-list 10 remark office\n!\nend"))
+    state = _acl_state(conf)
+    state["rules"][1] = ["permit", "", "192.168.3.0", "0.0.0.255", ""]
+    plan = plan_from_tabs(conf, {"ACL": state})
+    assert plan.commands == []
+    assert any("ACL 10" in w for w in plan.warnings)
+
+
+def test_unparsed_line_does_not_block_untouched_list():
+    conf = _snapshot(RUNNING.replace("!\nend", "access-list 10 remark office\n!\nend"))
+    plan = plan_from_tabs(conf, {"ACL": _acl_state(conf)})
+    assert plan.commands == [] and plan.warnings == []
+
+
+def test_new_acl_is_appended():
+    conf = _snapshot()
+    state = _acl_state(conf)
+    state["rules"].append(["deny", "udp", "10.0.0.0", "0.0.0.255", "any"])
+    state["acls"].append("120")
+    plan = plan_from_tabs(conf, {"ACL": state})
+    assert plan.commands == ["access-list 120 deny udp 10.0.0.0 0.0.0.255 any"]
+
+
+# --- interfejsy i VLAN-y ---
+
+
+def test_interface_changes():
+    conf = _snapshot()
+    state = _interfaces_state(conf)
+    state["rows"][0][1] = "uplink to core"  # opis Gi0/1
+    state["rows"][0][5] = "down"
+    state["rows"] = [row for row in state["rows"] if row[0] != "Loopback0"]
+    plan = plan_from_tabs(conf, {"INTERFACES": state})
+    assert plan.commands == [
+        "interface GigabitEthernet0/1",
+        " description uplink to core",
+        " shutdown",
+        "no interface Loopback0",
+    ]
+
+
+def test_physical_interface_is_not_removed():
+    conf = _snapshot()
+    state = _interfaces_state(conf)
+    state["rows"] = [row for row in state["rows"] if row[0] != "GigabitEthernet0/2"]
+    plan = plan_from_tabs(conf, {"INTERFACES": state})
+    assert plan.commands == []
+    assert any("GigabitEthernet0/2" in w for w in plan.warnings)
+
+
+def test_vlan_add_rename_and_port_move():
+    conf = _snapshot()
+    state = _vlans_state(conf)
+    state["rows"] = [
+        ["10", "Management", ""],
+        ["20", "Staff", "Gi0/2"],
+        ["30", "Guests", ""],
+    ]
+    plan = plan_from_tabs(conf, {"VLANs": state})
+    assert plan.commands == [
+        "vlan 20",
+        " name Staff",
+        "vlan 30",
+        " name Guests",
+        "interface Gi0/2",
+        " switchport access vlan 20",
+    ]
+
+
+def test_vlan_removal_comes_last():
+    conf = _snapshot()
+    state = _vlans_state(conf)
+    state["rows"] = [row for row in state["rows"] if row[0] != "20"]
+    state["rows"].append(["40", "", ""])
+    plan = plan_from_tabs(conf, {"VLANs": state})
+    assert plan.commands == ["vlan 40", "no vlan 20"]
+
+
+# --- routing ---
+
+
+def test_rip_and_ospf_networks():
+    conf = _snapshot(
+        RUNNING.replace(
+            "!\nend",
+            "router rip\n network 10.0.0.0\n!\n"
+            "router ospf 1\n network 10.0.0.0 0.0.0.255 area 0\n!\nend",
+        )
+    )
+    routing = {
+        "routes": [],
+        "rip": [["10.0.0.0"], ["192.168.1.0"]],
+        "ospf": [["2", "172.16.0.0", "0.0.255.255", "1"]],
+    }
+    plan = plan_from_tabs(conf, {"ROUTING": routing})
+    assert plan.commands == [
+        "router rip",
+        " network 192.168.1.0",
+        "router ospf 2",
+        " network 172.16.0.0 0.0.255.255 area 1",
+        "router ospf 1",
+        " no network 10.0.0.0 0.0.0.255 area 0",
+    ]
+
+
+def test_non_ios_snapshot_is_refused():
+    conf = juniper_junos.parse("set system host-name J1\n")
+    assert not supported(conf)
+    with pytest.raises(ValueError):
+        plan_from_tabs(conf, {"GLOBAL": {"hostname": "J2"}})
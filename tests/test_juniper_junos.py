@@ -0,0 +1,77 @@
+# tests/test_juniper_junos.py
+from pathlib import Path
+
+from services.acl_engine import ACLEngine
+from services.parsers import juniper_junos
+
+DATA = Path(__file__).parent / "data"
+
+
+def _conf():
+    return juniper_junos.parse((DATA / "router_junos.txt").read_text())
+
+
+def test_interfaces_and_static_routes():
+    conf = _conf()
+    assert conf.hostname == "J-EDGE"
+    ge0 = conf.interfaces.items["ge-0/0/0"]
+    assert (ge0.description, ge0.ip, ge0.mask) == (
+        "uplink to core",
+        "10.0.12.1",
+        "255.255.255.252",
+    )
+    assert conf.interfaces.items["ge-0/0/2"].status == "down"
+    assert [(r.dest, r.mask, r.nh) for r in conf.routing.static] == [
+        ("0.0.0.0", "0.0.0.0", "10.0.12.2")
+    ]
+
+
+def test_ospf_interfaces_as_subnets():
+    conf = _conf()
+    ospf = [
+        (o.process, o.network, o.wildcard, o.area, o.interface)
+        for o in conf.routing.ospf
+    ]
+    assert ospf == [
+        ("", "10.0.12.0", "0.0.0.3", "0.0.0.0", "ge-0/0/0.0"),
+        ("", "172.16.100.0", "0.0.0.255", "0.0.0.1", "ge-0/0/1.100"),
+        ("", "10.255.0.1", "0.0.0.0", "0.0.0.0", "lo0.0"),
+        # brak adresu w configu → bez podsieci, nazwa tylko w polu interface
+        ("", "", "", "0.0.0.0", "ge-0/0/3.0"),
+    ]
+
+
+def test_rip_neighbors_are_interfaces_not_networks():
+    conf = _conf()
+    assert conf.routing.rip_networks == []
+    assert conf.routing.rip_interfaces == ["ge-0/0/1.0"]
+
+
+def test_filter_addresses_are_prefixes():
+    conf = _conf()
+    rules = [dict(r) for r in conf.acls.rules]
+    assert rules == [
+        {
+            "acl": "PROTECT",
+            "action": "permit",
+            "protocol": "tcp",
+            "src": "10.1.0.0/16",
+            "wildcard": "",
+            "dest": "10.255.0.1/32",
+        },
+        {
+            "acl": "PROTECT",
+            "action": "deny",
+            "protocol": "ip",
+            "src": "any",
+            "wildcard": "",
+            "dest": "any",
+        },
+    ]
+
+
+def test_filter_prefixes_in_acl_engine():
+    acl = ACLEngine.from_config(_conf()).acls["PROTECT"]
+    assert acl.match("10.1.2.3", "10.255.0.1", "tcp", 1024, 22).index == 0
+    assert acl.match("10.2.2.3", "10.255.0.1", "tcp", 1024, 22).index == 1
+    assert acl.match("10.1.2.3", "10.255.0.2", "tcp", 1024, 22).index == 1
@@ -0,0 +1,56 @@
+# tests/test_pending_saves.py
+import time
+from types import SimpleNamespace
+
+from services.pending_saves import PendingSaves
+
+
+class _Unreachable:
+    """save() jak ConnectionManager.commit_host, gdy logowanie się nie udaje."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, host):
+        self.calls.append(time.monotonic())
+        raise ConnectionError("auth failed")
+
+
+def _wait_for(cond, timeout=3.0):
+    end = time.monotonic() + timeout
+    while not cond() and time.monotonic() < end:
+        time.sleep(0.01)
+    return cond()
+
+
+def test_failed_auto_save_backs_off_and_stalls():
+    save = _Unreachable()
+    saves = PendingSaves(save, idle=0.01)
+    saves.RETRY_BASE, saves.MAX_FAILURES = 0.05, 3
+    try:
+        saves.mark(SimpleNamespace(host="10.0.0.1"), commands=2)
+        assert _wait_for(lambda: saves.pending()["10.0.0.1"].stalled)
+        time.sleep(0.3)
+        # bez backoffu pętla logowań zrobiłaby setki prób
+        assert len(save.calls) == 3
+        gaps = [b - a for a, b in zip(save.calls, save.calls[1:])]
+        assert gaps[0] >= 0.05 and gaps[1] >= 0.1
+        entry = saves.pending()["10.0.0.1"]
+        assert (entry.failures, entry.sets, entry.commands) == (3, 1, 2)
+    finally:
+        saves.close()
+
+
+def test_new_change_resets_failures():
+    save = _Unreachable()
+    saves = PendingSaves(save, idle=0.01)
+    saves.RETRY_BASE, saves.MAX_FAILURES = 10.0, 3
+    try:
+        device = SimpleNamespace(host="10.0.0.1")
+        saves.mark(device)
+        assert _wait_for(lambda: saves.pending()["10.0.0.1"].failures == 1)
+        saves.mark(device)
+        entry = saves.pending()["10.0.0.1"]
+        assert (entry.failures, entry.retry_at, entry.sets) == (0, 0.0, 2)
+    finally:
+        saves.close()
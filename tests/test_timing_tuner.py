@@ -0,0 +1,52 @@
+# tests/test_timing_tuner.py
+from services import timing_tuner
+from services.connection_profiles import ConnectionProfile, ProfileStore
+from services.timing_tuner import TimingTuner
+
+KEY = "10.0.0.1/ssh"
+
+
+def _tuner(read_timeout: float = 40.0) -> TimingTuner:
+    store = ProfileStore(None)
+    store.put(KEY, ConnectionProfile("cisco_ios", "R1", read_timeout=read_timeout))
+    return TimingTuner(store, min_samples=1)
+
+
+def _fast_command(tuner: TimingTuner):
+    tuner.observe(KEY, 0.05, 200)
+
+
+def test_timeout_floor_survives_fast_commands():
+    tuner = _tuner()
+    tuner.timed_out(KEY)
+    assert tuner.read_timeout(KEY) == 80.0
+    for _ in range(timing_tuner.FLOOR_WINDOW):
+        _fast_command(tuner)
+        assert tuner.read_timeout(KEY) == 80.0
+
+
+def test_timeout_floor_decays_after_window():
+    tuner = _tuner()
+    tuner.timed_out(KEY)
+    for _ in range(timing_tuner.FLOOR_WINDOW):
+        _fast_command(tuner)
+    seen = []
+    for _ in range(40):
+        _fast_command(tuner)
+        seen.append(tuner.read_timeout(KEY))
+    assert seen == sorted(seen, reverse=True)
+    assert seen[0] < 80.0
+    # po wygaśnięciu zostaje tylko stała granica za liczbę timeoutów
+    assert seen[-1] == timing_tuner.READ_TIMEOUT_MIN * 2
+    assert tuner.profiles.get(KEY).timeout_floor == 0.0
+
+
+def test_repeated_timeout_restarts_window():
+    tuner = _tuner()
+    tuner.timed_out(KEY)
+    for _ in range(timing_tuner.FLOOR_WINDOW + 5):
+        _fast_command(tuner)
+    tuner.timed_out(KEY)
+    profile = tuner.profiles.get(KEY)
+    assert profile.floor_left == timing_tuner.FLOOR_WINDOW
+    assert profile.timeout_floor == profile.read_timeout